@@ -15,7 +15,7 @@ from app_helpers import (
     get_responsive_dimensions,
     config_manager
 )
-from arsip_logic import ArsipProcessor, FileManager, AnggotaFolderReader
+from arsip_logic import ArsipProcessor, FileManager, AnggotaFolderReader, FolderRuleMatcher
 
 class ArsipDigitalApp:
     def __init__(self, root, parent_window=None):
@@ -301,7 +301,7 @@ class ArsipDigitalApp:
         
         try:
             # Initialize AnggotaFolderReader
-            anggota_reader = AnggotaFolderReader()
+            anggota_reader = AnggotaFolderReader(config_manager.get_ignore_matcher())
             
             # Tentukan jenis scan berdasarkan struktur folder
             folder_name = os.path.basename(self.selected_folder)
@@ -1383,7 +1383,8 @@ class ScanFolderApp:
         self.parent_window = parent_window
         
         # Initialize business logic
-        self.anggota_reader = AnggotaFolderReader()
+        self.anggota_reader = AnggotaFolderReader(config_manager.get_ignore_matcher())
+        self.rule_matcher = FolderRuleMatcher()
         
         self.setup_window()
         self.create_widgets()
@@ -1391,6 +1392,7 @@ class ScanFolderApp:
         # Variable untuk menyimpan path yang dipilih
         self.selected_folder = ""
         self.current_scan_result = None
+        self.current_batch_result = None
         self.scan_type = None
     
     def setup_window(self):
@@ -1487,6 +1489,14 @@ class ScanFolderApp:
         )
         self.scan_btn.grid(row=2, column=0)
         
+        # Batch audit button (banyak folder cabang sekaligus)
+        batch_btn = ttk.Button(
+            control_frame, 
+            text="🏢 Audit Banyak Cabang", 
+            command=self.batch_audit_branches
+        )
+        batch_btn.grid(row=3, column=0, pady=(10, 0))
+        
         # Results frame
         result_frame = ttk.LabelFrame(main_frame, text="Hasil Scan", padding="15")
         result_frame.grid(row=3, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 15))
@@ -1691,6 +1701,304 @@ class ScanFolderApp:
             result["error"] = str(e)
             return result
     
+    def select_branch_roots(self):
+        """Pilih daftar folder root cabang (folder induk atau satu per satu)"""
+        default_folder = config_manager.get_default_folder()
+        initial_dir = default_folder if default_folder and os.path.exists(default_folder) else os.getcwd()
+        
+        use_parent = messagebox.askyesnocancel(
+            "Audit Banyak Cabang",
+            "Pilih cara menentukan folder cabang:\n\n"
+            "Yes = Pilih folder induk (semua subfolder dianggap cabang)\n"
+            "No = Pilih folder cabang satu per satu"
+        )
+        if use_parent is None:
+            return []
+        
+        if use_parent:
+            parent_folder = filedialog.askdirectory(
+                title="Pilih Folder Induk Cabang",
+                initialdir=initial_dir
+            )
+            if not parent_folder:
+                return []
+            try:
+                return sorted(
+                    os.path.join(parent_folder, name) for name in os.listdir(parent_folder)
+                    if os.path.isdir(os.path.join(parent_folder, name))
+                )
+            except Exception as e:
+                messagebox.showerror("Error", f"Gagal membaca folder induk:\n{str(e)}")
+                return []
+        
+        roots = []
+        while True:
+            folder_path = filedialog.askdirectory(
+                title=f"Pilih Folder Cabang ke-{len(roots) + 1} (Cancel untuk selesai)",
+                initialdir=initial_dir
+            )
+            if not folder_path:
+                break
+            if folder_path not in roots:
+                roots.append(folder_path)
+            initial_dir = os.path.dirname(folder_path)
+        return roots
+    
+    def audit_multiple_roots(self, roots, standard_folders, max_workers=None, progress_callback=None):
+        """Cek folder standar di banyak root cabang secara paralel
+        
+        Listing folder didominasi I/O jaringan, sehingga thread pool cukup dan
+        total waktu mendekati root yang paling lambat.
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        
+        result = {
+            "success": True,
+            "scan_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "standard_folders": list(standard_folders),
+            "roots": [None] * len(roots),
+            "summary": {
+                "total_roots": len(roots),
+                "complete_roots": 0,
+                "incomplete_roots": 0,
+                "failed_roots": 0
+            }
+        }
+        
+        if not roots:
+            return result
+        
+        workers = max_workers or min(32, len(roots))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {
+                executor.submit(self.scan_owncloud_folder, root, standard_folders): idx
+                for idx, root in enumerate(roots)
+            }
+            done_count = 0
+            while pending:
+                # Timeout pendek agar progress dialog tetap responsif
+                done, _ = wait(list(pending), timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = pending.pop(future)
+                    try:
+                        root_result = future.result()
+                    except Exception as e:
+                        root_result = {
+                            "success": False,
+                            "folder_path": roots[idx],
+                            "folder_name": os.path.basename(roots[idx]),
+                            "error": str(e)
+                        }
+                    result["roots"][idx] = root_result
+                    done_count += 1
+                    
+                    if not root_result.get("success", False):
+                        result["summary"]["failed_roots"] += 1
+                    elif root_result["summary"]["missing_standard"] == 0:
+                        result["summary"]["complete_roots"] += 1
+                    else:
+                        result["summary"]["incomplete_roots"] += 1
+                
+                if progress_callback:
+                    progress_callback(done_count, len(roots))
+        
+        return result
+    
+    def build_batch_audit_matrix(self, batch_result):
+        """Buat matriks root × folder standar dari hasil audit banyak cabang"""
+        rows = []
+        for idx, root_result in enumerate(batch_result["roots"], start=1):
+            row = {
+                "No": idx,
+                "Cabang": root_result.get("folder_name", ""),
+                "Path": root_result.get("folder_path", "")
+            }
+            
+            if root_result.get("success", False):
+                status_map = {f["name"]: f["status"] for f in root_result["standard_folders"]}
+                for std_folder in batch_result["standard_folders"]:
+                    row[std_folder] = status_map.get(std_folder, "TIDAK ADA")
+                row["Jumlah_Ada"] = root_result["summary"]["found_standard"]
+                row["Jumlah_Tidak_Ada"] = root_result["summary"]["missing_standard"]
+                row["Folder_Lain"] = "; ".join(f["name"] for f in root_result["other_folders"])
+                row["Status"] = "LENGKAP" if root_result["summary"]["missing_standard"] == 0 else "TIDAK LENGKAP"
+            else:
+                for std_folder in batch_result["standard_folders"]:
+                    row[std_folder] = "-"
+                row["Jumlah_Ada"] = 0
+                row["Jumlah_Tidak_Ada"] = 0
+                row["Folder_Lain"] = ""
+                row["Status"] = f"ERROR: {root_result.get('error', 'Unknown error')}"
+            
+            rows.append(row)
+        return rows
+    
+    def generate_batch_audit_report(self, batch_result):
+        """Generate laporan teks untuk audit banyak cabang"""
+        report = []
+        report.append("=" * 80)
+        report.append("LAPORAN AUDIT FOLDER STANDAR - BANYAK CABANG")
+        report.append("=" * 80)
+        report.append(f"Waktu Scan: {batch_result['scan_time']}")
+        report.append("")
+        
+        summary = batch_result["summary"]
+        report.append("RINGKASAN:")
+        report.append(f"  Total Cabang: {summary['total_roots']}")
+        report.append(f"  ✅ Lengkap: {summary['complete_roots']}")
+        report.append(f"  ❌ Tidak Lengkap: {summary['incomplete_roots']}")
+        report.append(f"  ⚠️ Gagal Dibaca: {summary['failed_roots']}")
+        report.append("")
+        
+        report.append("=" * 80)
+        report.append("DETAIL PER CABANG:")
+        report.append("=" * 80)
+        
+        for root_result in batch_result["roots"]:
+            name = root_result.get("folder_name", "")
+            if not root_result.get("success", False):
+                report.append(f"⚠️ {name:<40} [ERROR: {root_result.get('error', 'Unknown error')}]")
+                continue
+            
+            root_summary = root_result["summary"]
+            icon = "✅" if root_summary["missing_standard"] == 0 else "❌"
+            report.append(
+                f"{icon} {name:<40} [{root_summary['found_standard']}/{root_summary['total_standard']}]"
+            )
+            missing = [f["name"] for f in root_result["standard_folders"] if not f["exists"]]
+            if missing:
+                report.append(f"     Tidak ada: {', '.join(missing)}")
+            if root_result["other_folders"]:
+                report.append(f"     Folder lain: {', '.join(f['name'] for f in root_result['other_folders'])}")
+        
+        report.append("")
+        report.append("=" * 80)
+        
+        return "\n".join(report)
+    
+    def export_batch_audit_to_excel(self, batch_result, output_file):
+        """Export matriks audit banyak cabang ke Excel"""
+        try:
+            df = pd.DataFrame(self.build_batch_audit_matrix(batch_result))
+            
+            summary = batch_result["summary"]
+            summary_data = [{
+                "Informasi": "Waktu Scan",
+                "Value": batch_result["scan_time"]
+            }, {
+                "Informasi": "Total Cabang",
+                "Value": summary["total_roots"]
+            }, {
+                "Informasi": "Cabang Lengkap",
+                "Value": summary["complete_roots"]
+            }, {
+                "Informasi": "Cabang Tidak Lengkap",
+                "Value": summary["incomplete_roots"]
+            }, {
+                "Informasi": "Cabang Gagal Dibaca",
+                "Value": summary["failed_roots"]
+            }]
+            
+            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+                df.to_excel(writer, sheet_name='Matrix_Cabang', index=False)
+                pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
+            
+            return {
+                "success": True,
+                "file_path": output_file,
+                "rows_exported": len(df)
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def batch_audit_branches(self):
+        """Audit folder standar di banyak root cabang dalam satu kali jalan"""
+        roots = self.select_branch_roots()
+        if not roots:
+            return
+        
+        # Progress dialog
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title("Audit Banyak Cabang...")
+        progress_window.geometry("400x120")
+        progress_window.resizable(False, False)
+        progress_window.update_idletasks()
+        x = (progress_window.winfo_screenwidth() // 2) - 200
+        y = (progress_window.winfo_screenheight() // 2) - 60
+        progress_window.geometry(f'400x120+{x}+{y}')
+        progress_window.transient(self.root)
+        progress_window.grab_set()
+        
+        frame = ttk.Frame(progress_window, padding="20")
+        frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        progress_label = ttk.Label(frame, text=f"Mengaudit {len(roots)} cabang...", font=("Arial", 10))
+        progress_label.grid(row=0, column=0, pady=(0, 10))
+        progress_bar = ttk.Progressbar(frame, mode='determinate', maximum=len(roots), length=350)
+        progress_bar.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        progress_window.update()
+        
+        def on_progress(done_count, total):
+            progress_bar['value'] = done_count
+            progress_label.config(text=f"Selesai {done_count}/{total} cabang...")
+            progress_window.update()
+        
+        try:
+            batch_result = self.audit_multiple_roots(
+                roots, FolderRuleMatcher.STANDARD_FOLDERS, progress_callback=on_progress
+            )
+            progress_window.destroy()
+        except Exception as e:
+            progress_window.destroy()
+            messagebox.showerror("Error", f"Terjadi kesalahan saat audit:\n{str(e)}")
+            return
+        
+        self.current_batch_result = batch_result
+        
+        self.result_text.config(state=tk.NORMAL)
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, self.generate_batch_audit_report(batch_result))
+        self.result_text.config(state=tk.DISABLED)
+        
+        if not messagebox.askyesno(
+            "Audit Selesai",
+            f"Audit {batch_result['summary']['total_roots']} cabang selesai!\n\n"
+            f"✅ Lengkap: {batch_result['summary']['complete_roots']}\n"
+            f"❌ Tidak Lengkap: {batch_result['summary']['incomplete_roots']}\n"
+            f"⚠️ Gagal: {batch_result['summary']['failed_roots']}\n\n"
+            f"Export matriks ke Excel?"
+        ):
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            title="Export Matriks Audit Cabang",
+            defaultextension=".xlsx",
+            initialfile=f"audit_cabang_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            filetypes=[
+                ("Excel Files", "*.xlsx"),
+                ("All Files", "*.*")
+            ]
+        )
+        if not file_path:
+            return
+        
+        export_result = self.export_batch_audit_to_excel(batch_result, file_path)
+        if export_result.get("success", False):
+            messagebox.showinfo(
+                "Export Berhasil",
+                f"Matriks audit berhasil di-export!\n\n"
+                f"File: {export_result['file_path']}\n"
+                f"Cabang: {export_result['rows_exported']}"
+            )
+        else:
+            messagebox.showerror(
+                "Export Gagal",
+                f"Gagal export ke Excel:\n{export_result.get('error', 'Unknown error')}"
+            )
+    
     def generate_owncloud_report(self, result):
         """Generate laporan untuk scan folder Owncloud"""
         report = []
@@ -1960,8 +2268,16 @@ class ScanFolderApp:
         }
         
         try:
+            # State aturan struktur per folder (dievaluasi sekali dari state parent)
+            rule_states = {}
+            ignore_matcher = config_manager.get_ignore_matcher()
+            
             # Walk through all directories
             for dirpath, dirnames, filenames in os.walk(root_path):
+                # Folder yang diabaikan tidak ditelusuri, file sync/temporary tidak dihitung
+                ignore_matcher.prune_dirs(dirnames)
+                filenames = ignore_matcher.filter_files(filenames)
+                
                 # Hitung file di folder ini
                 file_count = len(filenames)
                 
@@ -1976,33 +2292,42 @@ class ScanFolderApp:
                 
                 # Dapatkan relative path dari root
                 rel_path = os.path.relpath(dirpath, root_path)
+                folder_name = os.path.basename(dirpath)
                 if rel_path == ".":
                     rel_path = os.path.basename(root_path)
                     path_parts = [os.path.basename(root_path)]
+                    rule_state = self.rule_matcher.evaluate(None, path_parts[0])
                 else:
                     # Split path menjadi parts
                     path_parts = rel_path.split(os.sep)
+                    if len(path_parts) == 1:
+                        rule_state = self.rule_matcher.evaluate(None, folder_name)
+                    elif os.path.dirname(dirpath) in rule_states:
+                        rule_state = self.rule_matcher.evaluate(rule_states[os.path.dirname(dirpath)], folder_name)
+                    else:
+                        rule_state = self.rule_matcher.evaluate_parts(path_parts)
+                
+                if dirnames:
+                    rule_states[dirpath] = rule_state
                 
                 # Tentukan level/depth
                 level = len(path_parts) - 1
-                folder_name = os.path.basename(dirpath)
                 
                 # Update max depth
                 if level > result["summary"]["max_depth"]:
                     result["summary"]["max_depth"] = level
                 
-                # Validasi kelengkapan berdasarkan struktur standar
-                status = self.validate_folder_structure(rel_path, file_count)
-                
                 folder_info = {
                     "path": dirpath,
                     "relative_path": rel_path,
                     "path_parts": path_parts,
+                    "formatted_parts": rule_state["formatted_parts"],
                     "folder_name": folder_name,
                     "level": level,
                     "file_count": file_count,
                     "folder_size": folder_size,
-                    "status": status,
+                    "status": self.rule_matcher.folder_status(file_count),
+                    "keterangan": rule_state["keterangan"],
                     "subfolder_count": len(dirnames)
                 }
                 
@@ -2020,90 +2345,15 @@ class ScanFolderApp:
     
     def validate_folder_structure(self, rel_path, file_count):
         """Validasi kelengkapan folder berdasarkan struktur standar"""
-        # Daftar folder standar yang harus ada file
-        standard_folders_with_files = [
-            "01.SURAT_MENYURAT", "02.DATA_ANGGOTA", "03.DATA_ANGGOTA_KELUAR",
-            "04.DATA_DANA_RESIKO", "05.DATA_HARI_RAYA_ANGGOTA", "06.LAPORAN_BULANAN",
-            "07.BUKU_BANK", "08.DATA_LWK"
-        ]
-        
-        # Cek apakah ini folder standar atau subfolder standar
-        for std_folder in standard_folders_with_files:
-            if std_folder in rel_path:
-                if file_count > 0:
-                    return "TERISI"
-                else:
-                    return "KOSONG"
-        
-        # Untuk folder lain
-        if file_count > 0:
-            return "TERISI"
-        elif file_count == 0:
-            return "KOSONG"
-        
-        return "OK"
+        return self.rule_matcher.folder_status(file_count)
     
     def validate_data_anggota_structure(self, path_parts):
         """Validasi khusus untuk struktur folder 02.DATA_ANGGOTA"""
-        keterangan = ""
-        
-        # Cek apakah ini path untuk 02.DATA_ANGGOTA
-        if len(path_parts) > 0 and "02.DATA_ANGGOTA" in path_parts[0]:
-            # Cek SUB FOLDER 1 (seharusnya 4 digit nomor center)
-            if len(path_parts) >= 2:
-                sub_folder_1 = path_parts[1]
-                
-                # Cek apakah 4 digit angka
-                if sub_folder_1.isdigit() and len(sub_folder_1) == 4:
-                    keterangan = f"Center: {sub_folder_1}"
-                else:
-                    # Bukan 4 digit angka
-                    keterangan = f"⚠️ Bukan format center (bukan 4 digit): {sub_folder_1}"
-            
-            # Cek SUB FOLDER 2 (seharusnya format IDANGGOTA_NAMAANGGOTA)
-            if len(path_parts) >= 3:
-                sub_folder_2 = path_parts[2]
-                
-                # Cek apakah mengandung underscore dan angka di awal
-                if "_" in sub_folder_2:
-                    parts = sub_folder_2.split("_", 1)
-                    if len(parts) == 2 and parts[0].isdigit():
-                        if keterangan:
-                            keterangan += f" | Anggota: {parts[0]}"
-                        else:
-                            keterangan = f"Anggota: {parts[0]}"
-                    else:
-                        if keterangan:
-                            keterangan += f" | ⚠️ Format anggota tidak sesuai"
-                        else:
-                            keterangan = "⚠️ Format anggota tidak sesuai"
-                else:
-                    if keterangan:
-                        keterangan += f" | ⚠️ Folder anggota tanpa underscore"
-                    else:
-                        keterangan = "⚠️ Folder anggota tanpa underscore"
-        
-        return keterangan
+        return self.rule_matcher.evaluate_parts(path_parts)["keterangan"]
     
     def format_path_parts(self, path_parts):
         """Format path parts dengan aturan khusus untuk 02.DATA_ANGGOTA"""
-        formatted_parts = []
-        
-        for i, part in enumerate(path_parts):
-            # Cek apakah ini SUB FOLDER 1 dari 02.DATA_ANGGOTA
-            if i == 1 and len(path_parts) > 0 and "02.DATA_ANGGOTA" in path_parts[0]:
-                # Cek apakah ini angka
-                if part.isdigit():
-                    # Format menjadi 4 digit dengan leading zero
-                    formatted_parts.append(part.zfill(4))
-                else:
-                    # Bukan angka, biarkan seperti aslinya
-                    formatted_parts.append(part)
-            else:
-                # Folder lain, biarkan seperti aslinya
-                formatted_parts.append(part)
-        
-        return formatted_parts
+        return self.rule_matcher.evaluate_parts(path_parts)["formatted_parts"]
     
     def export_struktur_lengkap(self):
         if not self.selected_folder:
@@ -2226,12 +2476,17 @@ class ScanFolderApp:
             "items": []
         }
         
+        ignore_matcher = config_manager.get_ignore_matcher()
+        
         try:
             for item in os.listdir(folder_path):
                 item_path = os.path.join(folder_path, item)
                 rel_path = os.path.relpath(item_path, folder_path)
                 
                 if os.path.isdir(item_path):
+                    if ignore_matcher.ignore_dir(item):
+                        continue
+                    
                     # Ini folder - scan rekursif
                     folder_info = {
                         "type": "folder",
@@ -2247,7 +2502,7 @@ class ScanFolderApp:
                     folder_info["children"] = self.get_folder_children(item_path, folder_path)
                     
                     folder_data["items"].append(folder_info)
-                else:
+                elif not ignore_matcher.ignore_file(item):
                     # Ini file di root folder standar
                     try:
                         file_size = os.path.getsize(item_path)
@@ -2271,6 +2526,7 @@ class ScanFolderApp:
     def get_folder_children(self, folder_path, root_path):
         """Helper untuk mendapatkan children folder secara rekursif"""
         children = []
+        ignore_matcher = config_manager.get_ignore_matcher()
         
         try:
             for item in os.listdir(folder_path):
@@ -2278,6 +2534,9 @@ class ScanFolderApp:
                 rel_path = os.path.relpath(item_path, root_path)
                 
                 if os.path.isdir(item_path):
+                    if ignore_matcher.ignore_dir(item):
+                        continue
+                    
                     # Subfolder - scan rekursif lagi
                     folder_info = {
                         "type": "folder",
@@ -2292,7 +2551,7 @@ class ScanFolderApp:
                     # Rekursif untuk subfolder ini
                     folder_info["children"] = self.get_folder_children(item_path, root_path)
                     children.append(folder_info)
-                else:
+                elif not ignore_matcher.ignore_file(item):
                     # File
                     try:
                         file_size = os.path.getsize(item_path)
@@ -3011,9 +3270,8 @@ class ScanFolderApp:
                     # Buat row data
                     row_data = {'No': idx}
                     
-                    # Isi kolom hierarki dengan format khusus untuk 02.DATA_ANGGOTA
-                    path_parts = folder["path_parts"]
-                    formatted_parts = self.format_path_parts(path_parts)
+                    # Kolom hierarki sudah diformat saat walk (aturan 02.DATA_ANGGOTA)
+                    formatted_parts = folder["formatted_parts"]
                     
                     for i in range(max_depth + 1):
                         if i == 0:
@@ -3026,16 +3284,13 @@ class ScanFolderApp:
                         else:
                             row_data[col_name] = ''
                     
-                    # Validasi khusus untuk 02.DATA_ANGGOTA
-                    keterangan = self.validate_data_anggota_structure(path_parts)
-                    
                     # Isi kolom lainnya
                     row_data['Level'] = folder["level"]
                     row_data['Jumlah_File'] = folder["file_count"]
                     row_data['Jumlah_Subfolder'] = folder["subfolder_count"]
                     row_data['Ukuran_MB'] = f"{size_mb:.2f}"
                     row_data['Status'] = folder["status"]
-                    row_data['Keterangan'] = keterangan
+                    row_data['Keterangan'] = folder["keterangan"]
                     
                     writer.writerow(row_data)
                 
@@ -3081,9 +3336,8 @@ class ScanFolderApp:
                 # Buat row data
                 row_data = {'No': idx}
                 
-                # Isi kolom hierarki dengan format khusus untuk 02.DATA_ANGGOTA
-                path_parts = folder["path_parts"]
-                formatted_parts = self.format_path_parts(path_parts)
+                # Kolom hierarki sudah diformat saat walk (aturan 02.DATA_ANGGOTA)
+                formatted_parts = folder["formatted_parts"]
                 
                 for i in range(max_depth + 1):
                     if i == 0:
@@ -3096,16 +3350,13 @@ class ScanFolderApp:
                     else:
                         row_data[col_name] = ''
                 
-                # Validasi khusus untuk 02.DATA_ANGGOTA
-                keterangan = self.validate_data_anggota_structure(path_parts)
-                
                 # Isi kolom lainnya
                 row_data['Level'] = folder["level"]
                 row_data['Jumlah_File'] = folder["file_count"]
                 row_data['Jumlah_Subfolder'] = folder["subfolder_count"]
                 row_data['Ukuran_MB'] = round(size_mb, 2)
                 row_data['Status'] = folder["status"]
-                row_data['Keterangan'] = keterangan
+                row_data['Keterangan'] = folder["keterangan"]
                 
                 data_rows.append(row_data)
             
@@ -3502,8 +3753,14 @@ class UniversalScanApp:
             # Create lookup untuk existing records
             existing_paths = {record['file_path']: record for record in self.scan_results}
             
+            ignore_matcher = config_manager.get_ignore_matcher()
+            
             # Scan folder secara rekursif
             for root, dirs, files in os.walk(self.selected_folder):
+                # Lewati folder/file sync OwnCloud, temporary dan salinan konflik
+                ignore_matcher.prune_dirs(dirs)
+                files = ignore_matcher.filter_files(files)
+                
                 # Update progress status
                 status_label.config(text=f"Scanning: {os.path.basename(root)}...")
                 progress_window.update()
@@ -3611,9 +3868,11 @@ class UniversalScanApp:
     def get_folder_size(self, folder_path):
         """Hitung ukuran total folder"""
         total_size = 0
+        ignore_matcher = config_manager.get_ignore_matcher()
         try:
             for root, dirs, files in os.walk(folder_path):
-                for file in files:
+                ignore_matcher.prune_dirs(dirs)
+                for file in ignore_matcher.filter_files(files):
                     try:
                         file_path = os.path.join(root, file)
                         total_size += os.path.getsize(file_path)
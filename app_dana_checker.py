@@ -4,14 +4,31 @@ Cek Pengajuan Dana App - Form untuk pengecekan pengajuan dana dari surat keluar
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+import re
 import pandas as pd
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 
 from app_helpers import (
     get_appdata_path,
     get_database_path,
     get_export_path,
-    get_responsive_dimensions
+    get_responsive_dimensions,
+    get_dana_cache_path,
+    get_dana_index_path,
+    file_signature,
+    config_manager,
+    DEFAULT_DANA_FILE_PATTERN
+)
+from dana_logic import (
+    extract_pengajuan_dana,
+    apply_analisa_result,
+    error_analisa_result,
+    compile_file_pattern,
+    parse_surat_keluar_location,
+    AnalisaCache,
+    SuratKeluarIndex
 )
 
 class CekPengajuanDanaApp:
@@ -154,6 +171,15 @@ class CekPengajuanDanaApp:
         )
         self.analisa_btn.grid(row=0, column=1, padx=(10, 10))
         
+        # Mode analisa paralel (process pool sesuai jumlah CPU)
+        self.parallel_var = tk.BooleanVar(value=True)
+        parallel_cb = ttk.Checkbutton(
+            btn_frame,
+            text="⚡ Paralel",
+            variable=self.parallel_var
+        )
+        parallel_cb.grid(row=1, column=1, pady=(5, 0))
+        
         # Export button
         self.export_btn = ttk.Button(
             btn_frame, 
@@ -172,6 +198,19 @@ class CekPengajuanDanaApp:
             )
             back_btn.grid(row=0, column=3, padx=(10, 0))
         
+        # Pola nama file yang dicari di folder Surat Keluar
+        pattern_frame = ttk.Frame(btn_frame)
+        pattern_frame.grid(row=2, column=0, columnspan=4, pady=(8, 0))
+        ttk.Label(pattern_frame, text="Pola nama file:", font=("Arial", 9)).grid(row=0, column=0, padx=(0, 5))
+        self.pattern_var = tk.StringVar(value=config_manager.get_dana_file_pattern())
+        ttk.Entry(pattern_frame, textvariable=self.pattern_var, width=35).grid(row=0, column=1)
+        ttk.Label(
+            pattern_frame,
+            text="(glob, atau awalan re: untuk regex)",
+            font=("Arial", 8),
+            foreground="gray"
+        ).grid(row=0, column=2, padx=(5, 0))
+        
         # Status info bar (di atas treeview)
         status_info_frame = ttk.Frame(main_frame)
         status_info_frame.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(5, 10))
@@ -267,84 +306,79 @@ class CekPengajuanDanaApp:
             )
             return
         
+        # Pola nama file dari form (disimpan ke config untuk scan berikutnya)
+        file_pattern = self.pattern_var.get().strip() or DEFAULT_DANA_FILE_PATTERN
+        try:
+            compile_file_pattern(file_pattern)
+        except re.error as e:
+            messagebox.showerror("Pola Tidak Valid", f"Pola nama file tidak valid:\n{file_pattern}\n\n{e}")
+            return
+        if file_pattern != config_manager.get_dana_file_pattern():
+            config_manager.set_dana_file_pattern(file_pattern)
+        
         self.status_var.set("🔄 Scanning...")
         self.root.update()
         
-        # Nama-nama bulan
-        bulan_names = {
-            "01": "JANUARI", "02": "FEBRUARI", "03": "MARET", "04": "APRIL",
-            "05": "MEI", "06": "JUNI", "07": "JULI", "08": "AGUSTUS",
-            "09": "SEPTEMBER", "10": "OKTOBER", "11": "NOVEMBER", "12": "DESEMBER"
-        }
+        # Satu kali traversal 02.SURAT_KELUAR; folder yang tidak berubah diambil dari index
+        index = SuratKeluarIndex(
+            get_dana_index_path(),
+            base_path,
+            file_pattern,
+            config_manager.get_ignore_matcher()
+        )
+        relative_files = index.scan()
+        index.save()
         
-        # Scan dari tahun 2020 sampai tahun sekarang + 1
-        current_year = datetime.now().year
         found_count = 0
         
-        for year in range(2020, current_year + 2):
-            year_folder = os.path.join(base_path, str(year))
+        for relative_path in relative_files:
+            relative_dir, file = os.path.split(relative_path)
+            location = parse_surat_keluar_location(relative_dir)
+            year = location["tahun"]
+            bulan_name = location["bulan"]
             
-            if not os.path.exists(year_folder):
-                continue
+            # Extract nomor surat (3 digit di awal)
+            nomor_surat = file[:3] if len(file) >= 3 else "???"
             
-            # Loop untuk setiap bulan (01-12)
-            for bulan_code, bulan_name in bulan_names.items():
-                # Format: 01.JANUARI, 02.FEBRUARI, dst
-                bulan_folder_name = f"{bulan_code}.{bulan_name}"
-                bulan_folder = os.path.join(year_folder, bulan_folder_name)
-                
-                if not os.path.exists(bulan_folder):
-                    continue
-                
-                # Scan semua file di folder bulan
-                try:
-                    for file in os.listdir(bulan_folder):
-                        # Skip file temporary (dimulai dengan ~)
-                        if file.startswith('~'):
-                            continue
-                        
-                        # Cek apakah file berakhiran PENGAJUAN_DANA.xlsm
-                        if file.upper().endswith("PENGAJUAN_DANA.XLSM"):
-                            # Extract nomor surat (3 digit di awal)
-                            nomor_surat = file[:3] if len(file) >= 3 else "???"
-                            
-                            file_path = os.path.join(bulan_folder, file)
-                            
-                            # Simpan hasil (tanpa data analisa dulu)
-                            self.scan_results.append({
-                                "tahun": year,
-                                "bulan": bulan_name,
-                                "bulan_code": bulan_code,
-                                "nomor_surat": nomor_surat,
-                                "nama_file": file,
-                                "path": file_path,
-                                "nomor_surat_f8": "",  # Akan diisi saat analisa
-                                "nominal_input": "",  # Akan diisi saat analisa
-                                "nominal_kebutuhan": "",  # Akan diisi saat analisa
-                                "status_balance": "",  # Akan diisi saat analisa
-                                "tanggal_disburse_awal": "",  # Akan diisi saat analisa
-                                "tanggal_disburse_akhir": "",  # Akan diisi saat analisa
-                                "nama_bm": "",  # Akan diisi saat analisa
-                                "data_analisa": {}  # Untuk data analisa lainnya
-                            })
-                            
-                            found_count += 1
-                            
-                            # Insert ke treeview
-                            self.tree.insert("", tk.END, values=(
-                                found_count,
-                                year,
-                                bulan_name,
-                                nomor_surat,
-                                file,
-                                file_path
-                            ))
-                except Exception as e:
-                    print(f"Error scanning {bulan_folder}: {e}")
+            file_path = os.path.join(base_path, relative_path)
+            
+            # Simpan hasil (tanpa data analisa dulu)
+            self.scan_results.append({
+                "tahun": year,
+                "bulan": bulan_name,
+                "bulan_code": location["bulan_code"],
+                "nomor_surat": nomor_surat,
+                "nama_file": file,
+                "path": file_path,
+                "nomor_surat_f8": "",  # Akan diisi saat analisa
+                "nominal_input": "",  # Akan diisi saat analisa
+                "nominal_kebutuhan": "",  # Akan diisi saat analisa
+                "status_balance": "",  # Akan diisi saat analisa
+                "tanggal_disburse_awal": "",  # Akan diisi saat analisa
+                "tanggal_disburse_akhir": "",  # Akan diisi saat analisa
+                "nama_bm": "",  # Akan diisi saat analisa
+                "data_analisa": {}  # Untuk data analisa lainnya
+            })
+            
+            found_count += 1
+            
+            # Insert ke treeview
+            self.tree.insert("", tk.END, values=(
+                found_count,
+                year,
+                bulan_name,
+                nomor_surat,
+                file,
+                file_path
+            ))
         
         # Update status
         if found_count > 0:
-            self.status_var.set(f"✅ Ditemukan {found_count} file PENGAJUAN_DANA.xlsm")
+            self.status_var.set(
+                f"✅ Ditemukan {found_count} file PENGAJUAN_DANA.xlsm "
+                f"({index.stats['folders_listed']} folder di-list, "
+                f"{index.stats['folders_reused']} dari index)"
+            )
             self.export_btn.config(state=tk.NORMAL)
             self.analisa_btn.config(state=tk.NORMAL)
             messagebox.showinfo(
@@ -360,7 +394,8 @@ class CekPengajuanDanaApp:
             messagebox.showinfo(
                 "Scan Selesai",
                 "Tidak ditemukan file PENGAJUAN_DANA.xlsm\n\n"
-                f"Path yang di-scan: {base_path}"
+                f"Path yang di-scan: {base_path}\n"
+                f"Pola nama file: {file_pattern}"
             )
     
     def analisa_data(self):
@@ -426,100 +461,143 @@ class CekPengajuanDanaApp:
         
         progress_window.update()
         
+        # Siapkan grid hasil analisa dulu agar hasil per file langsung tampil
+        self.setup_analisa_columns()
+        row_ids = []
+        for idx, result in enumerate(self.scan_results, 1):
+            result['status_analisa'] = ''  # Belum dianalisa
+            row_ids.append(self.tree.insert("", tk.END, values=self.format_analisa_row(idx, result)))
+        
         # Analisa setiap file
-        success_count = 0
-        error_count = 0
+        counts = {"success": 0, "error": 0, "done": 0}
+        total = len(self.scan_results)
         
-        for idx, result in enumerate(self.scan_results):
-            file_path = result['path']
-            file_name = result['nama_file']
+        def on_result(idx, data):
+            result = self.scan_results[idx]
+            apply_analisa_result(result, data)
+            self.tree.item(row_ids[idx], values=self.format_analisa_row(idx + 1, result))
             
-            # Update progress
-            progress_bar['value'] = idx + 1
-            status_label.config(text=f"File {idx+1}/{len(self.scan_results)}: {file_name}")
-            progress_window.update()
+            if data['status_analisa'] == 'SUCCESS':
+                counts["success"] += 1
+            else:
+                counts["error"] += 1
+            counts["done"] += 1
             
-            try:
-                # === SHEET SURAT ===
-                df_surat = pd.read_excel(file_path, sheet_name='Surat', header=None)
-                
-                # Ambil Nomor Surat dari cell F8 (row 7, col 5 - zero-indexed)
-                nomor_surat_file = df_surat.iloc[7, 5] if len(df_surat) > 7 and len(df_surat.columns) > 5 else None
-                
-                # Ambil Nominal Input Kebutuhan dari cell I8 (row 7, col 8 - zero-indexed)
-                nominal_input = df_surat.iloc[7, 8] if len(df_surat) > 7 and len(df_surat.columns) > 8 else None
-                
-                # === SHEET LAPORAN ===
-                status_balance = None
-                nominal_kebutuhan = None
-                nama_bm = None
-                
-                try:
-                    df_laporan = pd.read_excel(file_path, sheet_name='Laporan', header=None)
-                    
-                    # Ambil Status Balance dari cell A4 (row 3, col 0 - zero-indexed)
-                    if len(df_laporan) > 3 and len(df_laporan.columns) > 0:
-                        cell_a4 = str(df_laporan.iloc[3, 0])
-                        if 'Ket.' in cell_a4 and ':' in cell_a4:
-                            parts = cell_a4.split(':', 1)
-                            if len(parts) > 1:
-                                status_balance = parts[1].strip()
-                    
-                    # Ambil Nominal Kebutuhan dari cell F68 (row 67, col 5 - zero-indexed)
-                    if len(df_laporan) > 67 and len(df_laporan.columns) > 5:
-                        nominal_kebutuhan = df_laporan.iloc[67, 5]
-                    
-                    # Ambil Nama BM dari cell A83 (row 82, col 0 - zero-indexed)
-                    if len(df_laporan) > 82 and len(df_laporan.columns) > 0:
-                        nama_bm = df_laporan.iloc[82, 0]
-                
-                except Exception as e_laporan:
-                    pass  # Jika gagal baca sheet Laporan, set None
-                
-                # === SHEET LAMPIRAN ===
-                tanggal_disburse_awal = None
-                tanggal_disburse_akhir = None
-                
-                try:
-                    df_lampiran = pd.read_excel(file_path, sheet_name='Lampiran', header=None)
-                    
-                    # Ambil Tanggal Disburse Awal dari cell C3 (row 2, col 2 - zero-indexed)
-                    if len(df_lampiran) > 2 and len(df_lampiran.columns) > 2:
-                        tanggal_disburse_awal = df_lampiran.iloc[2, 2]
-                    
-                    # Ambil Tanggal Disburse Akhir dari cell E3 (row 2, col 4 - zero-indexed)
-                    if len(df_lampiran) > 2 and len(df_lampiran.columns) > 4:
-                        tanggal_disburse_akhir = df_lampiran.iloc[2, 4]
-                
-                except Exception as e_lampiran:
-                    pass  # Jika gagal baca sheet Lampiran, set None
-                
-                # Simpan hasil analisa
-                result['nomor_surat_file'] = nomor_surat_file
-                result['nominal_input'] = nominal_input
-                result['status_balance'] = status_balance
-                result['nominal_kebutuhan'] = nominal_kebutuhan
-                result['tanggal_disburse_awal'] = tanggal_disburse_awal
-                result['tanggal_disburse_akhir'] = tanggal_disburse_akhir
-                result['nama_bm'] = nama_bm
-                result['status_analisa'] = 'SUCCESS'
-                success_count += 1
-                
-            except Exception as e:
-                result['nomor_surat_file'] = None
-                result['nominal_input'] = None
-                result['status_balance'] = None
-                result['nominal_kebutuhan'] = None
-                result['tanggal_disburse_awal'] = None
-                result['tanggal_disburse_akhir'] = None
-                result['nama_bm'] = None
-                result['status_analisa'] = f'ERROR: {str(e)}'
-                error_count += 1
+            # Update progress
+            progress_bar['value'] = counts["done"]
+            status_label.config(text=f"File {counts['done']}/{total}: {result['nama_file']}")
+        
+        # Ambil hasil dari cache untuk file yang tidak berubah (size & mtime sama)
+        cache = AnalisaCache(get_dana_cache_path())
+        signatures = {}
+        todo_indexes = []
+        cached_count = 0
+        for idx, result in enumerate(self.scan_results):
+            signatures[idx] = file_signature(result['path'])
+            cached = cache.get(result['path'], signatures[idx])
+            if cached is not None:
+                on_result(idx, cached)
+                cached_count += 1
+            else:
+                todo_indexes.append(idx)
+        progress_window.update()
+        
+        def on_parsed(todo_pos, data):
+            idx = todo_indexes[todo_pos]
+            cache.put(self.scan_results[idx]['path'], signatures[idx], data)
+            on_result(idx, data)
+        
+        file_paths = [self.scan_results[idx]['path'] for idx in todo_indexes]
+        
+        if self.parallel_var.get() and len(file_paths) > 1:
+            progress_label.config(text=f"Memproses file paralel ({self.get_analisa_workers(len(file_paths))} proses)...")
+            self.analisa_files_parallel(file_paths, on_parsed, progress_window.update)
+        else:
+            for todo_pos, file_path in enumerate(file_paths):
+                # Buka workbook sekali (read-only) dan baca cell yang dibutuhkan saja
+                on_parsed(todo_pos, extract_pengajuan_dana(file_path))
+                progress_window.update()
+        
+        # Entry workbook yang tidak ada lagi di hasil scan dibuang
+        cache.save(prune_unseen=True)
+        parsed_count = len(file_paths)
+        
+        success_count = counts["success"]
+        error_count = counts["error"]
         
         progress_window.destroy()
         
-        # Update treeview dengan menambah kolom
-        # Clear dan rebuild treeview
+        # Show result
+        messagebox.showinfo(
+            "Analisa Selesai",
+            f"Analisa data selesai!\n\n"
+            f"✅ Berhasil: {success_count} file\n"
+            f"❌ Error: {error_count} file\n\n"
+            f"💾 Dari cache: {cached_count} file\n"
+            f"🔄 Diparse baru: {parsed_count} file\n\n"
+            f"Data yang diekstrak:\n"
+            f"• Nomor Surat (F8) - Sheet Surat\n"
+            f"• Nominal Input (I8) - Sheet Surat\n"
+            f"• Nominal Kebutuhan (F68) - Sheet Laporan\n"
+            f"• Status Balance (A4) - Sheet Laporan\n"
+            f"• Tanggal Disburse Awal (C3) - Sheet Lampiran\n"
+            f"• Tanggal Disburse Akhir (E3) - Sheet Lampiran\n"
+            f"• Nama BM (A83) - Sheet Laporan"
+        )
+        
+        self.status_var.set(
+            f"✅ Analisa selesai: {success_count} sukses, {error_count} error "
+            f"({cached_count} dari cache, {parsed_count} diparse baru)"
+        )
+    
+    def get_analisa_workers(self, total):
+        """Jumlah proses worker analisa (sesuai jumlah CPU, maksimal jumlah file)"""
+        return max(1, min(os.cpu_count() or 1, total))
+    
+    def analisa_files_parallel(self, file_paths, on_result, on_tick=None):
+        """Analisa banyak file PENGAJUAN_DANA.xlsm dengan process pool
+        
+        Parsing workbook bersifat CPU-bound, jadi file dibagi ke beberapa proses.
+        Hasil dikirim ke on_result(idx, data) sesuai urutan selesai. Error di satu
+        file hanya menandai file tersebut ERROR tanpa menghentikan batch.
+        """
+        finished = set()
+        
+        try:
+            with ProcessPoolExecutor(max_workers=self.get_analisa_workers(len(file_paths))) as executor:
+                pending = {
+                    executor.submit(extract_pengajuan_dana, path): idx
+                    for idx, path in enumerate(file_paths)
+                }
+                while pending:
+                    # Timeout pendek agar progress dialog tetap responsif
+                    done, _ = wait(list(pending), timeout=0.1, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        idx = pending.pop(future)
+                        try:
+                            data = future.result()
+                        except BrokenProcessPool:
+                            continue  # Worker mati, file dianalisa ulang di proses utama
+                        except Exception as e:
+                            data = error_analisa_result(e)
+                        on_result(idx, data)
+                        finished.add(idx)
+                    
+                    if on_tick:
+                        on_tick()
+        except Exception as e:
+            # Process pool gagal dibuat/rusak, sisa file dianalisa serial
+            print(f"Process pool tidak tersedia, lanjut analisa serial: {e}")
+        
+        for idx, path in enumerate(file_paths):
+            if idx in finished:
+                continue
+            on_result(idx, extract_pengajuan_dana(path))
+            if on_tick:
+                on_tick()
+    
+    def setup_analisa_columns(self):
+        """Ubah kolom treeview untuk menampilkan data hasil analisa"""
         for item in self.tree.get_children():
             self.tree.delete(item)
         
@@ -560,62 +638,46 @@ class CekPengajuanDanaApp:
         self.tree.column("Status", width=80, anchor=tk.CENTER)
         self.tree.column("Nama File", width=200, anchor=tk.W)
         self.tree.column("Path", width=250, anchor=tk.W)
-        
-        # Repopulate treeview
-        for idx, result in enumerate(self.scan_results, 1):
-            nomor_file = result.get('nomor_surat_file', '')
-            nominal_input = result.get('nominal_input', '')
-            nominal_kebutuhan = result.get('nominal_kebutuhan', '')
-            status_balance = result.get('status_balance', '')
-            tgl_disburse_awal = result.get('tanggal_disburse_awal', '')
-            tgl_disburse_akhir = result.get('tanggal_disburse_akhir', '')
-            nama_bm = result.get('nama_bm', '')
-            status = result.get('status_analisa', '')
-            
-            # Tentukan status display
-            if status == 'SUCCESS':
-                status_display = "✅"
-            else:
-                status_display = "❌"
-            
-            # Format tanggal jika ada
-            tgl_awal_str = str(tgl_disburse_awal) if tgl_disburse_awal else '-'
-            tgl_akhir_str = str(tgl_disburse_akhir) if tgl_disburse_akhir else '-'
-            
-            self.tree.insert("", tk.END, values=(
-                idx,
-                result['tahun'],
-                result['bulan'],
-                result['nomor_surat'],
-                nomor_file if nomor_file else '-',
-                nominal_input if nominal_input else '-',
-                nominal_kebutuhan if nominal_kebutuhan else '-',
-                status_balance if status_balance else '-',
-                tgl_awal_str,
-                tgl_akhir_str,
-                nama_bm if nama_bm else '-',
-                status_display,
-                result['nama_file'],
-                result['path']
-            ))
-        
-        # Show result
-        messagebox.showinfo(
-            "Analisa Selesai",
-            f"Analisa data selesai!\n\n"
-            f"✅ Berhasil: {success_count} file\n"
-            f"❌ Error: {error_count} file\n\n"
-            f"Data yang diekstrak:\n"
-            f"• Nomor Surat (F8) - Sheet Surat\n"
-            f"• Nominal Input (I8) - Sheet Surat\n"
-            f"• Nominal Kebutuhan (F68) - Sheet Laporan\n"
-            f"• Status Balance (A4) - Sheet Laporan\n"
-            f"• Tanggal Disburse Awal (C3) - Sheet Lampiran\n"
-            f"• Tanggal Disburse Akhir (E3) - Sheet Lampiran\n"
-            f"• Nama BM (A83) - Sheet Laporan"
+    
+    def format_analisa_row(self, idx, result):
+        """Format satu record hasil analisa menjadi values treeview"""
+        nomor_file = result.get('nomor_surat_file', '')
+        nominal_input = result.get('nominal_input', '')
+        nominal_kebutuhan = result.get('nominal_kebutuhan', '')
+        status_balance = result.get('status_balance', '')
+        tgl_disburse_awal = result.get('tanggal_disburse_awal', '')
+        tgl_disburse_akhir = result.get('tanggal_disburse_akhir', '')
+        nama_bm = result.get('nama_bm', '')
+        status = result.get('status_analisa', '')
+        
+        # Tentukan status display
+        if not status:
+            status_display = "⏳"
+        elif status == 'SUCCESS':
+            status_display = "✅"
+        else:
+            status_display = "❌"
+        
+        # Format tanggal jika ada
+        tgl_awal_str = str(tgl_disburse_awal) if tgl_disburse_awal else '-'
+        tgl_akhir_str = str(tgl_disburse_akhir) if tgl_disburse_akhir else '-'
+        
+        return (
+            idx,
+            result['tahun'],
+            result['bulan'],
+            result['nomor_surat'],
+            nomor_file if nomor_file else '-',
+            nominal_input if nominal_input else '-',
+            nominal_kebutuhan if nominal_kebutuhan else '-',
+            status_balance if status_balance else '-',
+            tgl_awal_str,
+            tgl_akhir_str,
+            nama_bm if nama_bm else '-',
+            status_display,
+            result['nama_file'],
+            result['path']
         )
-        
-        self.status_var.set(f"✅ Analisa selesai: {success_count} sukses, {error_count} error")
     
     def export_to_excel(self):
         """Export hasil scan ke Excel"""
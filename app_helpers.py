@@ -2,8 +2,10 @@
 Helper functions dan ConfigManager untuk Tool Komida
 """
 import os
+import re
 import json
-from typing import Dict
+import fnmatch
+from typing import Dict, List, Optional, Tuple
 
 
 def get_appdata_path():
@@ -35,11 +37,69 @@ def get_config_path():
     return os.path.join(get_appdata_path(), 'app_config.json')
 
 
+def get_dana_cache_path():
+    """Get full path untuk dana_analisa_cache.json di AppData"""
+    return os.path.join(get_appdata_path(), 'dana_analisa_cache.json')
+
+
+def get_dana_index_path():
+    """Get full path untuk dana_surat_keluar_index.json di AppData"""
+    return os.path.join(get_appdata_path(), 'dana_surat_keluar_index.json')
+
+
+def get_ocr_stats_path():
+    """Get full path untuk ocr_stage_stats.json di AppData"""
+    return os.path.join(get_appdata_path(), 'ocr_stage_stats.json')
+
+
+def get_ocr_cache_path():
+    """Get full path untuk ocr_nokk_cache.json di AppData"""
+    return os.path.join(get_appdata_path(), 'ocr_nokk_cache.json')
+
+
+def get_ocr_checkpoint_path():
+    """Get full path untuk ocr_nokk_checkpoint.jsonl di AppData"""
+    return os.path.join(get_appdata_path(), 'ocr_nokk_checkpoint.jsonl')
+
+
+def get_render_cache_dir():
+    """Get full path folder render_cache (cache render halaman PDF) di AppData"""
+    return os.path.join(get_appdata_path(), 'render_cache')
+
+
+def get_page_render_cache_dir():
+    """Get full path folder render_cache_pages (cache render halaman penuh PDF → gambar) di AppData"""
+    return os.path.join(get_appdata_path(), 'render_cache_pages')
+
+
 def get_universal_scan_database_path():
     """Get full path untuk universal_scan_database.xlsx di AppData"""
     return os.path.join(get_appdata_path(), 'universal_scan_database.xlsx')
 
 
+def file_signature(file_path: str) -> Optional[Tuple[int, float]]:
+    """Ambil (size, mtime) file untuk validasi cache, None jika file tidak bisa di-stat"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime
+
+
+def write_json_atomic(file_path: str, content) -> None:
+    """
+    Tulis JSON lewat file .tmp lalu os.replace, sehingga file lama tetap utuh
+    jika penulisan terputus
+
+    Raises:
+        OSError/TypeError: Jika file tidak bisa ditulis atau isi tidak bisa di-serialize
+    """
+    temp_path = file_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(content, f, ensure_ascii=False)
+    os.replace(temp_path, file_path)
+
+
 def get_responsive_dimensions(base_width, base_height, screen_width, screen_height):
     """Calculate responsive window dimensions based on screen size"""
     if screen_width >= 1920:  # Large screens (4K, etc)
@@ -72,6 +132,93 @@ def get_responsive_dimensions(base_width, base_height, screen_width, screen_heig
     return width, height, padding, fonts
 
 
+# Pola default file/folder yang diabaikan oleh semua scanner.
+# Glob dicocokkan ke nama file/folder (tidak case-sensitive), awalan "re:" untuk regex
+# (dicari di mana saja dalam nama), akhiran "/" berarti hanya berlaku untuk folder.
+DEFAULT_IGNORE_PATTERNS = [
+    ".owncloudsync.log*",       # Log sinkronisasi OwnCloud
+    ".sync_journal.db*",        # Journal sync (termasuk -wal, -shm)
+    "._sync_*.db*",             # Journal sync versi baru
+    ".csync_journal.db*",
+    "~$*",                      # File temporary Office
+    "*_conflict-*",             # Salinan konflik OwnCloud
+    "* (conflicted copy *",     # Salinan konflik Nextcloud
+]
+
+# Pola default nama file pengajuan dana di folder Surat Keluar (glob, atau "re:" untuk regex)
+DEFAULT_DANA_FILE_PATTERN = "*PENGAJUAN_DANA.xlsm"
+
+
+class IgnoreMatcher:
+    """Pencocok pola ignore yang dikompilasi sekali dan dipakai bersama oleh semua walker"""
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns = [p.strip() for p in patterns if p and p.strip()]
+        
+        any_regex = []
+        dir_regex = []
+        # Regex dengan capturing group (mis. backreference \1 atau (?P=nama)) dicocokkan
+        # sendiri-sendiri: digabung dalam satu alternation, nomor/nama group-nya bergeser
+        any_separate = []
+        dir_separate = []
+        for pattern in self.patterns:
+            dir_only = pattern.endswith("/")
+            if dir_only:
+                pattern = pattern.rstrip("/")
+            if pattern.startswith("re:"):
+                # Regex berlaku seperti re.search terhadap nama
+                regex = f".*?(?:{pattern[3:]})"
+                # Validasi regex satu per satu agar pola rusak tidak mematikan semua pola
+                try:
+                    compiled = re.compile(regex, re.IGNORECASE)
+                except re.error as e:
+                    print(f"Warning: pola ignore tidak valid '{pattern}': {e}")
+                    continue
+                if compiled.groups:
+                    (dir_separate if dir_only else any_separate).append(compiled)
+                    continue
+            else:
+                regex = fnmatch.translate(pattern)
+            (dir_regex if dir_only else any_regex).append(regex)
+        
+        self._file_re = self._combine(any_regex)
+        self._dir_re = self._combine(any_regex + dir_regex)
+        self._file_separate = any_separate
+        self._dir_separate = any_separate + dir_separate
+    
+    @staticmethod
+    def _combine(regexes):
+        if not regexes:
+            return None
+        return re.compile("|".join(f"(?:{r})" for r in regexes), re.IGNORECASE)
+    
+    @staticmethod
+    def _matches(combined, separate, name: str) -> bool:
+        if combined is not None and combined.match(name):
+            return True
+        return any(regex.match(name) for regex in separate)
+    
+    def ignore_file(self, name: str) -> bool:
+        """True jika file dengan nama ini harus diabaikan"""
+        return self._matches(self._file_re, self._file_separate, name)
+    
+    def ignore_dir(self, name: str) -> bool:
+        """True jika folder dengan nama ini (beserta isinya) harus dilewati"""
+        return self._matches(self._dir_re, self._dir_separate, name)
+    
+    def filter_files(self, filenames: List[str]) -> List[str]:
+        """Daftar nama file tanpa yang diabaikan"""
+        if not self._file_re and not self._file_separate:
+            return list(filenames)
+        return [name for name in filenames if not self.ignore_file(name)]
+    
+    def prune_dirs(self, dirnames: List[str]) -> List[str]:
+        """Buang folder yang diabaikan dari list dirnames os.walk (in-place) agar tidak ditelusuri"""
+        if self._dir_re or self._dir_separate:
+            dirnames[:] = [name for name in dirnames if not self.ignore_dir(name)]
+        return dirnames
+
+
 class ConfigManager:
     """Manager untuk menyimpan dan membaca konfigurasi aplikasi"""
     
@@ -80,9 +227,18 @@ class ConfigManager:
         self.default_config = {
             "default_folder": "",
             "web_server_enabled": False,
-            "web_server_port": 1212
+            "web_server_port": 1212,
+            "ignore_patterns": list(DEFAULT_IGNORE_PATTERNS),
+            "dana_file_pattern": DEFAULT_DANA_FILE_PATTERN,
+            "ocr_workers": 0,
+            "ocr_batch_size": 8,
+            "render_cache_mb": 512,
+            "page_render_cache_mb": 1024,
+            "compress_target_dpi": 150,
+            "compress_jpeg_quality": 60
         }
         self.config = self.load_config()
+        self._ignore_matcher = None
     
     def load_config(self):
         """Load konfigurasi dari file"""
@@ -132,6 +288,104 @@ class ConfigManager:
         """Set web server port"""
         self.config["web_server_port"] = port
         return self.save_config()
+    
+    def get_ignore_patterns(self):
+        """Get daftar pola file/folder yang diabaikan scanner"""
+        return self.config.get("ignore_patterns", list(DEFAULT_IGNORE_PATTERNS))
+    
+    def set_ignore_patterns(self, patterns):
+        """Set daftar pola ignore (matcher dikompilasi ulang saat dipakai berikutnya)"""
+        self.config["ignore_patterns"] = list(patterns)
+        self._ignore_matcher = None
+        return self.save_config()
+    
+    def get_ignore_matcher(self):
+        """Get IgnoreMatcher terkompilasi untuk pola ignore saat ini"""
+        if self._ignore_matcher is None:
+            self._ignore_matcher = IgnoreMatcher(self.get_ignore_patterns())
+        return self._ignore_matcher
+    
+    def get_dana_file_pattern(self):
+        """Get pola nama file pengajuan dana untuk scan Surat Keluar"""
+        return self.config.get("dana_file_pattern", DEFAULT_DANA_FILE_PATTERN)
+    
+    def set_dana_file_pattern(self, pattern):
+        """Set pola nama file pengajuan dana"""
+        self.config["dana_file_pattern"] = pattern
+        return self.save_config()
+    
+    def get_ocr_workers(self):
+        """Get jumlah proses worker OCR (0 = sesuai jumlah CPU)"""
+        try:
+            workers = int(self.config.get("ocr_workers", 0))
+        except (TypeError, ValueError):
+            workers = 0
+        return workers if workers > 0 else (os.cpu_count() or 1)
+    
+    def set_ocr_workers(self, workers):
+        """Set jumlah proses worker OCR"""
+        self.config["ocr_workers"] = int(workers)
+        return self.save_config()
+    
+    def get_ocr_batch_size(self):
+        """Get jumlah header PDF per panggilan tesseract (1 = tanpa batch)"""
+        try:
+            return max(1, int(self.config.get("ocr_batch_size", 8)))
+        except (TypeError, ValueError):
+            return 8
+    
+    def set_ocr_batch_size(self, batch_size):
+        """Set jumlah header PDF per panggilan tesseract"""
+        self.config["ocr_batch_size"] = max(1, int(batch_size))
+        return self.save_config()
+    
+    def get_render_cache_mb(self):
+        """Get budget cache render halaman PDF dalam MB (0 = nonaktif)"""
+        try:
+            return max(0, int(self.config.get("render_cache_mb", 512)))
+        except (TypeError, ValueError):
+            return 512
+    
+    def set_render_cache_mb(self, size_mb):
+        """Set budget cache render halaman PDF dalam MB"""
+        self.config["render_cache_mb"] = max(0, int(size_mb))
+        return self.save_config()
+    
+    def get_page_render_cache_mb(self):
+        """Get budget cache render halaman penuh (PDF → gambar) dalam MB (0 = nonaktif)"""
+        try:
+            return max(0, int(self.config.get("page_render_cache_mb", 1024)))
+        except (TypeError, ValueError):
+            return 1024
+    
+    def set_page_render_cache_mb(self, size_mb):
+        """Set budget cache render halaman penuh dalam MB"""
+        self.config["page_render_cache_mb"] = max(0, int(size_mb))
+        return self.save_config()
+    
+    def get_compress_target_dpi(self):
+        """Get DPI maksimum gambar saat compress PDF"""
+        try:
+            return max(50, int(self.config.get("compress_target_dpi", 150)))
+        except (TypeError, ValueError):
+            return 150
+    
+    def set_compress_target_dpi(self, dpi):
+        """Set DPI maksimum gambar saat compress PDF"""
+        self.config["compress_target_dpi"] = max(50, int(dpi))
+        return self.save_config()
+    
+    def get_compress_jpeg_quality(self):
+        """Get kualitas JPEG (1-95) saat compress PDF"""
+        try:
+            return min(95, max(1, int(self.config.get("compress_jpeg_quality", 60))))
+        except (TypeError, ValueError):
+            return 60
+    
+    def set_compress_jpeg_quality(self, quality):
+        """Set kualitas JPEG saat compress PDF"""
+        self.config["compress_jpeg_quality"] = min(95, max(1, int(quality)))
+        return self.save_config()
 
 
 # Global config manager instance
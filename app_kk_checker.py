@@ -8,24 +8,37 @@ import pandas as pd
 import numpy as np
 import re
 from datetime import datetime
-from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 
 from app_helpers import (
     get_appdata_path,
     get_database_path,
     get_export_path,
-    get_responsive_dimensions
+    get_responsive_dimensions,
+    get_ocr_stats_path,
+    get_ocr_cache_path,
+    get_ocr_checkpoint_path,
+    get_render_cache_dir,
+    config_manager
 )
+from kk_logic import (
+    OCR_AVAILABLE,
+    deskew_image,
+    extract_nokk_from_pdf,
+    extract_nokk_batch,
+    init_ocr_worker,
+    TEXT_LAYER_STAGE,
+    OcrStageStats,
+    OcrResultCache,
+    OcrRunCheckpoint
+)
+from tools_logic import get_tools, format_version, MIN_TESSERACT_VERSION
+from pdf_logic import configure_render_cache, render_cache_settings
+
+# Jumlah thread untuk menghitung hash isi PDF (I/O bound, terutama di network share)
+HASH_THREADS = 4
 
-# Import untuk PDF dan OCR
-try:
-    import pytesseract
-    from pdf2image import convert_from_path
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
-    pytesseract = None
-    convert_from_path = None
 
 class CekNoKKApp:
     """Form untuk Cek NO KK (Nomor Kartu Keluarga)"""
@@ -38,10 +51,14 @@ class CekNoKKApp:
         self.results = []
         self.status_var = tk.StringVar(value="✅ Ready - Klik 'PROSES CEK NO KK' untuk memulai")
         self.is_paused = False
+        self.ocr_tools = None
         self.is_processing = False
         
         self.setup_window()
         self.create_widgets()
+        
+        # Tawarkan lanjutkan run sebelumnya yang terputus
+        self.root.after(300, self.offer_resume)
     
     def setup_window(self):
         """Setup window cek no kk"""
@@ -166,6 +183,48 @@ class CekNoKKApp:
             )
             back_btn.grid(row=0, column=3, padx=(10, 0))
         
+        # Jumlah proses OCR paralel (default = jumlah CPU)
+        workers_frame = ttk.Frame(btn_frame)
+        workers_frame.grid(row=1, column=0, columnspan=4, pady=(8, 0))
+        ttk.Label(workers_frame, text="Worker OCR paralel:", font=("Arial", self.fonts['small'])).grid(row=0, column=0, padx=(0, 5))
+        self.workers_var = tk.IntVar(value=config_manager.get_ocr_workers())
+        ttk.Spinbox(
+            workers_frame,
+            from_=1,
+            to=max(2, (os.cpu_count() or 1) * 2),
+            textvariable=self.workers_var,
+            width=5
+        ).grid(row=0, column=1)
+        
+        # Jumlah header per panggilan tesseract
+        ttk.Label(workers_frame, text="Batch:", font=("Arial", self.fonts['small'])).grid(row=0, column=2, padx=(15, 5))
+        self.batch_var = tk.IntVar(value=config_manager.get_ocr_batch_size())
+        ttk.Spinbox(
+            workers_frame,
+            from_=1,
+            to=32,
+            textvariable=self.batch_var,
+            width=5
+        ).grid(row=0, column=3)
+        
+        # Paksa OCR ulang (abaikan cache hasil OCR)
+        self.force_ocr_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            workers_frame,
+            text="🔁 Paksa OCR ulang",
+            variable=self.force_ocr_var
+        ).grid(row=0, column=4, padx=(15, 0))
+        
+        # Statistik cache OCR
+        self.cache_info_var = tk.StringVar()
+        ttk.Label(
+            workers_frame,
+            textvariable=self.cache_info_var,
+            font=("Arial", self.fonts['small']),
+            foreground="gray"
+        ).grid(row=1, column=0, columnspan=5, pady=(5, 0))
+        self.update_cache_info()
+        
         # Results frame dengan treeview
         results_frame = ttk.LabelFrame(main_frame, text="Hasil Pengecekan NO KK", padding="10")
         results_frame.grid(row=4, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
@@ -219,6 +278,11 @@ class CekNoKKApp:
         
         self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
+        # Configure tags untuk warna
+        self.tree.tag_configure("valid", foreground="green")
+        self.tree.tag_configure("invalid", foreground="red")
+        self.tree.tag_configure("not_found", foreground="orange")
+        
         # Status label
         status_label = ttk.Label(
             main_frame,
@@ -286,251 +350,37 @@ class CekNoKKApp:
     
     def deskew_image(self, image):
         """Straighten skewed/tilted image menggunakan projection profile"""
-        try:
-            import numpy as np
-            from PIL import Image
-            
-            # Convert PIL Image to numpy array
-            img_array = np.array(image)
-            
-            # Binarize dengan threshold
-            threshold = 128
-            binary = img_array < threshold
-            
-            # Hitung projection profile untuk berbagai sudut (-20 sampai +20 derajat)
-            best_angle = 0
-            max_variance = 0
-            
-            for angle in range(-20, 21, 1):
-                # Rotate image
-                rotated = image.rotate(angle, expand=False, fillcolor=255)
-                rotated_array = np.array(rotated.convert('L'))
-                rotated_binary = rotated_array < threshold
-                
-                # Horizontal projection (sum across rows)
-                h_projection = np.sum(rotated_binary, axis=1)
-                
-                # Variance of projection - higher = better alignment
-                variance = np.var(h_projection)
-                
-                if variance > max_variance:
-                    max_variance = variance
-                    best_angle = angle
-            
-            # Apply best rotation
-            if best_angle != 0:
-                print(f"🔄 Deskewing image: {best_angle} degrees")
-                deskewed = image.rotate(best_angle, expand=True, fillcolor=255)
-                return deskewed
-            else:
-                print("✅ Image already straight")
-                return image
-                
-        except Exception as e:
-            print(f"⚠️ Deskew failed: {str(e)}, using original image")
-            return image
+        return deskew_image(image)
     
     def extract_nokk_from_pdf(self, pdf_path):
         """Ekstrak NO KK dari PDF menggunakan OCR dengan fokus ke header"""
-        if not os.path.exists(pdf_path):
-            return None
-        
-        try:
-            # Auto-detect Tesseract path
-            tesseract_paths = [
-                r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-                r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
-                r"C:\Tesseract-OCR\tesseract.exe",
-            ]
-            
-            tesseract_found = False
-            for tess_path in tesseract_paths:
-                if os.path.exists(tess_path):
-                    pytesseract.pytesseract.tesseract_cmd = tess_path
-                    tesseract_found = True
-                    break
-            
-            if not tesseract_found:
-                print("⚠️ Tesseract OCR tidak ditemukan. Install dari: https://github.com/UB-Mannheim/tesseract/wiki")
-                return None
-            
-            # Detect Poppler path (same as PDF Tool)
-            poppler_paths = [
-                "poppler-25.07.0/Library/bin",  # Portable version
-                r"C:\Program Files\poppler\Library\bin",
-                r"C:\poppler\Library\bin"
-            ]
-            
-            poppler_path = None
-            for path in poppler_paths:
-                if os.path.exists(path):
-                    poppler_path = path
-                    break
-            
-            # Convert PDF to images (first page only)
-            try:
-                if poppler_path:
-                    images = convert_from_path(
-                        pdf_path, 
-                        first_page=1, 
-                        last_page=1, 
-                        poppler_path=poppler_path,
-                        dpi=400  # Higher DPI untuk OCR lebih akurat
-                    )
-                else:
-                    images = convert_from_path(
-                        pdf_path, 
-                        first_page=1, 
-                        last_page=1,
-                        dpi=400
-                    )
-            except Exception as e:
-                print(f"Error converting PDF to image: {str(e)}")
-                return None
-            
-            if not images:
-                return None
-            
-            # Preprocessing image untuk OCR lebih baik
-            from PIL import ImageEnhance, ImageFilter, ImageOps
-            import numpy as np
-            
-            image = images[0]
-            width, height = image.size
-            
-            # Crop hanya bagian header (20% atas) - area NO KK biasanya di sini
-            header_height = int(height * 0.2)
-            image_header = image.crop((0, 0, width, header_height))
-            
-            # Convert to grayscale
-            image_header = image_header.convert('L')
-            
-            # DESKEW: Straighten image jika miring
-            image_header = self.deskew_image(image_header)
-            
-            # Enhance contrast lebih kuat
-            enhancer = ImageEnhance.Contrast(image_header)
-            image_header = enhancer.enhance(3.0)
-            
-            # Enhance sharpness
-            enhancer = ImageEnhance.Sharpness(image_header)
-            image_header = enhancer.enhance(2.0)
-            
-            # Threshold untuk binarisasi (black & white)
-            image_header = ImageOps.autocontrast(image_header)
-            
-            # OCR dengan config optimized untuk angka
-            configs = [
-                '--psm 6 -c tessedit_char_whitelist=0123456789',  # Hanya angka
-                '--psm 11 -c tessedit_char_whitelist=0123456789',
-                '--psm 6',  # Tanpa whitelist sebagai fallback
-            ]
-            
-            all_text = ""
-            for config in configs:
-                try:
-                    text = pytesseract.image_to_string(image_header, lang='eng', config=config)
-                    all_text += text + "\n"
-                except:
-                    continue
-            
-            if not all_text:
-                return None
-            
-            # Debug: print extracted text
-            print(f"\n📄 Header text from {os.path.basename(pdf_path)}:")
-            print(all_text[:300])
-            
-            # Clean up common OCR errors before pattern matching
-            # Ganti huruf yang mirip angka
-            cleaned_text = all_text
-            replacements = {
-                'b': '6',  # huruf b sering dibaca untuk angka 6
-                'B': '8',
-                'O': '0',
-                'o': '0',
-                'l': '1',
-                'I': '1',
-                'S': '5',
-                'Z': '2',
-            }
-            
-            for old, new in replacements.items():
-                cleaned_text = cleaned_text.replace(old, new)
-            
-            # Search for 16-digit number pattern (NO KK)
-            # Pattern 1: 16 consecutive digits (dari cleaned text)
-            pattern = r'\b\d{16}\b'
-            matches = re.findall(pattern, cleaned_text)
-            
-            if matches:
-                # Ambil yang pertama (biasanya NO KK di header)
-                print(f"✅ Found NO KK (after cleanup): {matches[0]}")
-                return matches[0]
-            
-            # Pattern 2: From original text (tanpa cleanup)
-            matches = re.findall(pattern, all_text)
-            if matches:
-                print(f"✅ Found NO KK: {matches[0]}")
-                return matches[0]
-            
-            # Pattern 3: With spaces/dots (e.g., "3302 0403 0205 2186")
-            pattern_with_space = r'(\d{4}[\s\.\-]?\d{4}[\s\.\-]?\d{4}[\s\.\-]?\d{4})'
-            matches = re.findall(pattern_with_space, cleaned_text)
-            
-            if matches:
-                # Remove spaces, dots, dashes
-                nokk = re.sub(r'[\s\.\-]', '', matches[0])
-                if len(nokk) == 16 and nokk.isdigit():
-                    print(f"✅ Found NO KK (with separators): {nokk}")
-                    return nokk
-            
-            # Pattern 4: Cari angka 15-18 digit (kadang OCR salah)
-            pattern_flexible = r'\d{15,18}'
-            matches = re.findall(pattern_flexible, cleaned_text)
-            
-            if matches:
-                # Coba berbagai kemungkinan untuk mendapat 16 digit
-                for match in matches:
-                    if len(match) == 16:
-                        print(f"✅ Found NO KK (flexible): {match}")
-                        return match
-                    elif len(match) == 17:
-                        # Coba ambil 16 digit pertama atau terakhir
-                        candidate1 = match[:16]
-                        candidate2 = match[1:]
-                        # Prioritas yang dimulai dengan 33 (kode Jawa Tengah)
-                        if candidate1.startswith('33'):
-                            print(f"✅ Found NO KK (17→16, first): {candidate1}")
-                            return candidate1
-                        elif candidate2.startswith('33'):
-                            print(f"✅ Found NO KK (17→16, last): {candidate2}")
-                            return candidate2
-                        else:
-                            print(f"✅ Found NO KK (17→16): {candidate1}")
-                            return candidate1
-                    elif len(match) == 15:
-                        # Mungkin kurang 1 digit, tapi tetap return
-                        print(f"⚠️ Found 15 digits (might be incomplete): {match}")
-                        # Don't return, keep searching
-            
-            print("❌ NO KK tidak ditemukan dalam header")
-            return None
-            
-        except Exception as e:
-            print(f"❌ Error extracting NO KK from {pdf_path}: {str(e)}")
-            return None
+        return extract_nokk_from_pdf(pdf_path)
     
-    def proses_cek_nokk(self):
-        """Proses cek NO KK dari database.xlsx - ekstrak dari PDF file yang dimulai dengan 02"""
-        # Set processing flag
-        self.is_processing = True
-        self.is_paused = False
-        
-        # Enable pause button, disable proses button
-        self.pause_btn.config(state=tk.NORMAL, text="⏸️ Pause")
-        self.proses_btn.config(state=tk.DISABLED)
+    def offer_resume(self):
+        """Jika ada checkpoint run yang belum selesai, tanyakan apakah ingin dilanjutkan"""
+        if self.is_processing:
+            return
+        summary = OcrRunCheckpoint(get_ocr_checkpoint_path()).summary()
+        if not summary:
+            return
+        if messagebox.askyesno(
+            "Lanjutkan Proses Sebelumnya?",
+            f"Proses Cek NO KK sebelumnya belum selesai:\n\n"
+            f"Dimulai: {summary['started']}\n"
+            f"Terakhir: {summary['updated']}\n"
+            f"Selesai: {summary['done']}/{summary['total']} file\n\n"
+            "Lanjutkan dari file terakhir yang selesai?\n"
+            "(No = abaikan, proses berikutnya dimulai dari awal)",
+            parent=self.root
+        ):
+            self.proses_cek_nokk(resume=True)
+    
+    def proses_cek_nokk(self, resume=False):
+        """Proses cek NO KK dari database.xlsx - ekstrak dari PDF file yang dimulai dengan 02
         
+        Setiap hasil dicatat ke checkpoint; resume=True melanjutkan run yang terputus
+        tanpa memproses ulang file yang sudah selesai.
+        """
         # Check OCR availability
         if not OCR_AVAILABLE:
             messagebox.showerror(
@@ -541,6 +391,27 @@ class CekNoKKApp:
             )
             return
         
+        # Deteksi Tesseract/Poppler sekali per sesi (hasil tersimpan di config)
+        self.ocr_tools = get_tools(config_manager)
+        if not self.ocr_tools.get("tesseract_cmd"):
+            messagebox.showwarning(
+                "Tesseract Tidak Ditemukan",
+                f"Tesseract OCR (versi {format_version(MIN_TESSERACT_VERSION)} ke atas) tidak ditemukan!\n\n"
+                "Hanya PDF dengan text layer yang bisa dibaca NO KK-nya.\n"
+                "Install dari: https://github.com/UB-Mannheim/tesseract/wiki"
+            )
+        
+        # Cache render header PDF (dipakai juga oleh worker)
+        configure_render_cache(get_render_cache_dir(), config_manager.get_render_cache_mb())
+        
+        # Set processing flag
+        self.is_processing = True
+        self.is_paused = False
+        
+        # Enable pause button, disable proses button
+        self.pause_btn.config(state=tk.NORMAL, text="⏸️ Pause")
+        self.proses_btn.config(state=tk.DISABLED)
+        
         # Clear previous results
         for item in self.tree.get_children():
             self.tree.delete(item)
@@ -558,6 +429,9 @@ class CekNoKKApp:
                 "untuk membuat file database.xlsx"
             )
             self.status_var.set("❌ Error: database.xlsx tidak ditemukan")
+            self.is_processing = False
+            self.pause_btn.config(state=tk.DISABLED, text="⏸️ Pause")
+            self.proses_btn.config(state=tk.NORMAL)
             return
         
         try:
@@ -602,113 +476,130 @@ class CekNoKKApp:
             id_nama_col = "ID_NAMA_ANGGOTA" if "ID_NAMA_ANGGOTA" in df_filtered.columns else None
             nomor_center_col = "NOMOR_CENTER" if "NOMOR_CENTER" in df_filtered.columns else None
             
-            # Process each PDF file
-            valid_count = 0
-            invalid_count = 0
-            not_found_count = 0
+            # Daftar tugas sesuai urutan input
+            tasks = []
+            for _, row in df_filtered.iterrows():
+                tasks.append({
+                    "pdf_path": row["PATH"],
+                    "nama_file": row["NAMA_FILE"],
+                    "nama": row[id_nama_col] if id_nama_col else "-",
+                    "nomor_center": row[nomor_center_col] if nomor_center_col else "-",
+                    "file_exists": None
+                })
             
-            for idx, row in df_filtered.iterrows():
-                # Check if paused
-                self.wait_if_paused()
-                
-                pdf_path = row["PATH"]
-                nama_file = row["NAMA_FILE"]
-                id_nama = row[id_nama_col] if id_nama_col else "-"
-                nomor_center = row[nomor_center_col] if nomor_center_col else "-"
-                
-                # Update progress
-                current = len(self.results) + 1
-                if not self.is_paused:
-                    self.status_var.set(f"🔄 Memproses {current}/{total_rows}: {nama_file}...")
-                self.root.update()
-                
-                # Check if file exists
-                file_exists = os.path.exists(pdf_path)
-                file_status = "✅ Ada" if file_exists else "❌ Tidak Ada"
-                
-                # Extract NO KK from PDF only if file exists
-                nokk = None
-                if file_exists:
-                    nokk = self.extract_nokk_from_pdf(pdf_path)
-                
-                if nokk:
-                    # Validate
-                    result = self.validate_nokk(nokk)
-                    result["nama"] = id_nama
-                    result["nomor_center"] = nomor_center
-                    result["path"] = pdf_path
-                    result["file_status"] = file_status
-                    
-                    # Count
-                    if result["valid"]:
-                        valid_count += 1
-                    else:
-                        invalid_count += 1
-                elif not file_exists:
-                    # File not found
-                    not_found_count += 1
-                    result = {
-                        "nokk": "-",
-                        "valid": False,
-                        "panjang": 0,
-                        "format": "-",
-                        "keterangan": "File PDF tidak ditemukan",
-                        "nama": id_nama,
-                        "nomor_center": nomor_center,
-                        "path": pdf_path,
-                        "file_status": file_status
-                    }
+            # Hasil disimpan per posisi input agar export tetap urut walau selesai acak
+            self.results = [None] * total_rows
+            counts = {"valid": 0, "invalid": 0, "not_found": 0, "done": 0}
+            
+            run_stats = OcrStageStats()
+            
+            # Cache hasil OCR (per hash isi file) untuk run ini
+            self.ocr_cache = OcrResultCache(get_ocr_cache_path())
+            self.force_ocr = self.force_ocr_var.get()
+            self.waiting_by_hash = {}
+            self.fresh_hashes = set()
+            self.cache_counts = {"path": 0, "hash": 0, "duplicate": 0, "ocr": 0, "text_layer": 0}
+            self.unsaved_results = 0
+            
+            # Checkpoint per hasil agar run yang terputus bisa dilanjutkan
+            pdf_paths = [task["pdf_path"] for task in tasks]
+            self.checkpoint = OcrRunCheckpoint(get_ocr_checkpoint_path())
+            resumed = self.checkpoint.load(pdf_paths) if resume else None
+            if resume and resumed is None:
+                messagebox.showinfo(
+                    "Checkpoint Tidak Cocok",
+                    "Daftar file di database.xlsx sudah berubah sejak proses sebelumnya.\n\n"
+                    "Proses dimulai dari awal."
+                )
+            if resumed is None:
+                self.checkpoint.start(pdf_paths)
+                resumed = {}
+            
+            def on_result(idx, details):
+                if details.get("resumed"):
+                    stage = f"{details.get('stage') or '-'} (lanjutan)"
+                elif details.get("cached"):
+                    stage = f"{details.get('stage') or '-'} (cache)"
                 else:
-                    # File exists but NO KK not found in OCR
-                    not_found_count += 1
-                    result = {
-                        "nokk": "-",
-                        "valid": False,
-                        "panjang": 0,
-                        "format": "-",
-                        "keterangan": "NO KK tidak ditemukan di PDF",
-                        "nama": id_nama,
-                        "nomor_center": nomor_center,
-                        "path": pdf_path,
-                        "file_status": file_status
-                    }
-                
-                # Add to results
-                self.results.append(result)
+                    run_stats.record(details)
+                    stage = details.get("stage") or "-"
+                    if details.get("stage") == TEXT_LAYER_STAGE:
+                        self.cache_counts["text_layer"] += 1
+                result = self.build_result(tasks[idx], details["nokk"], details.get("error"))
+                result["ocr_stage"] = stage
+                result["ocr_confidence"] = details.get("confidence") or "-"
+                self.results[idx] = result
                 
-                # Add to treeview
+                # Count
                 if result["nokk"] == "-":
-                    status_icon = "⚠️"
-                    tag = "not_found"
+                    counts["not_found"] += 1
                 elif result["valid"]:
-                    status_icon = "✅"
-                    tag = "valid"
+                    counts["valid"] += 1
                 else:
-                    status_icon = "❌"
-                    tag = "invalid"
+                    counts["invalid"] += 1
+                counts["done"] += 1
                 
-                self.tree.insert(
-                    "", 
-                    tk.END, 
-                    values=(
-                        current,
-                        result["nokk"],
-                        status_icon,
-                        result["panjang"],
-                        result["format"],
-                        result["keterangan"],
-                        id_nama,
-                        nomor_center,
-                        result.get("file_status", "-"),
-                        pdf_path
-                    ),
-                    tags=(tag,)
-                )
+                self.insert_result_row(idx + 1, result)
+                if not details.get("resumed"):
+                    self.checkpoint.append(idx, tasks[idx]["pdf_path"], details)
+                
+                # Update progress
+                if not self.is_paused:
+                    self.status_var.set(
+                        f"🔄 Selesai {counts['done']}/{total_rows}: {tasks[idx]['nama_file']}"
+                    )
             
-            # Configure tags untuk warna
-            self.tree.tag_configure("valid", foreground="green")
-            self.tree.tag_configure("invalid", foreground="red")
-            self.tree.tag_configure("not_found", foreground="orange")
+            # Simpan jumlah worker yang dipilih
+            try:
+                workers = max(1, int(self.workers_var.get()))
+            except (tk.TclError, ValueError):
+                workers = config_manager.get_ocr_workers()
+            if workers != config_manager.get_ocr_workers():
+                config_manager.set_ocr_workers(workers)
+            try:
+                batch_size = max(1, int(self.batch_var.get()))
+            except (tk.TclError, ValueError):
+                batch_size = config_manager.get_ocr_batch_size()
+            if batch_size != config_manager.get_ocr_batch_size():
+                config_manager.set_ocr_batch_size(batch_size)
+            
+            # Hasil dari checkpoint langsung ditampilkan, file-nya tidak diproses ulang
+            for idx in sorted(resumed):
+                tasks[idx]["file_exists"] = os.path.exists(tasks[idx]["pdf_path"])
+                on_result(idx, resumed[idx])
+            if resumed:
+                self.status_var.set(f"⏩ Melanjutkan: {len(resumed)}/{total_rows} file sudah selesai sebelumnya")
+                self.root.update()
+            
+            remaining = [idx for idx in range(total_rows) if self.results[idx] is None]
+            
+            # Hash isi file dihitung di thread terpisah (urut sesuai dispatch) agar UI
+            # tidak tertahan membaca PDF dari network share
+            self.hash_executor = ThreadPoolExecutor(max_workers=HASH_THREADS)
+            self.hash_futures = {
+                idx: self.hash_executor.submit(self.ocr_cache.lookup_hash, tasks[idx]["pdf_path"])
+                for idx in remaining
+            }
+            
+            if workers > 1 and len(remaining) > 1:
+                remaining = self.run_ocr_parallel(tasks, on_result, workers, batch_size)
+            self.run_ocr_serial(tasks, remaining, on_result, batch_size)
+            
+            self.results = [result for result in self.results if result is not None]
+            self.checkpoint.finish()
+            self.ocr_cache.save()
+            self.update_cache_info()
+            cache_counts = self.cache_counts
+            
+            # Simpan statistik tahap OCR kumulatif untuk tuning urutan cascade
+            total_stats = OcrStageStats(get_ocr_stats_path())
+            total_stats.merge(run_stats)
+            total_stats.save()
+            stage_lines = run_stats.summary_lines()
+            
+            valid_count = counts["valid"]
+            invalid_count = counts["invalid"]
+            not_found_count = counts["not_found"]
             
             # Enable export button
             self.export_btn.config(state=tk.NORMAL)
@@ -716,6 +607,9 @@ class CekNoKKApp:
             # Update status
             self.status_var.set(
                 f"✅ Selesai: {total_rows} file | ✅ Valid: {valid_count} | ❌ Invalid: {invalid_count} | ⚠️ Tidak Ditemukan: {not_found_count}"
+                f" | 💾 Cache: {cache_counts['path'] + cache_counts['hash'] + cache_counts['duplicate']}"
+                f" | 📄 Text layer: {cache_counts['text_layer']}"
+                f" | 🔍 OCR: {cache_counts['ocr'] - cache_counts['text_layer']}"
             )
             
             # Show result
@@ -723,10 +617,17 @@ class CekNoKKApp:
                 "Proses Selesai",
                 f"Pengecekan NO KK dari PDF selesai!\n\n"
                 f"Total File PDF: {total_rows}\n"
-                f"✅ Valid: {valid_count}\n"
+                + (f"⏩ Dilanjutkan dari checkpoint: {len(resumed)}\n" if resumed else "")
+                + f"✅ Valid: {valid_count}\n"
                 f"❌ Invalid: {invalid_count}\n"
                 f"⚠️ NO KK Tidak Ditemukan: {not_found_count}\n\n"
-                f"Klik 'Export Hasil' untuk menyimpan hasil pengecekan."
+                f"💾 Dari cache (file sama): {cache_counts['path']}\n"
+                f"💾 Dari cache (isi identik): {cache_counts['hash']}\n"
+                f"♻️ Duplikat di run ini: {cache_counts['duplicate']}\n"
+                f"🔍 Diproses baru: {cache_counts['ocr']} "
+                f"(📄 fast path text layer: {cache_counts['text_layer']})\n\n"
+                + ("Hit rate tahap OCR:\n" + "\n".join(stage_lines) + "\n\n" if stage_lines else "")
+                + "Klik 'Export Hasil' untuk menyimpan hasil pengecekan."
             )
             
         except Exception as e:
@@ -736,12 +637,294 @@ class CekNoKKApp:
             )
             self.status_var.set(f"❌ Error: {str(e)}")
         finally:
+            if getattr(self, "hash_executor", None):
+                self.hash_executor.shutdown(wait=False, cancel_futures=True)
+                self.hash_executor = None
+                self.hash_futures = {}
+            
+            # Hasil OCR yang sudah selesai tetap disimpan walau proses terhenti
+            if getattr(self, "ocr_cache", None):
+                self.ocr_cache.save()
+            if getattr(self, "checkpoint", None):
+                self.checkpoint.close()
+            
             # Reset processing state
             self.is_processing = False
             self.is_paused = False
             self.pause_btn.config(state=tk.DISABLED, text="⏸️ Pause")
             self.proses_btn.config(state=tk.NORMAL)
     
+    def run_ocr_serial(self, tasks, indexes, on_result, batch_size=1):
+        """Proses OCR di proses utama, per batch_size file sekaligus (extract_nokk_batch)"""
+        chunk = []
+        for idx in indexes:
+            # Check if paused
+            self.wait_if_paused()
+            
+            task = tasks[idx]
+            if not self.is_paused:
+                self.status_var.set(f"🔄 Memproses {idx + 1}/{len(tasks)}: {task['nama_file']}...")
+            self.root.update()
+            
+            # Extract NO KK from PDF only if file exists (dan belum ada di cache)
+            if self.dispatch_task(idx, task, on_result):
+                chunk.append(idx)
+            if len(chunk) >= batch_size:
+                self.run_serial_batch(tasks, chunk, on_result)
+                chunk = []
+            self.root.update()
+        
+        if chunk:
+            self.run_serial_batch(tasks, chunk, on_result)
+            self.root.update()
+    
+    def run_serial_batch(self, tasks, indexes, on_result):
+        """OCR satu batch di proses utama lalu selesaikan hasilnya"""
+        paths = [tasks[idx]["pdf_path"] for idx in indexes]
+        hashes = [tasks[idx].get("hash") for idx in indexes]
+        try:
+            batch_details = extract_nokk_batch(paths, None, hashes)
+        except Exception as e:
+            print(f"❌ Error extracting NO KK batch: {str(e)}")
+            batch_details = [
+                {"nokk": None, "stage": None, "stages_tried": [], "error": str(e)}
+                for _ in indexes
+            ]
+        for idx, details in zip(indexes, batch_details):
+            self.complete_task(idx, tasks[idx], details, on_result)
+    
+    def run_ocr_parallel(self, tasks, on_result, workers, batch_size=1):
+        """Proses OCR dengan process pool, hasil dikirim sesuai urutan selesai
+        
+        File yang perlu OCR dikelompokkan per batch_size dan satu batch dikerjakan
+        satu worker (extract_nokk_batch), sehingga tesseract dimuat sekali per
+        tahap per batch, bukan per file per config.
+        
+        Jumlah batch yang sedang berjalan dibatasi sehingga Pause berlaku cepat:
+        saat pause tidak ada batch baru yang dikirim, batch yang sudah berjalan
+        dibiarkan selesai.
+        
+        Returns:
+            list: Index tugas yang belum selesai (jika process pool rusak),
+                  untuk dilanjutkan secara serial
+        """
+        max_in_flight = workers * 2 if batch_size == 1 else workers + 1
+        next_idx = 0
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_ocr_worker,
+                                     initargs=(self.ocr_tools, render_cache_settings())) as executor:
+                pending = {}
+                chunk = []
+                while next_idx < len(tasks) or pending or chunk:
+                    while not self.is_paused and len(pending) < max_in_flight and (next_idx < len(tasks) or chunk):
+                        if next_idx < len(tasks):
+                            if self.dispatch_task(next_idx, tasks[next_idx], on_result):
+                                chunk.append(next_idx)
+                            next_idx += 1
+                        
+                        # Kirim batch jika penuh atau tidak ada tugas lagi
+                        if chunk and (len(chunk) >= batch_size or next_idx >= len(tasks)):
+                            pending[self.submit_batch(executor, tasks, chunk)] = chunk
+                            chunk = []
+                    
+                    if self.is_paused and chunk and not pending:
+                        # Batch sisa tetap dikirim agar tidak tertahan selama pause
+                        pending[self.submit_batch(executor, tasks, chunk)] = chunk
+                        chunk = []
+                    
+                    if pending:
+                        # Timeout pendek agar UI tetap responsif
+                        done, _ = wait(list(pending), timeout=0.1, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            indexes = pending.pop(future)
+                            try:
+                                batch_details = future.result()
+                            except BrokenProcessPool:
+                                raise
+                            except Exception as e:
+                                print(f"❌ Error extracting NO KK batch: {str(e)}")
+                                batch_details = [
+                                    {"nokk": None, "stage": None, "stages_tried": [], "error": str(e)}
+                                    for _ in indexes
+                                ]
+                            for idx, details in zip(indexes, batch_details):
+                                self.complete_task(idx, tasks[idx], details, on_result)
+                    else:
+                        # Paused dan tidak ada tugas berjalan
+                        self.root.after(100)
+                    
+                    self.root.update()
+        except BrokenProcessPool as e:
+            print(f"⚠️ Process pool OCR rusak, lanjut serial: {e}")
+            # Duplikat yang menunggu hasil dari pool diproses ulang secara serial
+            self.waiting_by_hash = {}
+        
+        unfinished = [idx for idx in range(len(tasks)) if self.results[idx] is None]
+        # Tugas yang belum selesai akan di-dispatch ulang; batalkan hitungan dispatch pertamanya
+        for idx in unfinished:
+            counted = tasks[idx].pop("counted", None)
+            if counted:
+                self.cache_counts[counted] -= 1
+        return unfinished
+    
+    def submit_batch(self, executor, tasks, indexes):
+        """Kirim satu batch ke process pool (hash isi file ikut dikirim untuk key cache render)"""
+        paths = [tasks[idx]["pdf_path"] for idx in indexes]
+        hashes = [tasks[idx].get("hash") for idx in indexes]
+        return executor.submit(extract_nokk_batch, paths, None, hashes)
+    
+    def dispatch_task(self, idx, task, on_result):
+        """Siapkan satu tugas OCR
+        
+        File yang tidak ada, sudah ada di cache, atau identik dengan file lain yang
+        sedang di-OCR langsung diselesaikan tanpa OCR.
+        
+        Returns:
+            bool: True jika file perlu di-OCR
+        """
+        if self.results[idx] is not None:
+            # Sudah selesai (dilanjutkan dari checkpoint)
+            return False
+        
+        file_hash, from_fast_check, signature = self.wait_for_hash(idx, task)
+        task["file_exists"] = signature is not None
+        if not task["file_exists"]:
+            on_result(idx, {"nokk": None, "stage": None, "stages_tried": [], "error": "File tidak ditemukan"})
+            return False
+        
+        if file_hash and not from_fast_check:
+            self.ocr_cache.remember_hash(task["pdf_path"], signature, file_hash)
+        task["hash"] = file_hash
+        
+        # Paksa OCR ulang tetap memakai hasil yang baru di-OCR pada run ini
+        if not self.force_ocr or file_hash in self.fresh_hashes:
+            cached = self.ocr_cache.get(file_hash)
+            if cached is not None:
+                self.cache_counts["path" if from_fast_check else "hash"] += 1
+                on_result(idx, cached)
+                return False
+        
+        if file_hash and file_hash in self.waiting_by_hash:
+            # File identik sedang di-OCR, tunggu hasilnya
+            self.waiting_by_hash[file_hash].append(idx)
+            self.cache_counts["duplicate"] += 1
+            task["counted"] = "duplicate"
+            return False
+        
+        if file_hash:
+            self.waiting_by_hash[file_hash] = []
+        self.cache_counts["ocr"] += 1
+        task["counted"] = "ocr"
+        return True
+    
+    def wait_for_hash(self, idx, task):
+        """Tunggu hasil hash dari thread hashing sambil UI tetap responsif
+        
+        Returns:
+            tuple: Lihat OcrResultCache.lookup_hash
+        """
+        future = self.hash_futures.pop(idx, None)
+        if future is None:
+            return self.ocr_cache.lookup_hash(task["pdf_path"])
+        while not future.done():
+            wait([future], timeout=0.05)
+            self.root.update()
+        return future.result()
+    
+    def complete_task(self, idx, task, details, on_result):
+        """Simpan hasil OCR ke cache dan kirim ke file ini serta duplikatnya"""
+        file_hash = task.get("hash")
+        self.ocr_cache.put(file_hash, details)
+        if file_hash and not details.get("error"):
+            self.fresh_hashes.add(file_hash)
+        on_result(idx, details)
+        
+        for duplicate_idx in self.waiting_by_hash.pop(file_hash, []):
+            on_result(duplicate_idx, dict(details, stages_tried=[], cached=True))
+        
+        # Simpan cache berkala agar hasil tidak hilang jika aplikasi ditutup
+        self.unsaved_results += 1
+        if self.unsaved_results >= 25:
+            self.ocr_cache.save()
+            self.unsaved_results = 0
+    
+    def update_cache_info(self):
+        """Tampilkan statistik cache OCR dan cache render"""
+        try:
+            stats = OcrResultCache(get_ocr_cache_path()).stats()
+            info = (
+                f"💾 Cache OCR: {stats['results']} hasil ({stats['found']} NO KK ditemukan), "
+                f"{stats['files']} file, {stats['size_bytes'] / 1024:.0f} KB"
+            )
+            render_cache = configure_render_cache(get_render_cache_dir(), config_manager.get_render_cache_mb())
+            if render_cache:
+                render_stats = render_cache.stats()
+                info += (
+                    f" | 🖼️ Cache render: {render_stats['files']} gambar, "
+                    f"{render_stats['size_bytes'] / 1024 / 1024:.0f}/{render_stats['max_bytes'] / 1024 / 1024:.0f} MB"
+                )
+            self.cache_info_var.set(info)
+        except Exception as e:
+            self.cache_info_var.set(f"💾 Cache OCR: tidak bisa dibaca ({e})")
+    
+    def build_result(self, task, nokk, error=None):
+        """Susun record hasil pengecekan untuk satu file (error: alasan OCR gagal, jika ada)"""
+        file_exists = task["file_exists"]
+        file_status = "✅ Ada" if file_exists else "❌ Tidak Ada"
+        
+        if nokk:
+            # Validate
+            result = self.validate_nokk(nokk)
+        else:
+            result = {
+                "nokk": "-",
+                "valid": False,
+                "panjang": 0,
+                "format": "-",
+                "keterangan": (
+                    "File PDF tidak ditemukan" if not file_exists
+                    else f"Gagal diproses: {error}" if error
+                    else "NO KK tidak ditemukan di PDF"
+                )
+            }
+        
+        result["nama"] = task["nama"]
+        result["nomor_center"] = task["nomor_center"]
+        result["path"] = task["pdf_path"]
+        result["file_status"] = file_status
+        return result
+    
+    def insert_result_row(self, number, result):
+        """Tambahkan satu hasil ke treeview"""
+        if result["nokk"] == "-":
+            status_icon = "⚠️"
+            tag = "not_found"
+        elif result["valid"]:
+            status_icon = "✅"
+            tag = "valid"
+        else:
+            status_icon = "❌"
+            tag = "invalid"
+        
+        self.tree.insert(
+            "", 
+            tk.END, 
+            values=(
+                number,
+                result["nokk"],
+                status_icon,
+                result["panjang"],
+                result["format"],
+                result["keterangan"],
+                result["nama"],
+                result["nomor_center"],
+                result.get("file_status", "-"),
+                result["path"]
+            ),
+            tags=(tag,)
+        )
+    
     def export_results(self):
         """Export hasil pengecekan ke Excel"""
         if not self.results:
@@ -779,6 +962,8 @@ class CekNoKKApp:
                     'Nama': result.get('nama', '-'),
                     'Nomor_Center': result.get('nomor_center', '-'),
                     'Status_File': result.get('file_status', '-'),
+                    'OCR_Stage': result.get('ocr_stage', '-'),
+                    'OCR_Confidence': result.get('ocr_confidence', '-'),
                     'Path': result.get('path', '-')
                 })
             
@@ -2,11 +2,21 @@
 PDF Tool App - Form untuk merge, split, convert, dan OCR PDF
 """
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, simpledialog
 import os
 from datetime import datetime
 
-from app_helpers import get_responsive_dimensions
+from app_helpers import get_responsive_dimensions, get_page_render_cache_dir, config_manager
+from tools_logic import get_tools, set_poppler_path
+from pdf_logic import (
+    PAGE_WINDOW,
+    build_pdf_from_images,
+    compress_pdf_file,
+    configure_page_render_cache,
+    get_page_count,
+    iter_rendered_pages,
+    parse_page_range
+)
 
 # Import untuk PDF operations
 try:
@@ -278,55 +288,11 @@ class PDFToolApp:
             self.status_var.set("🔄 Mengkonversi PDF ke gambar...")
             self.root.update()
             
-            # Get Poppler path from config
-            poppler_path = config_manager.config.get("poppler_path", "")
+            # Poppler dideteksi sekali per sesi (hasil tersimpan di config, "" = PATH)
+            poppler_path = get_tools(config_manager).get("poppler_path")
             
-            # Try to convert with different methods
-            images = None
-            error_detail = ""
-            
-            # Method 1: Try with saved poppler path
-            if poppler_path and os.path.exists(poppler_path):
-                try:
-                    images = convert_from_path(pdf_path, dpi=200, poppler_path=poppler_path)
-                except Exception as e:
-                    error_detail = f"Gagal dengan saved path: {e}"
-            
-            # Method 2: Try without poppler_path (auto-detect from PATH)
-            if images is None:
-                try:
-                    images = convert_from_path(pdf_path, dpi=200)
-                except Exception as e:
-                    error_detail += f"\nGagal auto-detect: {e}"
-            
-            # Method 3: Check common portable locations
-            if images is None:
-                common_paths = [
-                    # Struktur poppler-xx.xx.x (dari release GitHub)
-                    os.path.join(os.getcwd(), "poppler-25.07.0", "Library", "bin"),
-                    os.path.join(os.getcwd(), "poppler-25.07.0", "bin"),
-                    os.path.join(os.path.dirname(os.path.abspath(__file__)), "poppler-25.07.0", "Library", "bin"),
-                    os.path.join(os.path.dirname(os.path.abspath(__file__)), "poppler-25.07.0", "bin"),
-                    # Struktur folder poppler generik
-                    os.path.join(os.getcwd(), "poppler", "Library", "bin"),
-                    os.path.join(os.getcwd(), "poppler", "bin"),
-                    os.path.join(os.path.dirname(os.path.abspath(__file__)), "poppler", "Library", "bin"),
-                    os.path.join(os.path.dirname(os.path.abspath(__file__)), "poppler", "bin")
-                ]
-                
-                for path in common_paths:
-                    if os.path.exists(path):
-                        try:
-                            images = convert_from_path(pdf_path, dpi=200, poppler_path=path)
-                            # Save successful path
-                            config_manager.config["poppler_path"] = path
-                            config_manager.save_config()
-                            break
-                        except Exception:
-                            continue
-            
-            # If still failed, ask user to locate Poppler
-            if images is None:
+            # Jika tidak ditemukan, minta user memilih folder Poppler
+            if poppler_path is None:
                 result = messagebox.askyesno(
                     "Poppler Tidak Ditemukan",
                     "Poppler tidak ditemukan!\n\n"
@@ -337,50 +303,74 @@ class PDFToolApp:
                     "Apakah Anda ingin memilih lokasi folder Poppler sekarang?\n"
                     "(Pilih folder 'Library\\bin' atau 'bin' dari hasil extract Poppler)"
                 )
+                if not result:
+                    return
                 
-                if result:
-                    selected_path = filedialog.askdirectory(
-                        title="Pilih folder bin Poppler (contoh: poppler/Library/bin)"
+                selected_path = filedialog.askdirectory(
+                    title="Pilih folder bin Poppler (contoh: poppler/Library/bin)"
+                )
+                if not selected_path:
+                    return
+                
+                # Validasi (pdftoppm + pdfinfo + versi) lalu simpan ke config
+                if not set_poppler_path(config_manager, selected_path):
+                    messagebox.showerror(
+                        "Error",
+                        f"Folder Poppler tidak valid!\n\n{selected_path}\n\n"
+                        "Pastikan memilih folder 'bin' atau 'Library/bin' dari Poppler."
                     )
-                    
-                    if selected_path and os.path.exists(selected_path):
-                        try:
-                            images = convert_from_path(pdf_path, dpi=200, poppler_path=selected_path)
-                            # Save path to config
-                            config_manager.config["poppler_path"] = selected_path
-                            config_manager.save_config()
-                            messagebox.showinfo(
-                                "Berhasil",
-                                f"Path Poppler berhasil disimpan!\n\n{selected_path}\n\n"
-                                "Selanjutnya tidak perlu pilih lagi."
-                            )
-                        except Exception as e:
-                            messagebox.showerror(
-                                "Error",
-                                f"Folder Poppler tidak valid!\n\n{e}\n\n"
-                                "Pastikan memilih folder 'bin' atau 'Library/bin' dari Poppler."
-                            )
-                            return
-                    else:
-                        return
-                else:
                     return
+                poppler_path = selected_path
+                messagebox.showinfo(
+                    "Berhasil",
+                    f"Path Poppler berhasil disimpan!\n\n{selected_path}\n\n"
+                    "Selanjutnya tidak perlu pilih lagi."
+                )
+                self.status_var.set("🔄 Mengkonversi PDF ke gambar...")
+                self.root.update()
             
-            # Save images
-            if images:
-                base_name = os.path.splitext(os.path.basename(pdf_path))[0]
-                for i, image in enumerate(images, start=1):
-                    self.status_var.set(f"🔄 Menyimpan gambar {i}/{len(images)}...")
-                    self.root.update()
-                    
-                    ext = "png" if img_format == "PNG" else "jpg"
-                    out_file = os.path.join(out_dir, f"{base_name}_halaman_{i}.{ext}")
-                    image.save(out_file, img_format)
+            # Pilih rentang halaman
+            page_count = get_page_count(pdf_path, poppler_path or None)
+            pages = None
+            while pages is None:
+                range_text = simpledialog.askstring(
+                    "Rentang Halaman",
+                    f"PDF berisi {page_count} halaman.\n\n"
+                    "Masukkan halaman yang dikonversi (contoh: 1-10, 15, 20-25).\n"
+                    "Kosongkan untuk semua halaman.",
+                    parent=self.root
+                )
+                if range_text is None:
+                    self.status_var.set("✅ Ready")
+                    return
+                try:
+                    pages = parse_page_range(range_text, page_count)
+                except ValueError as e:
+                    messagebox.showerror("Rentang Tidak Valid", f"Rentang halaman tidak valid:\n{e}")
             
-            self.status_var.set(f"✅ PDF → Images selesai: {len(images)} halaman")
+            # Render per jendela halaman dan langsung disimpan, sehingga memori
+            # tidak bergantung jumlah halaman (halaman yang pernah dirender diambil dari cache
+            # halaman penuh, terpisah dari cache header Cek NO KK)
+            configure_page_render_cache(get_page_render_cache_dir(), config_manager.get_page_render_cache_mb())
+            thread_count = min(PAGE_WINDOW, os.cpu_count() or 1)
+            base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+            ext = "png" if img_format == "PNG" else "jpg"
+            saved = 0
+            
+            for page, image in iter_rendered_pages(pdf_path, pages, dpi=200, poppler_path=poppler_path or None,
+                                                   window=PAGE_WINDOW, thread_count=thread_count):
+                self.status_var.set(f"🔄 Menyimpan halaman {page} ({saved + 1}/{len(pages)})...")
+                self.root.update()
+                
+                out_file = os.path.join(out_dir, f"{base_name}_halaman_{page}.{ext}")
+                image.save(out_file, img_format)
+                image.close()
+                saved += 1
+            
+            self.status_var.set(f"✅ PDF → Images selesai: {saved} halaman")
             messagebox.showinfo(
                 "Selesai",
-                f"PDF berhasil dikonversi menjadi {len(images)} gambar di:\n{out_dir}"
+                f"PDF berhasil dikonversi menjadi {saved} gambar di:\n{out_dir}"
             )
         except Exception as e:
             messagebox.showerror("Error", f"Gagal konversi PDF ke gambar:\n{e}")
@@ -413,41 +403,19 @@ class PDFToolApp:
             self.status_var.set(f"🔄 Memproses {len(paths)} gambar...")
             self.root.update()
             
-            images = []
-            for idx, img_path in enumerate(paths, 1):
-                self.status_var.set(f"🔄 Memproses gambar {idx}/{len(paths)}: {os.path.basename(img_path)}")
-                self.root.update()
-                
-                img = self.PIL_Image.open(img_path)
-                
-                # Convert RGBA to RGB (PDF doesn't support transparency)
-                if img.mode == 'RGBA':
-                    # Create white background
-                    background = self.PIL_Image.new('RGB', img.size, (255, 255, 255))
-                    background.paste(img, mask=img.split()[3])  # Use alpha channel as mask
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                images.append(img)
-
-            # Save as PDF
-            if images:
-                self.status_var.set("🔄 Menyimpan PDF...")
+            def on_progress(idx, total, img_path):
+                self.status_var.set(f"🔄 Memproses gambar {idx}/{total}: {os.path.basename(img_path)}")
                 self.root.update()
-                
-                images[0].save(
-                    out_path, 
-                    "PDF", 
-                    resolution=100.0, 
-                    save_all=True, 
-                    append_images=images[1:] if len(images) > 1 else []
-                )
+            
+            # JPEG di-embed apa adanya, gambar lain diproses satu per satu (streaming)
+            stats = build_pdf_from_images(list(paths), out_path, progress=on_progress)
 
             self.status_var.set(f"✅ Images → PDF selesai: {len(paths)} gambar")
             messagebox.showinfo(
                 "Selesai", 
                 f"✅ PDF berhasil dibuat dari {len(paths)} gambar!\n\n"
+                f"JPEG tanpa encode ulang: {stats['passthrough']}\n"
+                f"Gambar lain (lossless): {stats['reencoded']}\n\n"
                 f"Output: {out_path}"
             )
         except Exception as e:
@@ -455,107 +423,125 @@ class PDFToolApp:
             messagebox.showerror("Error", f"Gagal menggabungkan images menjadi PDF:\n\n{str(e)}")
 
     def compress_pdf(self):
-        if not self._ensure_pypdf():
+        if not self._ensure_pypdf() or not self._ensure_pillow():
             return
 
-        path = filedialog.askopenfilename(
+        paths = filedialog.askopenfilenames(
             title="Pilih PDF untuk di-compress", 
             filetypes=[("PDF Files", "*.pdf")]
         )
-        if not path:
+        if not paths:
             return
 
-        out_path = filedialog.asksaveasfilename(
-            title="Simpan hasil compress sebagai", 
-            defaultextension=".pdf", 
-            filetypes=[("PDF Files", "*.pdf")]
+        # Satu file: pilih nama hasil; beberapa file: pilih folder, nama diberi akhiran _compressed
+        if len(paths) == 1:
+            out_path = filedialog.asksaveasfilename(
+                title="Simpan hasil compress sebagai", 
+                defaultextension=".pdf", 
+                filetypes=[("PDF Files", "*.pdf")]
+            )
+            if not out_path:
+                return
+            jobs = [(paths[0], out_path)]
+        else:
+            out_dir = filedialog.askdirectory(title="Pilih folder untuk hasil compress")
+            if not out_dir:
+                return
+            jobs = [
+                (path, os.path.join(out_dir, f"{os.path.splitext(os.path.basename(path))[0]}_compressed.pdf"))
+                for path in paths
+            ]
+
+        target_dpi = simpledialog.askinteger(
+            "DPI Gambar",
+            "DPI maksimum gambar di dalam PDF (gambar di atas ini di-downsample).\n"
+            "150 cukup untuk dibaca di layar, 200-300 untuk dicetak.",
+            initialvalue=config_manager.get_compress_target_dpi(),
+            minvalue=50, maxvalue=600,
+            parent=self.root
         )
-        if not out_path:
+        if target_dpi is None:
             return
+        jpeg_quality = simpledialog.askinteger(
+            "Kualitas JPEG",
+            "Kualitas JPEG untuk gambar berwarna/abu-abu (1-95).\n"
+            "Makin kecil makin ringan, 50-70 umumnya masih jelas.",
+            initialvalue=config_manager.get_compress_jpeg_quality(),
+            minvalue=1, maxvalue=95,
+            parent=self.root
+        )
+        if jpeg_quality is None:
+            return
+        config_manager.set_compress_target_dpi(target_dpi)
+        config_manager.set_compress_jpeg_quality(jpeg_quality)
 
-        try:
-            self.status_var.set("🔄 Membaca dan menganalisis PDF...")
-            self.root.update()
-            
-            with open(path, 'rb') as pdf_file:
-                reader = self.PdfReader(pdf_file)
-                writer = self.PdfWriter()
-                
-                total_pages = len(reader.pages)
-                
-                # Copy pages and compress content streams
-                for i, page in enumerate(reader.pages, 1):
-                    self.status_var.set(f"🔄 Memproses halaman {i}/{total_pages}...")
-                    self.root.update()
-                    
-                    # Compress content streams BEFORE adding to writer
-                    try:
-                        page.compress_content_streams()
-                    except Exception:
-                        pass
-                    
-                    writer.add_page(page)
-
-                # Transfer minimal metadata
-                if reader.metadata:
-                    try:
-                        # Only copy essential metadata
-                        essential_meta = {}
-                        for key in ['/Title', '/Author', '/Subject']:
-                            if key in reader.metadata:
-                                essential_meta[key] = reader.metadata[key]
-                        if essential_meta:
-                            writer.add_metadata(essential_meta)
-                    except Exception:
-                        pass
-                
-                # Remove duplicate objects and compress
-                self.status_var.set("🔄 Mengoptimalkan dan menghapus duplikasi...")
+        def format_size(size_bytes):
+            if size_bytes >= 1024*1024:
+                return f"{size_bytes / (1024*1024):.2f} MB"
+            else:
+                return f"{size_bytes / 1024:.1f} KB"
+
+        report_lines = []
+        failed = []
+        total_original = 0
+        total_compressed = 0
+        for file_idx, (path, out_path) in enumerate(jobs, 1):
+            name = os.path.basename(path)
+            prefix = f"[{file_idx}/{len(jobs)}] {name}: " if len(jobs) > 1 else ""
+
+            def on_progress(message):
+                self.status_var.set(f"🔄 {prefix}{message}...")
                 self.root.update()
-                
-                # Write with compression
-                with open(out_path, 'wb') as output_file:
-                    writer.write(output_file)
 
-            # Get file sizes
-            original_size = os.path.getsize(path)
-            compressed_size = os.path.getsize(out_path)
-            reduction = ((original_size - compressed_size) / original_size * 100)
+            try:
+                stats = compress_pdf_file(path, out_path, target_dpi, jpeg_quality, progress=on_progress)
+            except Exception as e:
+                failed.append(f"• {name}: {e}")
+                continue
 
-            self.status_var.set(f"✅ Optimasi selesai: {os.path.basename(out_path)}")
-            
-            # Format sizes
-            def format_size(size_bytes):
-                if size_bytes >= 1024*1024:
-                    return f"{size_bytes / (1024*1024):.2f} MB"
-                else:
-                    return f"{size_bytes / 1024:.1f} KB"
-            
-            if reduction > 0:
-                size_info = (
-                    f"✅ PDF berhasil dioptimasi!\n\n"
-                    f"Ukuran awal: {format_size(original_size)}\n"
-                    f"Ukuran akhir: {format_size(compressed_size)}\n"
-                    f"Pengurangan: {reduction:.1f}%\n\n"
-                    f"💾 File disimpan di:\n{out_path}"
-                )
+            original_size = stats["original_size"]
+            compressed_size = stats["compressed_size"]
+            total_original += original_size
+            total_compressed += compressed_size
+            reduction = (original_size - compressed_size) / original_size * 100 if original_size else 0
+
+            if stats["kept_original_file"]:
+                detail = "sudah optimal, file asli disalin"
             else:
-                # File malah bertambah atau sama
-                increase = abs(reduction)
-                size_info = (
-                    f"⚠️ PDF telah dioptimasi\n\n"
-                    f"Ukuran awal: {format_size(original_size)}\n"
-                    f"Ukuran akhir: {format_size(compressed_size)}\n"
-                    f"Perubahan: +{increase:.1f}%\n\n"
-                    f"ℹ️ Catatan: PDF ini sudah teroptimasi atau\n"
-                    f"mengandung konten yang tidak bisa dikompresi lebih lanjut.\n\n"
-                    f"💾 File disimpan di:\n{out_path}"
-                )
-            
-            messagebox.showinfo("Selesai", size_info)
-        except Exception as e:
+                parts = [f"{stats['recompressed']}/{stats['images']} gambar dikompres"]
+                if stats["downsampled"]:
+                    parts.append(f"{stats['downsampled']} di-downsample")
+                if stats["bilevel"]:
+                    parts.append(f"{stats['bilevel']} hitam-putih")
+                if stats["duplicates"]:
+                    parts.append(f"{stats['duplicates']} duplikat digabung")
+                detail = ", ".join(parts)
+            report_lines.append(
+                f"• {name}: {format_size(original_size)} → {format_size(compressed_size)} "
+                f"(-{reduction:.1f}%)\n   {detail}"
+            )
+
+        if not report_lines:
             self.status_var.set("❌ Error saat compress PDF")
-            messagebox.showerror("Error", f"Gagal melakukan compress PDF:\n\n{str(e)}")
+            messagebox.showerror("Error", "Gagal melakukan compress PDF:\n\n" + "\n".join(failed))
+            return
+
+        self.status_var.set(f"✅ Compress selesai: {len(report_lines)} file")
+
+        total_reduction = (total_original - total_compressed) / total_original * 100 if total_original else 0
+        size_info = "✅ Compress PDF selesai!\n\n" + "\n".join(report_lines[:15])
+        if len(report_lines) > 15:
+            size_info += f"\n... dan {len(report_lines) - 15} file lainnya"
+        if len(report_lines) > 1:
+            size_info += (
+                f"\n\nTotal: {format_size(total_original)} → {format_size(total_compressed)} "
+                f"(-{total_reduction:.1f}%)"
+            )
+        if failed:
+            size_info += "\n\n❌ Gagal:\n" + "\n".join(failed[:10])
+        size_info += f"\n\n💾 File disimpan di:\n{os.path.dirname(jobs[0][1])}"
+
+        messagebox.showinfo("Selesai", size_info)
 
     def back_to_menu(self):
         if self.parent_window:
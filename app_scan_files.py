@@ -4,6 +4,7 @@ Scan Large Files App - Form untuk scan file besar (>10MB)
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+import time
 import pandas as pd
 from datetime import datetime
 
@@ -11,8 +12,10 @@ from app_helpers import (
     get_appdata_path,
     get_database_path,
     get_export_path,
-    get_responsive_dimensions
+    get_responsive_dimensions,
+    config_manager
 )
+from arsip_logic import TopKTracker
 
 class ScanLargeFilesApp:
     """Form untuk Scan File Besar (>10MB) dari Folder Arsip Digital Owncloud"""
@@ -21,13 +24,8 @@ class ScanLargeFilesApp:
         self.root = root
         self.parent_window = parent_window
         
-        # File yang akan diabaikan (owncloud sync files)
-        self.ignored_files = {
-            '.owncloudsync.log',
-            '.owncloudsync.log.1',
-            '.sync_journal.db',
-            '.sync_journal.db-wal'
-        }
+        # File/folder yang diabaikan (owncloud sync files, temporary, konflik)
+        self.ignore_matcher = config_manager.get_ignore_matcher()
         
         # Format dokumen yang umum/diizinkan (untuk mode format)
         self.allowed_extensions = {
@@ -45,12 +43,22 @@ class ScanLargeFilesApp:
         # Default minimum size in MB
         self.min_size_mb = 10
         
+        # Default mode Top-K
+        self.top_k = 100
+        self.time_budget_sec = 0
+        # Interval refresh treeview saat scan berjalan (detik)
+        self.live_refresh_interval = 0.5
+        # Batas waktu/stop/refresh dicek setiap N entry (juga di tengah folder besar)
+        self.check_every_entries = 500
+        
         self.setup_window()
         self.create_widgets()
         
         # Variables
         self.selected_folder = ""
         self.scan_results = []
+        # Keterangan jika hasil Top-K hanya sebagian (scan dihentikan lebih awal)
+        self.scan_partial_note = None
     
     def setup_window(self):
         """Setup window utama aplikasi"""
@@ -174,6 +182,24 @@ class ScanLargeFilesApp:
         )
         mode_format_rb.grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
         
+        mode_topk_rb = ttk.Radiobutton(
+            mode_frame,
+            text="🏆 Top-K File Terbesar (hasil tampil langsung saat scan)",
+            variable=self.scan_mode,
+            value="topk",
+            command=self.on_mode_change
+        )
+        mode_topk_rb.grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+        
+        mode_folders_rb = ttk.Radiobutton(
+            mode_frame,
+            text="📁 Folder Terbesar (total ukuran & jumlah file per folder)",
+            variable=self.scan_mode,
+            value="folders",
+            command=self.on_mode_change
+        )
+        mode_folders_rb.grid(row=3, column=0, sticky=tk.W, pady=(5, 0))
+        
         # Frame untuk ukuran minimum (hanya aktif jika mode = size)
         self.size_frame = ttk.LabelFrame(main_frame, text="Pengaturan Ukuran", padding=str(frame_padding))
         self.size_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(0, 15))
@@ -189,6 +215,31 @@ class ScanLargeFilesApp:
         ttk.Label(self.size_frame, text="(File yang lebih kecil akan diabaikan)", 
                  font=("Arial", self.fonts['small']), foreground="gray").grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
         
+        # Pengaturan mode Top-K
+        ttk.Label(self.size_frame, text="Jumlah Top-K / Top-N:").grid(row=1, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        
+        self.topk_var = tk.StringVar(value=str(self.top_k))
+        self.topk_entry = ttk.Entry(self.size_frame, textvariable=self.topk_var, width=10, state="disabled")
+        self.topk_entry.grid(row=1, column=1, sticky=tk.W, pady=(10, 0))
+        
+        self.stop_at_k_var = tk.BooleanVar(value=False)
+        self.stop_at_k_cb = ttk.Checkbutton(
+            self.size_frame,
+            text="Berhenti setelah K file ditemukan",
+            variable=self.stop_at_k_var,
+            state="disabled"
+        )
+        self.stop_at_k_cb.grid(row=1, column=2, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        
+        ttk.Label(self.size_frame, text="Batas Waktu (detik):").grid(row=2, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        
+        self.time_budget_var = tk.StringVar(value=str(self.time_budget_sec))
+        self.time_budget_entry = ttk.Entry(self.size_frame, textvariable=self.time_budget_var, width=10, state="disabled")
+        self.time_budget_entry.grid(row=2, column=1, sticky=tk.W, pady=(10, 0))
+        
+        ttk.Label(self.size_frame, text="(0 = tanpa batas waktu)", 
+                 font=("Arial", self.fonts['small']), foreground="gray").grid(row=2, column=2, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        
         # Frame untuk folder selection
         folder_frame = ttk.LabelFrame(main_frame, text="Pilih Folder Arsip Digital Owncloud", padding=str(frame_padding))
         folder_frame.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(0, 15))
@@ -302,10 +353,21 @@ class ScanLargeFilesApp:
         """Handle perubahan mode scan"""
         mode = self.scan_mode.get()
         
+        topk_state = "normal" if mode == "topk" else "disabled"
+        self.topk_entry.config(state="normal" if mode in ("topk", "folders") else "disabled")
+        self.stop_at_k_cb.config(state=topk_state)
+        self.time_budget_entry.config(state=topk_state)
+        
         if mode == "size":
             # Enable size input
             self.size_entry.config(state="normal")
             self.info_var.set("Mode: File Besar - Pilih folder untuk memulai scan")
+        elif mode == "topk":
+            self.size_entry.config(state="disabled")
+            self.info_var.set("Mode: Top-K File Terbesar - Pilih folder untuk memulai scan")
+        elif mode == "folders":
+            self.size_entry.config(state="disabled")
+            self.info_var.set("Mode: Folder Terbesar - Pilih folder untuk memulai scan")
         else:  # format
             # Disable size input
             self.size_entry.config(state="disabled")
@@ -350,18 +412,63 @@ class ScanLargeFilesApp:
             except ValueError:
                 messagebox.showerror("Error", "Ukuran minimum harus berupa angka!")
                 return
+        elif mode == "topk":
+            try:
+                self.top_k = int(self.topk_var.get())
+                self.time_budget_sec = float(self.time_budget_var.get() or 0)
+                if self.top_k <= 0 or self.time_budget_sec < 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error", "Top-K harus angka bulat > 0 dan batas waktu >= 0!")
+                return
+        elif mode == "folders":
+            try:
+                self.top_k = int(self.topk_var.get())
+                if self.top_k <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error", "Top-N harus angka bulat > 0!")
+                return
         
         # Clear previous results
         self.clear_results()
         
+        # Ambil pola ignore terbaru (bisa berubah dari menu Pengaturan)
+        self.ignore_matcher = config_manager.get_ignore_matcher()
+        
+        if mode == "topk":
+            self.start_top_k_scan()
+            return
+        
         # Progress dialog
         if mode == "size":
             progress_msg = f"Scanning file lebih dari {self.min_size_mb} MB..."
+        elif mode == "folders":
+            progress_msg = "Menghitung ukuran setiap folder..."
         else:
             progress_msg = "Scanning file dengan format non-dokumen..."
         
         progress_window = self.show_progress_dialog(progress_msg)
         
+        if mode == "folders":
+            try:
+                stats = self.scan_largest_folders(self.selected_folder, progress_window)
+                progress_window.destroy()
+                self.display_results()
+                
+                self.info_var.set(
+                    f"✅ Scan selesai! Top {len(self.scan_results)} dari {stats['total_folders']} folder "
+                    f"(Total: {stats['total_files']} file, {stats['total_size_bytes'] / (1024 * 1024):.2f} MB)"
+                )
+                
+                if self.scan_results:
+                    self.export_btn.config(state="normal")
+                    self.clear_btn.config(state="normal")
+            except Exception as e:
+                progress_window.destroy()
+                messagebox.showerror("Error", f"Terjadi kesalahan saat scan:\n{str(e)}")
+            return
+        
         try:
             # Scan folder
             self.scan_results = []
@@ -407,12 +514,11 @@ class ScanLargeFilesApp:
                 min_size_bytes = self.min_size_mb * 1024 * 1024  # Convert MB to bytes
             
             for root, dirs, files in os.walk(folder_path):
-                for file in files:
+                # Folder yang diabaikan tidak ditelusuri
+                self.ignore_matcher.prune_dirs(dirs)
+                
+                for file in self.ignore_matcher.filter_files(files):
                     try:
-                        # Skip ignored files (owncloud sync files)
-                        if file in self.ignored_files:
-                            continue
-                        
                         file_path = os.path.join(root, file)
                         file_size = os.path.getsize(file_path)
                         
@@ -447,12 +553,237 @@ class ScanLargeFilesApp:
         except Exception as e:
             print(f"Error scanning folder: {str(e)}")
     
+    def start_top_k_scan(self):
+        """Scan Top-K file terbesar dengan hasil yang langsung tampil di treeview"""
+        self.scan_btn.config(state="disabled")
+        self.info_var.set(f"🔄 Scanning Top-{self.top_k} file terbesar...")
+        self.root.update()
+        
+        try:
+            stats = self.scan_top_k(self.selected_folder)
+            
+            total_files = len(self.scan_results)
+            total_size_mb = sum(f['size_bytes'] for f in self.scan_results) / (1024 * 1024)
+            
+            if stats["stop_reason"]:
+                # Scan dihentikan lebih awal: hanya file yang sempat diperiksa yang dibandingkan,
+                # jadi hasilnya bukan Top-K seluruh folder
+                if stats["stop_reason"] == "time":
+                    reason = f"batas waktu {self.time_budget_sec:g} detik"
+                else:
+                    reason = f"{self.top_k} file ditemukan"
+                self.scan_partial_note = (
+                    f"Hasil sebagian: scan dihentikan ({reason}) setelah {stats['files_seen']} file "
+                    f"diperiksa, bukan Top-{self.top_k} dari seluruh folder"
+                )
+                self.info_var.set(
+                    f"⚠️ {self.scan_partial_note}. "
+                    f"(Total: {total_size_mb:.2f} MB, {stats['elapsed']:.1f} detik)"
+                )
+            else:
+                self.info_var.set(
+                    f"✅ Scan selesai! Top {total_files} dari {stats['files_seen']} file "
+                    f"(Total: {total_size_mb:.2f} MB, {stats['elapsed']:.1f} detik)"
+                )
+            
+            if total_files > 0:
+                self.export_btn.config(state="normal")
+                self.clear_btn.config(state="normal")
+        except Exception as e:
+            messagebox.showerror("Error", f"Terjadi kesalahan saat scan:\n{str(e)}")
+        finally:
+            self.scan_btn.config(state="normal")
+    
+    def scan_top_k(self, folder_path):
+        """Walk folder dengan min-heap berukuran K, refresh treeview secara berkala
+        
+        Memori tetap O(K). Ukuran diambil dari os.scandir (DirEntry.stat tidak
+        butuh system call tambahan di Windows). Batas waktu, berhenti di K, dan
+        refresh dicek setiap self.check_every_entries entry, juga di tengah folder besar.
+        """
+        tracker = TopKTracker(self.top_k)
+        start_time = time.monotonic()
+        state = {"last_refresh": start_time, "shown_version": 0, "files_seen": 0, "stop_reason": None}
+        
+        def check_progress():
+            now = time.monotonic()
+            if self.stop_at_k_var.get() and tracker.is_full():
+                state["stop_reason"] = "k"
+            elif self.time_budget_sec and now - start_time >= self.time_budget_sec:
+                state["stop_reason"] = "time"
+            
+            # Refresh hasil sementara ke treeview
+            if now - state["last_refresh"] >= self.live_refresh_interval:
+                state["last_refresh"] = now
+                if tracker.version != state["shown_version"]:
+                    state["shown_version"] = tracker.version
+                    self.scan_results = tracker.sorted_items()
+                    self.display_results()
+                self.info_var.set(
+                    f"🔄 Scanning... {state['files_seen']} file diperiksa, "
+                    f"top-{self.top_k} saat ini ≥ {tracker.threshold() / (1024 * 1024):.2f} MB"
+                )
+                self.root.update()
+        
+        entries_since_check = 0
+        stack = [folder_path]
+        while stack and state["stop_reason"] is None:
+            current_dir = stack.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        entries_since_check += 1
+                        if entries_since_check >= self.check_every_entries:
+                            entries_since_check = 0
+                            check_progress()
+                            if state["stop_reason"] is not None:
+                                break
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not self.ignore_matcher.ignore_dir(entry.name):
+                                    stack.append(entry.path)
+                                continue
+                            
+                            # Skip ignored files (owncloud sync files)
+                            if self.ignore_matcher.ignore_file(entry.name):
+                                continue
+                            
+                            file_size = entry.stat().st_size
+                            state["files_seen"] += 1
+                            
+                            # Lewati file yang tidak mungkin masuk top-K tanpa membuat record
+                            if tracker.is_full() and file_size <= tracker.threshold():
+                                continue
+                            
+                            _, ext = os.path.splitext(entry.name)
+                            ext = ext.lower()
+                            tracker.push(file_size, {
+                                'name': entry.name,
+                                'size_bytes': file_size,
+                                'size_mb': file_size / (1024 * 1024),
+                                'path': entry.path,
+                                'extension': ext if ext else '(no ext)'
+                            })
+                        except OSError:
+                            # Skip files that can't be accessed
+                            continue
+            except OSError as e:
+                print(f"Error scanning folder {current_dir}: {str(e)}")
+            
+            if state["stop_reason"] is None:
+                check_progress()
+        
+        self.scan_results = tracker.sorted_items()
+        self.display_results()
+        
+        return {
+            "files_seen": state["files_seen"],
+            "elapsed": time.monotonic() - start_time,
+            "stop_reason": state["stop_reason"]
+        }
+    
+    def scan_largest_folders(self, folder_path, progress_window=None):
+        """Hitung total ukuran & jumlah file setiap folder dalam satu kali walk
+        
+        Walk post-order: ukuran sebuah folder sudah final saat semua subfolder
+        selesai, lalu langsung digulung ke parent. Tidak ada os.walk per folder.
+        """
+        root_path = os.path.normpath(folder_path)
+        tracker = TopKTracker(self.top_k)
+        # path -> [total_size, total_files, direct_size, direct_files]
+        totals = {}
+        total_folders = 0
+        root_totals = (0, 0)
+        last_refresh = time.monotonic()
+        
+        # (path, parent, sudah_dikunjungi)
+        stack = [(root_path, None, False)]
+        while stack:
+            current_dir, parent_dir, visited = stack.pop()
+            
+            if visited:
+                total_size, total_files, direct_size, direct_files = totals.pop(current_dir)
+                
+                if parent_dir is not None:
+                    total_folders += 1
+                    tracker.push(total_size, {
+                        'type': 'folder',
+                        'name': os.path.basename(current_dir),
+                        'size_bytes': total_size,
+                        'size_mb': total_size / (1024 * 1024),
+                        'file_count': total_files,
+                        'direct_size_bytes': direct_size,
+                        'direct_file_count': direct_files,
+                        'path': current_dir
+                    })
+                    # Gulung ke parent (parent masih di stack, belum final)
+                    parent_totals = totals.get(parent_dir)
+                    if parent_totals is not None:
+                        parent_totals[0] += total_size
+                        parent_totals[1] += total_files
+                else:
+                    root_totals = (total_size, total_files)
+                continue
+            
+            direct_size = 0
+            direct_files = 0
+            stack.append((current_dir, parent_dir, True))
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not self.ignore_matcher.ignore_dir(entry.name):
+                                    stack.append((entry.path, current_dir, False))
+                            elif not self.ignore_matcher.ignore_file(entry.name):
+                                direct_size += entry.stat().st_size
+                                direct_files += 1
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"Error scanning folder {current_dir}: {str(e)}")
+            
+            totals[current_dir] = [direct_size, direct_files, direct_size, direct_files]
+            
+            now = time.monotonic()
+            if progress_window is not None and now - last_refresh >= 0.5:
+                last_refresh = now
+                progress_window.update()
+        
+        grand_total_size, grand_total_files = root_totals
+        self.scan_results = tracker.sorted_items()
+        for folder_info in self.scan_results:
+            folder_info['share_pct'] = (
+                folder_info['size_bytes'] / grand_total_size * 100 if grand_total_size else 0.0
+            )
+        
+        return {
+            "total_folders": total_folders,
+            "total_files": grand_total_files,
+            "total_size_bytes": grand_total_size
+        }
+    
     def display_results(self):
         """Menampilkan hasil scan di treeview"""
         # Clear existing items
         for item in self.tree.get_children():
             self.tree.delete(item)
         
+        is_folder_mode = bool(self.scan_results) and self.scan_results[0].get('type') == 'folder'
+        self.tree.heading("Nama File", text="Nama Folder" if is_folder_mode else "Nama File")
+        self.tree.heading("Ekstensi", text="Jumlah File" if is_folder_mode else "Ekstensi")
+        
+        if is_folder_mode:
+            for idx, folder_info in enumerate(self.scan_results, 1):
+                self.tree.insert("", tk.END, values=(
+                    idx,
+                    folder_info['name'],
+                    folder_info['file_count'],
+                    f"{folder_info['size_mb']:.2f} MB ({folder_info['share_pct']:.1f}%)",
+                    folder_info['path']
+                ))
+            return
+        
         # Add results
         for idx, file_info in enumerate(self.scan_results, 1):
             self.tree.insert("", tk.END, values=(
@@ -480,7 +811,30 @@ class ScanLargeFilesApp:
                 ]
             )
             
-            if file_path:
+            if file_path and self.scan_results[0].get('type') == 'folder':
+                data = []
+                for idx, folder_info in enumerate(self.scan_results, 1):
+                    data.append({
+                        'No': idx,
+                        'Nama Folder': folder_info['name'],
+                        'Jumlah File': folder_info['file_count'],
+                        'Ukuran (MB)': round(folder_info['size_mb'], 2),
+                        'Ukuran (Bytes)': folder_info['size_bytes'],
+                        'Persentase dari Total (%)': round(folder_info['share_pct'], 2),
+                        'File Langsung': folder_info['direct_file_count'],
+                        'Ukuran File Langsung (MB)': round(folder_info['direct_size_bytes'] / (1024 * 1024), 2),
+                        'Path Lengkap': folder_info['path']
+                    })
+                
+                pd.DataFrame(data).to_excel(file_path, index=False, sheet_name="Folder_Terbesar")
+                
+                messagebox.showinfo(
+                    "Export Berhasil",
+                    f"Data berhasil di-export!\n\n"
+                    f"File: {file_path}\n"
+                    f"Total: {len(self.scan_results)} folder"
+                )
+            elif file_path:
                 # Create DataFrame
                 data = []
                 for idx, file_info in enumerate(self.scan_results, 1):
@@ -495,14 +849,20 @@ class ScanLargeFilesApp:
                 
                 df = pd.DataFrame(data)
                 
-                # Export to Excel
-                df.to_excel(file_path, index=False, sheet_name="File_Besar")
+                # Export to Excel (hasil Top-K sebagian diberi sheet keterangan)
+                with pd.ExcelWriter(file_path) as writer:
+                    df.to_excel(writer, index=False, sheet_name="File_Besar")
+                    if self.scan_partial_note:
+                        pd.DataFrame({"Keterangan": [self.scan_partial_note]}).to_excel(
+                            writer, index=False, sheet_name="Keterangan"
+                        )
                 
                 messagebox.showinfo(
                     "Export Berhasil",
                     f"Data berhasil di-export!\n\n"
                     f"File: {file_path}\n"
                     f"Total: {len(self.scan_results)} file"
+                    + (f"\n\n⚠️ {self.scan_partial_note}" if self.scan_partial_note else "")
                 )
         except Exception as e:
             messagebox.showerror("Error", f"Gagal export ke Excel:\n{str(e)}")
@@ -515,6 +875,7 @@ class ScanLargeFilesApp:
         
         # Clear results
         self.scan_results = []
+        self.scan_partial_note = None
         
         # Disable buttons
         self.export_btn.config(state="disabled")
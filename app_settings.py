@@ -23,7 +23,8 @@ from app_helpers import (
     get_database_path,
     get_export_path,
     get_responsive_dimensions,
-    config_manager
+    config_manager,
+    DEFAULT_IGNORE_PATTERNS
 )
 from web_server import get_web_server_manager
 
@@ -318,6 +319,40 @@ class SettingsApp:
         # Update server status saat load
         self.update_server_status()
         
+        # ===== IGNORE PATTERN SECTION =====
+        ignore_frame = ttk.LabelFrame(main_frame, text="🚫 File & Folder yang Diabaikan Scanner", padding=str(folder_padding))
+        ignore_frame.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(0, 15))
+        ignore_frame.columnconfigure(0, weight=1)
+        
+        ignore_info_label = ttk.Label(
+            ignore_frame,
+            text="Satu pola per baris. Glob (contoh: ~$*), awalan 're:' untuk regex, "
+                 "akhiran '/' hanya untuk folder (isinya tidak di-scan).",
+            font=("Arial", 9),
+            foreground="gray",
+            wraplength=wrap_length
+        )
+        ignore_info_label.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        self.ignore_text = tk.Text(ignore_frame, height=7, font=("Consolas", 9), wrap=tk.NONE)
+        self.ignore_text.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        self.ignore_text.insert("1.0", "\n".join(config_manager.get_ignore_patterns()))
+        
+        ignore_btn_frame = ttk.Frame(ignore_frame)
+        ignore_btn_frame.grid(row=2, column=0)
+        
+        ttk.Button(
+            ignore_btn_frame,
+            text="💾 Simpan Pola",
+            command=self.save_ignore_patterns
+        ).grid(row=0, column=0, padx=(0, 10))
+        
+        ttk.Button(
+            ignore_btn_frame,
+            text="↩️ Kembalikan Default",
+            command=self.reset_ignore_patterns
+        ).grid(row=0, column=1, padx=(10, 0))
+        
         # Status label
         self.status_var = tk.StringVar(value="")
         status_label = ttk.Label(
@@ -326,11 +361,11 @@ class SettingsApp:
             font=("Arial", 9),
             foreground="green"
         )
-        status_label.grid(row=4, column=0, pady=(0, 15))
+        status_label.grid(row=5, column=0, pady=(0, 15))
         
         # Footer buttons
         footer_frame = ttk.Frame(main_frame)
-        footer_frame.grid(row=5, column=0, pady=(10, 0))
+        footer_frame.grid(row=6, column=0, pady=(10, 0))
         
         # Back button
         if self.parent_window:
@@ -512,6 +547,22 @@ class SettingsApp:
         else:
             messagebox.showinfo("Info", "Tidak ada folder default yang tersimpan.")
     
+    def save_ignore_patterns(self):
+        """Simpan pola ignore dari text box ke konfigurasi"""
+        patterns = [line.strip() for line in self.ignore_text.get("1.0", tk.END).splitlines() if line.strip()]
+        
+        if config_manager.set_ignore_patterns(patterns):
+            self.status_var.set(f"✅ {len(patterns)} pola ignore berhasil disimpan!")
+            self.root.after(3000, lambda: self.status_var.set(""))
+        else:
+            messagebox.showerror("Error", "Gagal menyimpan konfigurasi!")
+    
+    def reset_ignore_patterns(self):
+        """Kembalikan pola ignore ke default"""
+        self.ignore_text.delete("1.0", tk.END)
+        self.ignore_text.insert("1.0", "\n".join(DEFAULT_IGNORE_PATTERNS))
+        self.save_ignore_patterns()
+    
     def back_to_menu(self):
         """Kembali ke menu utama"""
         if self.parent_window:
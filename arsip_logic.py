@@ -8,6 +8,8 @@ sehingga mudah untuk maintenance dan testing.
 
 import os
 import re
+import heapq
+import itertools
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
@@ -183,6 +185,202 @@ class FileManager:
             return False
 
 
+class FolderRuleMatcher:
+    """
+    Aturan struktur folder standar yang dikompilasi menjadi trie per komponen path.
+
+    Setiap folder dievaluasi satu kali dari state folder parent-nya, sehingga
+    status, keterangan dan format kolom hierarki bisa langsung disimpan pada
+    record folder selama walk (export tinggal membaca).
+    """
+
+    STANDARD_FOLDERS = [
+        "01.SURAT_MENYURAT", "02.DATA_ANGGOTA", "03.DATA_ANGGOTA_KELUAR",
+        "04.DATA_DANA_RESIKO", "05.DATA_HARI_RAYA_ANGGOTA", "06.LAPORAN_BULANAN",
+        "07.BUKU_BANK", "08.DATA_LWK"
+    ]
+
+    DATA_ANGGOTA_FOLDER = "02.DATA_ANGGOTA"
+
+    def __init__(self, standard_folders: List[str] = None):
+        self.standard_folders = list(standard_folders or self.STANDARD_FOLDERS)
+        self.trie = self._compile()
+        # Cache hasil lookup folder level atas (nama -> node)
+        self._top_level_cache = {}
+
+    @staticmethod
+    def _new_node(rule: str = None, standard: bool = False) -> Dict[str, any]:
+        """Buat node trie kosong"""
+        return {"children": {}, "wildcard": None, "rule": rule, "standard": standard}
+
+    def _compile(self) -> Dict[str, any]:
+        """Kompilasi daftar folder standar dan aturan 02.DATA_ANGGOTA menjadi trie"""
+        root = self._new_node()
+
+        for std_folder in self.standard_folders:
+            node = self._new_node(standard=True)
+            # Subfolder standar tanpa aturan khusus mewarisi node-nya sendiri
+            node["wildcard"] = node
+            root["children"][std_folder] = node
+
+        # 02.DATA_ANGGOTA/<center 4 digit>/<IDANGGOTA_NAMA>/...
+        data_anggota = root["children"].get(self.DATA_ANGGOTA_FOLDER)
+        if data_anggota is None:
+            data_anggota = self._new_node(standard=True)
+            root["children"][self.DATA_ANGGOTA_FOLDER] = data_anggota
+
+        center_node = self._new_node(rule="center", standard=True)
+        anggota_node = self._new_node(rule="anggota", standard=True)
+        tail_node = self._new_node(standard=True)
+        tail_node["wildcard"] = tail_node
+
+        data_anggota["wildcard"] = center_node
+        center_node["wildcard"] = anggota_node
+        anggota_node["wildcard"] = tail_node
+
+        return root
+
+    def _match_top_level(self, name: str) -> Optional[Dict[str, any]]:
+        """Cari node untuk komponen pertama path (exact, lalu substring seperti aturan lama)"""
+        if name in self._top_level_cache:
+            return self._top_level_cache[name]
+
+        node = self.trie["children"].get(name)
+        if node is None:
+            # Nama seperti "02.DATA_ANGGOTA (copy)" tetap mengikuti aturan folder standar.
+            # Prioritaskan DATA_ANGGOTA karena hanya folder itu yang punya aturan khusus.
+            candidates = sorted(
+                self.trie["children"].keys(),
+                key=lambda std: std != self.DATA_ANGGOTA_FOLDER
+            )
+            for std_folder in candidates:
+                if std_folder in name:
+                    node = self.trie["children"][std_folder]
+                    break
+
+        self._top_level_cache[name] = node
+        return node
+
+    @staticmethod
+    def _center_keterangan(name: str) -> str:
+        if name.isdigit() and len(name) == 4:
+            return f"Center: {name}"
+        return f"⚠️ Bukan format center (bukan 4 digit): {name}"
+
+    @staticmethod
+    def _anggota_keterangan(name: str) -> str:
+        if "_" in name:
+            id_part = name.split("_", 1)[0]
+            if id_part.isdigit():
+                return f"Anggota: {id_part}"
+            return "⚠️ Format anggota tidak sesuai"
+        return "⚠️ Folder anggota tanpa underscore"
+
+    def evaluate(self, parent_state: Optional[Dict[str, any]], name: str) -> Dict[str, any]:
+        """
+        Evaluasi satu komponen path berdasarkan state folder parent
+
+        Args:
+            parent_state (Optional[Dict]): State parent, None untuk komponen pertama
+            name (str): Nama folder
+
+        Returns:
+            Dict[str, any]: State folder (node, keterangan, formatted_parts, standard)
+        """
+        if parent_state is None:
+            node = self._match_top_level(name)
+            keterangan = ""
+            formatted_parts = [name]
+        else:
+            parent_node = parent_state["node"]
+            node = None
+            if parent_node is not None:
+                node = parent_node["children"].get(name) or parent_node["wildcard"]
+            keterangan = parent_state["keterangan"]
+            formatted_part = name
+
+            rule = node["rule"] if node is not None else None
+            if rule == "center":
+                # Format SUB FOLDER 1 menjadi 4 digit dengan leading zero
+                if name.isdigit():
+                    formatted_part = name.zfill(4)
+                keterangan = self._center_keterangan(name)
+            elif rule == "anggota":
+                fragment = self._anggota_keterangan(name)
+                keterangan = f"{keterangan} | {fragment}" if keterangan else fragment
+
+            formatted_parts = parent_state["formatted_parts"] + [formatted_part]
+
+        return {
+            "node": node,
+            "keterangan": keterangan,
+            "formatted_parts": formatted_parts,
+            "standard": bool(node and node["standard"])
+        }
+
+    def evaluate_parts(self, path_parts: List[str]) -> Dict[str, any]:
+        """Evaluasi path lengkap (list komponen) tanpa state walk"""
+        state = None
+        for part in path_parts:
+            state = self.evaluate(state, part)
+        if state is None:
+            state = {"node": None, "keterangan": "", "formatted_parts": [], "standard": False}
+        return state
+
+    @staticmethod
+    def folder_status(file_count: int) -> str:
+        """Status kelengkapan folder berdasarkan jumlah file"""
+        return "TERISI" if file_count > 0 else "KOSONG"
+
+
+class TopKTracker:
+    """
+    Menyimpan K item dengan nilai terbesar memakai min-heap berukuran tetap.
+
+    Memori tetap O(K) berapapun jumlah item yang di-push, dan nilai minimum
+    heap bisa dipakai sebagai ambang untuk melewati item kecil lebih awal.
+    """
+
+    def __init__(self, k: int):
+        self.k = max(1, int(k))
+        self._heap = []
+        self._counter = itertools.count()
+        # Naik setiap kali isi heap berubah (untuk refresh tampilan seperlunya)
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def is_full(self) -> bool:
+        """True jika heap sudah berisi K item"""
+        return len(self._heap) >= self.k
+
+    def threshold(self) -> int:
+        """Nilai terkecil yang masih masuk top-K (0 jika heap belum penuh)"""
+        return self._heap[0][0] if self.is_full() else 0
+
+    def push(self, value: int, item: any) -> bool:
+        """
+        Tambahkan item jika masuk top-K
+
+        Returns:
+            bool: True jika isi top-K berubah
+        """
+        entry = (value, next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif value > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            return False
+        self.version += 1
+        return True
+
+    def sorted_items(self) -> List[any]:
+        """Item top-K terurut dari nilai terbesar"""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: (-e[0], e[1]))]
+
+
 class ArsipProcessor:
     """Class untuk memproses operasi arsip digital"""
     
@@ -419,9 +617,12 @@ class ArsipProcessor:
 class AnggotaFolderReader:
     """Class untuk membaca dan memproses struktur folder anggota"""
     
-    def __init__(self):
+    def __init__(self, ignore_matcher=None):
         self.file_manager = FileManager()
         
+        # Matcher file/folder yang diabaikan (lihat app_helpers.IgnoreMatcher), opsional
+        self.ignore_matcher = ignore_matcher
+        
         # Pattern untuk validasi folder
         self.center_pattern = r'^\d{4}$'  # 4 digit angka
         self.anggota_pattern = r'^\d{6}_\w+$'  # 6digit_nama
@@ -531,6 +732,9 @@ class AnggotaFolderReader:
             total_files = 0
             
             for item in os.listdir(anggota_folder_path):
+                if self.ignore_matcher and self.ignore_matcher.ignore_file(item):
+                    continue
+                
                 item_path = os.path.join(anggota_folder_path, item)
                 
                 if os.path.isfile(item_path):
@@ -606,6 +810,9 @@ class AnggotaFolderReader:
             
             # Scan semua item dalam folder center
             for item in os.listdir(center_folder_path):
+                if self.ignore_matcher and self.ignore_matcher.ignore_dir(item):
+                    continue
+                
                 item_path = os.path.join(center_folder_path, item)
                 
                 if os.path.isdir(item_path):
@@ -673,6 +880,9 @@ class AnggotaFolderReader:
             
             # Scan semua item dalam folder root
             for item in os.listdir(root_path):
+                if self.ignore_matcher and self.ignore_matcher.ignore_dir(item):
+                    continue
+                
                 item_path = os.path.join(root_path, item)
                 
                 if os.path.isdir(item_path):
@@ -0,0 +1,439 @@
+"""
+Business Logic Module untuk Cek Pengajuan Dana
+===============================================
+
+Ekstraksi data dari file PENGAJUAN_DANA.xlsm yang terpisah dari GUI,
+sehingga bisa dipakai dari form maupun dari proses worker.
+"""
+
+import fnmatch
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from openpyxl import load_workbook
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
+
+from app_helpers import file_signature, write_json_atomic
+
+
+# Cell yang dibaca dari setiap sheet: sheet -> {field: koordinat cell}
+PENGAJUAN_DANA_CELLS = {
+    "Surat": {
+        "nomor_surat_file": "F8",
+        "nominal_input": "I8",
+    },
+    "Laporan": {
+        "status_balance": "A4",
+        "nominal_kebutuhan": "F68",
+        "nama_bm": "A83",
+    },
+    "Lampiran": {
+        "tanggal_disburse_awal": "C3",
+        "tanggal_disburse_akhir": "E3",
+    },
+}
+
+# Sheet wajib - jika tidak ada, file dianggap ERROR (sheet lain boleh tidak ada)
+REQUIRED_SHEETS = {"Surat"}
+
+# Urutan field hasil analisa
+ANALISA_FIELDS = [
+    "nomor_surat_file",
+    "nominal_input",
+    "status_balance",
+    "nominal_kebutuhan",
+    "tanggal_disburse_awal",
+    "tanggal_disburse_akhir",
+    "nama_bm",
+]
+
+
+def _cell_position(coordinate: str):
+    """Konversi koordinat Excel (contoh 'F8') ke (row, col) 1-indexed"""
+    column_letter, row = coordinate_from_string(coordinate)
+    return row, column_index_from_string(column_letter)
+
+
+def read_sheet_cells(worksheet, cells: Dict[str, str]) -> Dict[str, any]:
+    """
+    Baca beberapa cell dari satu worksheet dalam satu kali iterasi baris
+
+    Di mode read-only setiap akses ws['F8'] mem-parse ulang sheet dari awal,
+    jadi semua cell diambil lewat satu iter_rows pada bounding box-nya saja.
+
+    Args:
+        worksheet: Worksheet openpyxl (read-only)
+        cells (Dict[str, str]): Mapping field -> koordinat cell
+
+    Returns:
+        Dict[str, any]: Mapping field -> nilai cell (None jika kosong)
+    """
+    positions = {field: _cell_position(coord) for field, coord in cells.items()}
+    min_row = min(row for row, _ in positions.values())
+    max_row = max(row for row, _ in positions.values())
+    min_col = min(col for _, col in positions.values())
+    max_col = max(col for _, col in positions.values())
+
+    wanted_rows = {row for row, _ in positions.values()}
+    row_values = {}
+    for row_idx, values in enumerate(
+        worksheet.iter_rows(min_row=min_row, max_row=max_row,
+                            min_col=min_col, max_col=max_col, values_only=True),
+        start=min_row
+    ):
+        if row_idx in wanted_rows:
+            row_values[row_idx] = values
+
+    result = {}
+    for field, (row, col) in positions.items():
+        values = row_values.get(row)
+        offset = col - min_col
+        result[field] = values[offset] if values is not None and offset < len(values) else None
+    return result
+
+
+def parse_status_balance(cell_value) -> Optional[str]:
+    """Ambil status balance dari teks cell A4 (format 'Ket. ... : STATUS')"""
+    if cell_value is None:
+        return None
+    text = str(cell_value)
+    if 'Ket.' in text and ':' in text:
+        return text.split(':', 1)[1].strip()
+    return None
+
+
+def error_analisa_result(error) -> Dict[str, any]:
+    """Buat hasil analisa kosong dengan status ERROR"""
+    data = {field: None for field in ANALISA_FIELDS}
+    data["status_analisa"] = f'ERROR: {str(error)}'
+    return data
+
+
+def extract_pengajuan_dana(file_path: str) -> Dict[str, any]:
+    """
+    Ekstrak data analisa dari satu file PENGAJUAN_DANA.xlsm
+
+    Workbook dibuka sekali (read-only, nilai hasil formula) dan hanya
+    baris/kolom yang dibutuhkan yang dibaca.
+
+    Args:
+        file_path (str): Path file PENGAJUAN_DANA.xlsm
+
+    Returns:
+        Dict[str, any]: Field analisa + 'status_analisa' ('SUCCESS' atau 'ERROR: ...')
+    """
+    data = {field: None for field in ANALISA_FIELDS}
+
+    try:
+        workbook = load_workbook(file_path, read_only=True, data_only=True, keep_vba=False)
+        try:
+            sheet_names = set(workbook.sheetnames)
+            missing = REQUIRED_SHEETS - sheet_names
+            if missing:
+                raise ValueError(f"Worksheet named '{sorted(missing)[0]}' not found")
+
+            for sheet_name, cells in PENGAJUAN_DANA_CELLS.items():
+                if sheet_name not in sheet_names:
+                    continue  # Sheet opsional tidak ada, field tetap None
+                try:
+                    data.update(read_sheet_cells(workbook[sheet_name], cells))
+                except Exception:
+                    if sheet_name in REQUIRED_SHEETS:
+                        raise
+        finally:
+            workbook.close()
+
+        data["status_balance"] = parse_status_balance(data["status_balance"])
+        data["status_analisa"] = 'SUCCESS'
+
+    except Exception as e:
+        data = error_analisa_result(e)
+
+    return data
+
+
+def apply_analisa_result(result: Dict[str, any], data: Dict[str, any]):
+    """Salin hasil ekstraksi ke record scan_results"""
+    for field in ANALISA_FIELDS:
+        result[field] = data.get(field)
+    result['status_analisa'] = data.get('status_analisa', '')
+
+
+class AnalisaCache:
+    """
+    Cache persisten hasil ekstraksi PENGAJUAN_DANA.xlsm
+
+    Disimpan sebagai JSON dengan key path file. Entry hanya dipakai jika
+    size dan mtime file masih sama, sehingga file baru/berubah selalu diparse ulang.
+    Path yang dicek lewat get() dicatat, sehingga save(prune_unseen=True) bisa
+    membuang entry workbook yang sudah tidak ada di hasil scan.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_path: str):
+        """
+        Args:
+            cache_path (str): Path file JSON cache
+        """
+        self.cache_path = cache_path
+        self.entries = {}
+        self.seen = set()
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def _key(file_path: str) -> str:
+        return os.path.normcase(os.path.abspath(file_path))
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, datetime):
+            return {"__datetime__": value.isoformat()}
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        return str(value)
+
+    @staticmethod
+    def _decode_value(value):
+        if isinstance(value, dict) and "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        return value
+
+    def load(self):
+        """Baca cache dari disk (cache rusak/versi lama diabaikan)"""
+        self.entries = {}
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+            if content.get("version") == self.VERSION:
+                self.entries = content.get("entries", {})
+        except Exception as e:
+            print(f"Error loading analisa cache: {e}")
+
+    def get(self, file_path: str, signature: Optional[Tuple[int, float]]) -> Optional[Dict[str, any]]:
+        """
+        Ambil hasil analisa dari cache
+
+        Args:
+            file_path (str): Path file
+            signature: (size, mtime) file saat ini
+
+        Returns:
+            Optional[Dict[str, any]]: Data analisa, None jika tidak ada/berubah
+        """
+        key = self._key(file_path)
+        self.seen.add(key)
+        if signature is None:
+            return None
+        entry = self.entries.get(key)
+        if not entry or entry.get("size") != signature[0] or entry.get("mtime") != signature[1]:
+            return None
+        data = {field: self._decode_value(entry["data"].get(field)) for field in ANALISA_FIELDS}
+        data["status_analisa"] = 'SUCCESS'
+        return data
+
+    def put(self, file_path: str, signature: Optional[Tuple[int, float]], data: Dict[str, any]):
+        """Simpan hasil analisa sukses ke cache (hasil ERROR tidak disimpan)"""
+        if signature is None or data.get("status_analisa") != 'SUCCESS':
+            return
+        self.entries[self._key(file_path)] = {
+            "size": signature[0],
+            "mtime": signature[1],
+            "data": {field: self._encode_value(data.get(field)) for field in ANALISA_FIELDS}
+        }
+        self.dirty = True
+
+    def save(self, prune_unseen: bool = False) -> bool:
+        """
+        Tulis cache ke disk jika ada perubahan
+
+        Args:
+            prune_unseen (bool): Buang entry yang tidak dicek lewat get() pada run ini
+                                 (workbook sudah dihapus/dipindah)
+        """
+        if prune_unseen:
+            kept = {key: entry for key, entry in self.entries.items() if key in self.seen}
+            if len(kept) != len(self.entries):
+                self.entries = kept
+                self.dirty = True
+        if not self.dirty:
+            return True
+        try:
+            write_json_atomic(self.cache_path, {"version": self.VERSION, "entries": self.entries})
+            self.dirty = False
+            return True
+        except Exception as e:
+            print(f"Error saving analisa cache: {e}")
+            return False
+
+
+def compile_file_pattern(pattern: str):
+    """
+    Kompilasi pola nama file (glob, atau awalan "re:" untuk regex) - tidak case-sensitive
+
+    Raises:
+        re.error: Jika regex tidak valid
+    """
+    pattern = (pattern or "").strip()
+    if pattern.startswith("re:"):
+        return re.compile(f".*?(?:{pattern[3:]})", re.IGNORECASE)
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+
+
+def parse_surat_keluar_location(relative_dir: str) -> Dict[str, any]:
+    """
+    Ambil tahun dan bulan dari path folder relatif terhadap 02.SURAT_KELUAR
+
+    Contoh: '2024/03.MARET' -> tahun 2024, bulan_code '03', bulan 'MARET'.
+    Folder dengan penamaan lain tetap diterima, nilainya diisi '-'.
+    """
+    parts = [p for p in re.split(r"[\\/]", relative_dir) if p]
+    tahun = "-"
+    bulan_code = "-"
+    bulan = "-"
+
+    if parts:
+        tahun = int(parts[0]) if re.fullmatch(r"\d{4}", parts[0]) else parts[0]
+    if len(parts) > 1:
+        match = re.match(r"^(\d{1,2})[.\s_-]*(.*)$", parts[1])
+        if match:
+            bulan_code = match.group(1).zfill(2)
+            bulan = match.group(2).strip() or bulan_code
+        else:
+            bulan = parts[1]
+
+    return {"tahun": tahun, "bulan_code": bulan_code, "bulan": bulan}
+
+
+class SuratKeluarIndex:
+    """
+    Index file hasil scan folder Surat Keluar yang dipakai ulang antar scan
+
+    Setiap folder disimpan bersama mtime-nya. Folder yang mtime-nya tidak
+    berubah tidak di-list ulang (cukup satu stat), sehingga scan berikutnya
+    hanya membaca folder bulan yang berubah. Index direset jika base path,
+    pola file atau pola ignore berubah.
+    """
+
+    VERSION = 1
+
+    def __init__(self, index_path: str, base_path: str, file_pattern: str, ignore_matcher=None):
+        """
+        Args:
+            index_path (str): Path file JSON index
+            base_path (str): Path folder 02.SURAT_KELUAR
+            file_pattern (str): Pola nama file yang dicari
+            ignore_matcher: IgnoreMatcher opsional untuk melewati file/folder
+        """
+        self.index_path = index_path
+        self.base_path = base_path
+        self.file_pattern = file_pattern
+        self.file_re = compile_file_pattern(file_pattern)
+        self.ignore_matcher = ignore_matcher
+        self.signature = {
+            "base_path": os.path.normcase(os.path.abspath(base_path)),
+            "file_pattern": file_pattern,
+            "ignore_patterns": list(getattr(ignore_matcher, "patterns", []))
+        }
+        self.entries = {}
+        self.stats = {"folders_listed": 0, "folders_reused": 0, "files_found": 0}
+        self.load()
+
+    def load(self):
+        """Baca index dari disk (diabaikan jika versi/signature berbeda)"""
+        self.entries = {}
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+            if content.get("version") == self.VERSION and content.get("signature") == self.signature:
+                self.entries = content.get("folders", {})
+        except Exception as e:
+            print(f"Error loading surat keluar index: {e}")
+
+    def save(self) -> bool:
+        """Tulis index ke disk"""
+        try:
+            write_json_atomic(self.index_path, {
+                "version": self.VERSION,
+                "signature": self.signature,
+                "folders": self.entries
+            })
+            return True
+        except Exception as e:
+            print(f"Error saving surat keluar index: {e}")
+            return False
+
+    def _list_folder(self, folder_path: str) -> Dict[str, List[str]]:
+        """List satu folder: file yang cocok pola dan subfolder yang ditelusuri"""
+        files = []
+        subdirs = []
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not (self.ignore_matcher and self.ignore_matcher.ignore_dir(name)):
+                            subdirs.append(name)
+                    elif entry.is_file():
+                        # Skip file temporary (dimulai dengan ~)
+                        if name.startswith('~'):
+                            continue
+                        if self.ignore_matcher and self.ignore_matcher.ignore_file(name):
+                            continue
+                        if self.file_re.match(name):
+                            files.append(name)
+                except OSError:
+                    continue
+        return {"files": sorted(files), "subdirs": sorted(subdirs)}
+
+    def scan(self) -> List[str]:
+        """
+        Telusuri folder Surat Keluar dan kembalikan path relatif file yang cocok
+
+        Returns:
+            List[str]: Path file relatif terhadap base_path, terurut
+        """
+        old_entries = self.entries
+        new_entries = {}
+        found = []
+        self.stats = {"folders_listed": 0, "folders_reused": 0, "files_found": 0}
+
+        stack = [""]
+        while stack:
+            relative_dir = stack.pop()
+            folder_path = os.path.join(self.base_path, relative_dir) if relative_dir else self.base_path
+
+            try:
+                mtime = os.stat(folder_path).st_mtime
+            except OSError:
+                continue
+
+            entry = old_entries.get(relative_dir)
+            if entry and entry.get("mtime") == mtime:
+                self.stats["folders_reused"] += 1
+            else:
+                try:
+                    listing = self._list_folder(folder_path)
+                except OSError as e:
+                    print(f"Error scanning {folder_path}: {e}")
+                    continue
+                entry = {"mtime": mtime, **listing}
+                self.stats["folders_listed"] += 1
+
+            new_entries[relative_dir] = entry
+            found.extend(os.path.join(relative_dir, name) if relative_dir else name
+                         for name in entry["files"])
+            stack.extend(os.path.join(relative_dir, name) if relative_dir else name
+                         for name in entry["subdirs"])
+
+        self.entries = new_entries
+        self.stats["files_found"] = len(found)
+        return sorted(found, key=lambda p: [part.upper() for part in re.split(r"[\\/]", p)])
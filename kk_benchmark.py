@@ -0,0 +1,558 @@
+"""
+Benchmark Cek NO KK
+===================
+
+Script pengukuran performa pipeline OCR NO KK (dijalankan manual, tanpa GUI).
+
+Contoh:
+    python kk_benchmark.py corpus D:\\kk_sintetis --count 48
+    python kk_benchmark.py extract D:\\kk_sintetis --output hasil_extract.json
+    python kk_benchmark.py render D:\\sampel_kk\\*.pdf
+    python kk_benchmark.py render D:\\sampel_kk --output hasil_render.json
+    python kk_benchmark.py deskew D:\\sampel_kk --angles -12 -5 -1.5 0 2.5 8
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+import kk_logic
+
+
+# Variasi corpus sintetis: setiap file memakai kombinasi berikutnya (berputar)
+CORPUS_KINDS = ["text", "scan"]
+CORPUS_DPIS = [150, 200, 300]
+CORPUS_ANGLES = [0, 0.8, -1.5, 3, -6]
+CORPUS_NOISES = [0.0, 0.02, 0.06]
+CORPUS_MANIFEST = "manifest.json"
+
+# Ukuran A4 dalam point (1/72 inci)
+A4_POINTS = (595, 842)
+
+# Fungsi kk_logic yang diukur waktunya saat benchmark extract (nama tahap -> fungsi)
+STAGE_FUNCTIONS = {
+    "text_layer": "extract_text_layer",
+    "render": "render_header_region",
+    "preprocess": "preprocess_header",
+    "deskew": "deskew_image",
+    "ocr": "ocr_images_batch",
+}
+STAGE_ORDER = ["text_layer", "render", "deskew", "enhance", "ocr"]
+
+
+def collect_pdf_files(inputs):
+    """Kumpulkan file PDF dari daftar path/folder/glob"""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                if name.lower().endswith(".pdf"):
+                    files.append(os.path.join(item, name))
+        else:
+            files.extend(sorted(path for path in glob.glob(item) if path.lower().endswith(".pdf")))
+    return files
+
+
+def load_font(size):
+    """Font TrueType untuk halaman sintetis, fallback ke font bawaan Pillow"""
+    for name in ("arial.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow lama: font bitmap tanpa ukuran
+        return ImageFont.load_default()
+
+
+def random_nokk(rng):
+    """NO KK 16 digit acak (kode wilayah 2 digit di depan tidak diawali 0)"""
+    return str(rng.randint(11, 94)) + "".join(str(rng.randint(0, 9)) for _ in range(14))
+
+
+def kk_page_lines(nokk, rng):
+    """
+    Isi halaman pertama KK sintetis
+
+    Returns:
+        list: (x_pt, y_pt dari atas, ukuran_pt, teks); NO KK ada di 20% atas halaman
+    """
+    nama = rng.choice(["SITI AMINAH", "BUDI SANTOSO", "DEWI LESTARI", "AHMAD FAUZI", "RINA WATI"])
+    desa = rng.choice(["SUKAMAJU", "MEKARSARI", "KARANGANYAR", "SUMBERREJO"])
+    lines = [
+        (190, 48, 16, "KARTU KELUARGA"),
+        (200, 74, 12, f"No. {nokk}"),
+        (40, 118, 8, f"Nama Kepala Keluarga : {nama}"),
+        (40, 132, 8, f"Alamat : DUSUN {rng.randint(1, 9)}"),
+        (40, 146, 8, f"RT/RW : 00{rng.randint(1, 9)}/00{rng.randint(1, 9)}"),
+        (320, 118, 8, f"Desa/Kelurahan : {desa}"),
+        (320, 132, 8, "Kecamatan : KOTA"),
+        (320, 146, 8, f"Kode Pos : {rng.randint(10000, 99999)}"),
+    ]
+    # Tabel anggota (di luar area header)
+    for row in range(8):
+        nik = random_nokk(rng)
+        lines.append((40, 220 + row * 18, 7, f"{row + 1}   {nama if row == 0 else 'ANGGOTA ' + str(row)}   {nik}"))
+    return lines
+
+
+def render_kk_page(lines, dpi):
+    """Render halaman KK sintetis sebagai gambar grayscale pada DPI tertentu"""
+    scale = dpi / 72.0
+    page = Image.new("L", (int(A4_POINTS[0] * scale), int(A4_POINTS[1] * scale)), 255)
+    draw = ImageDraw.Draw(page)
+    fonts = {}
+    for x, y, size, text in lines:
+        if size not in fonts:
+            fonts[size] = load_font(max(6, int(size * scale)))
+        draw.text((x * scale, y * scale), text, fill=0, font=fonts[size])
+    # Garis tabel
+    for row in range(9):
+        y = (215 + row * 18) * scale
+        draw.line((35 * scale, y, 560 * scale, y), fill=0, width=max(1, int(scale)))
+    return page
+
+
+def degrade_scan(page, angle, noise, seed):
+    """Simulasi hasil scan: miring, noise (gaussian + salt-and-pepper), sedikit blur kontras"""
+    if angle:
+        page = page.rotate(angle, resample=Image.BICUBIC, expand=False, fillcolor=255)
+    if noise:
+        rng = np.random.default_rng(seed)
+        pixels = np.asarray(page, dtype=np.float32)
+        pixels += rng.normal(0, 255 * noise, pixels.shape)
+        speckle = rng.random(pixels.shape)
+        pixels[speckle < noise / 4] = 0
+        pixels[speckle > 1 - noise / 4] = 255
+        page = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), "L")
+    return page
+
+
+def pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(pdf_path, lines):
+    """
+    Tulis PDF satu halaman A4 dengan text layer (Helvetica) tanpa library tambahan
+
+    Args:
+        pdf_path (str): File output
+        lines (list): (x_pt, y_pt dari atas, ukuran_pt, teks)
+    """
+    commands = ["BT"]
+    for x, y, size, text in lines:
+        commands.append(f"/F1 {size} Tf 1 0 0 1 {x} {A4_POINTS[1] - y - size} Tm ({pdf_escape(text)}) Tj")
+    commands.append("ET")
+    stream = "\n".join(commands).encode("latin-1", errors="replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {A4_POINTS[0]} {A4_POINTS[1]}] "
+        f"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>".encode("ascii"),
+        f"<< /Length {len(stream)} >>\nstream\n".encode("ascii") + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+    xref_offset = len(content)
+    content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    for offset in offsets:
+        content += f"{offset:010d} 00000 n \n".encode("ascii")
+    content += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+                f"startxref\n{xref_offset}\n%%EOF\n").encode("ascii")
+
+    with open(pdf_path, "wb") as f:
+        f.write(content)
+
+
+def generate_corpus(output_dir, count=48, seed=2024):
+    """
+    Buat corpus PDF KK sintetis dengan NO KK yang diketahui
+
+    Variasi jenis (text layer / hasil scan), DPI, sudut miring dan noise diputar
+    per file sehingga corpus yang sama selalu dihasilkan untuk seed yang sama.
+    Daftar file beserta NO KK dan variasinya ditulis ke manifest.json.
+
+    Returns:
+        dict: Isi manifest
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    samples = []
+
+    for i in range(count):
+        kind = CORPUS_KINDS[i % len(CORPUS_KINDS)]
+        dpi = CORPUS_DPIS[(i // len(CORPUS_KINDS)) % len(CORPUS_DPIS)]
+        angle = CORPUS_ANGLES[(i // 2) % len(CORPUS_ANGLES)] if kind == "scan" else 0
+        noise = CORPUS_NOISES[(i // 3) % len(CORPUS_NOISES)] if kind == "scan" else 0.0
+
+        nokk = random_nokk(rng)
+        lines = kk_page_lines(nokk, rng)
+        file_name = f"02_KK_{i + 1:03d}_{kind}.pdf"
+        pdf_path = os.path.join(output_dir, file_name)
+
+        if kind == "text":
+            write_text_pdf(pdf_path, lines)
+        else:
+            page = degrade_scan(render_kk_page(lines, dpi), angle, noise, seed + i)
+            page.save(pdf_path, "PDF", resolution=dpi)
+
+        samples.append({
+            "file": file_name,
+            "nokk": nokk,
+            "kind": kind,
+            "dpi": dpi if kind == "scan" else None,
+            "angle": angle,
+            "noise": noise,
+        })
+
+    manifest = {"seed": seed, "count": count,
+                "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "samples": samples}
+    with open(os.path.join(output_dir, CORPUS_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+@contextmanager
+def instrument_stages(timings):
+    """Ukur waktu fungsi tahap kk_logic selama blok berjalan (akumulasi ke dict timings)"""
+    originals = {name: getattr(kk_logic, name) for name in STAGE_FUNCTIONS.values()}
+
+    def timed(stage, function):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+        return wrapper
+
+    for stage, name in STAGE_FUNCTIONS.items():
+        setattr(kk_logic, name, timed(stage, originals[name]))
+    try:
+        yield timings
+    finally:
+        for name, function in originals.items():
+            setattr(kk_logic, name, function)
+
+
+def group_accuracy(results, key):
+    """Akurasi exact match per nilai variasi (misal per sudut atau per DPI)"""
+    groups = {}
+    for r in results:
+        group = groups.setdefault(str(r[key]), {"files": 0, "exact": 0})
+        group["files"] += 1
+        group["exact"] += 1 if r["exact"] else 0
+    for group in groups.values():
+        group["accuracy"] = round(group["exact"] / group["files"], 3)
+    return groups
+
+
+def benchmark_extract(corpus_dir):
+    """
+    Jalankan ekstraksi NO KK (extract_nokk_details) atas corpus sintetis (offline)
+
+    Returns:
+        dict: Hasil per file (NO KK, exact match, waktu per tahap) dan ringkasan
+              files/sec, akurasi, waktu per tahap, akurasi per variasi
+    """
+    with open(os.path.join(corpus_dir, CORPUS_MANIFEST), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    results = []
+    total_start = time.perf_counter()
+    for sample in manifest["samples"]:
+        pdf_path = os.path.join(corpus_dir, sample["file"])
+        timings = {}
+        start = time.perf_counter()
+        with instrument_stages(timings):
+            # extract_nokk_details = extract_nokk_from_pdf + tahap dan error
+            details = kk_logic.extract_nokk_details(pdf_path)
+        nokk, error = details.get("nokk"), details.get("error")
+        seconds = time.perf_counter() - start
+
+        # Enhance = preprocess tanpa deskew
+        timings["enhance"] = timings.pop("preprocess", 0.0) - timings.get("deskew", 0.0)
+        record = dict(sample, found=nokk, exact=nokk == sample["nokk"], stage=details.get("stage"),
+                      seconds=round(seconds, 4),
+                      stages={stage: round(timings.get(stage, 0.0), 4) for stage in STAGE_ORDER})
+        if error:
+            record["error"] = error
+        results.append(record)
+    total_seconds = time.perf_counter() - total_start
+
+    exact = sum(1 for r in results if r["exact"])
+    summary = {
+        "files": len(results),
+        "exact": exact,
+        "accuracy": round(exact / len(results), 3) if results else None,
+        "errors": sum(1 for r in results if "error" in r),
+        "total_seconds": round(total_seconds, 3),
+        "files_per_sec": round(len(results) / total_seconds, 3) if total_seconds else None,
+        "stage_seconds": {stage: round(sum(r["stages"][stage] for r in results), 3) for stage in STAGE_ORDER},
+        "by_kind": group_accuracy(results, "kind"),
+        "by_dpi": group_accuracy([r for r in results if r["kind"] == "scan"], "dpi"),
+        "by_angle": group_accuracy([r for r in results if r["kind"] == "scan"], "angle"),
+        "by_noise": group_accuracy([r for r in results if r["kind"] == "scan"], "noise"),
+    }
+
+    return {"benchmark": "extract", "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "corpus": {"dir": corpus_dir, "seed": manifest.get("seed"), "count": manifest.get("count")},
+            "pipeline": {"ocr_dpi": kk_logic.OCR_DPI, "cascade": [stage[0] for stage in kk_logic.OCR_CASCADE],
+                         "pipeline_version": kk_logic.OCR_PIPELINE_VERSION},
+            "summary": summary, "results": results}
+
+
+def print_extract_report(report):
+    """Tampilkan ringkasan benchmark extract di console"""
+    for r in report["results"]:
+        mark = "✅" if r["exact"] else "❌"
+        print(f"{mark} {r['file']}: {r['found'] or '-'} (harusnya {r['nokk']}) "
+              f"[{r['stage'] or r.get('error') or '-'}] {r['seconds']:.2f}s")
+
+    summary = report["summary"]
+    print("\n=== RINGKASAN EXTRACT ===")
+    print(f"File: {summary['files']} | exact match: {summary['exact']} ({summary['accuracy']}) "
+          f"| error: {summary['errors']}")
+    print(f"Waktu total: {summary['total_seconds']}s | {summary['files_per_sec']} file/detik")
+    print("Waktu per tahap: " + ", ".join(f"{stage} {seconds}s"
+                                           for stage, seconds in summary["stage_seconds"].items()))
+    for key, label in (("by_kind", "Jenis"), ("by_dpi", "DPI scan"), ("by_angle", "Sudut"), ("by_noise", "Noise")):
+        groups = summary[key]
+        if groups:
+            print(f"{label}: " + ", ".join(f"{value} → {g['exact']}/{g['files']}" for value, g in groups.items()))
+
+
+def image_bytes(image):
+    """Perkiraan memori pixel sebuah PIL Image (lebar × tinggi × jumlah channel)"""
+    return image.width * image.height * len(image.getbands())
+
+
+def benchmark_render(pdf_files, dpi=kk_logic.OCR_DPI, header_ratio=kk_logic.HEADER_RATIO,
+                     poppler_path=None, repeat=1):
+    """
+    Bandingkan render halaman penuh + crop (lama) vs render header saja (baru)
+
+    Returns:
+        dict: Hasil per file dan ringkasan
+    """
+    results = []
+
+    for pdf_path in pdf_files:
+        record = {"file": pdf_path}
+        try:
+            # Lama: render halaman penuh RGB, lalu crop 20% atas dan convert ke L
+            old_times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                kwargs = {"first_page": 1, "last_page": 1, "dpi": dpi}
+                if poppler_path:
+                    kwargs["poppler_path"] = poppler_path
+                full_page = kk_logic.convert_from_path(pdf_path, **kwargs)[0]
+                width, height = full_page.size
+                old_header = full_page.crop((0, 0, width, int(height * header_ratio))).convert('L')
+                old_times.append(time.perf_counter() - start)
+            record["old_seconds"] = min(old_times)
+            record["old_pixel_bytes"] = image_bytes(full_page) + image_bytes(old_header)
+            record["old_size"] = list(old_header.size)
+            del full_page
+
+            # Baru: render header saja, grayscale
+            new_times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                new_header = kk_logic.render_header_region(pdf_path, dpi, header_ratio, poppler_path)
+                new_times.append(time.perf_counter() - start)
+            record["new_seconds"] = min(new_times)
+            record["new_pixel_bytes"] = image_bytes(new_header)
+            record["new_size"] = list(new_header.size)
+
+            record["speedup"] = round(record["old_seconds"] / record["new_seconds"], 2) if record["new_seconds"] else None
+            record["memory_ratio"] = round(record["new_pixel_bytes"] / record["old_pixel_bytes"], 3)
+        except Exception as e:
+            record["error"] = str(e)
+        results.append(record)
+
+    ok = [r for r in results if "error" not in r]
+    summary = {
+        "files": len(results),
+        "errors": len(results) - len(ok),
+        "dpi": dpi,
+        "header_ratio": header_ratio,
+    }
+    if ok:
+        summary["old_total_seconds"] = round(sum(r["old_seconds"] for r in ok), 3)
+        summary["new_total_seconds"] = round(sum(r["new_seconds"] for r in ok), 3)
+        summary["speedup"] = round(summary["old_total_seconds"] / summary["new_total_seconds"], 2) \
+            if summary["new_total_seconds"] else None
+        summary["old_peak_pixel_bytes"] = max(r["old_pixel_bytes"] for r in ok)
+        summary["new_peak_pixel_bytes"] = max(r["new_pixel_bytes"] for r in ok)
+
+    return {"benchmark": "render", "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "summary": summary, "results": results}
+
+
+def print_render_report(report):
+    """Tampilkan ringkasan benchmark render di console"""
+    for r in report["results"]:
+        name = os.path.basename(r["file"])
+        if "error" in r:
+            print(f"❌ {name}: {r['error']}")
+            continue
+        print(f"📄 {name}: lama {r['old_seconds']:.3f}s / {r['old_pixel_bytes'] / 1e6:.1f} MB, "
+              f"baru {r['new_seconds']:.3f}s / {r['new_pixel_bytes'] / 1e6:.1f} MB "
+              f"(x{r['speedup']})")
+
+    summary = report["summary"]
+    print("\n=== RINGKASAN ===")
+    print(f"File: {summary['files']} (error: {summary['errors']}), DPI {summary['dpi']}")
+    if "speedup" in summary:
+        print(f"Total lama: {summary['old_total_seconds']}s | baru: {summary['new_total_seconds']}s "
+              f"| speedup x{summary['speedup']}")
+        print(f"Peak pixel memory lama: {summary['old_peak_pixel_bytes'] / 1e6:.1f} MB | "
+              f"baru: {summary['new_peak_pixel_bytes'] / 1e6:.1f} MB")
+
+
+def benchmark_deskew(pdf_files, angles, dpi=kk_logic.OCR_DPI, header_ratio=kk_logic.HEADER_RATIO,
+                     poppler_path=None):
+    """
+    Ukur akurasi dan waktu estimasi sudut deskew (coarse-to-fine vs sweep lama)
+
+    Header setiap PDF diputar dengan sudut yang diketahui, lalu sudut koreksinya
+    diestimasi ulang. Error = selisih absolut dengan sudut sebenarnya.
+    """
+    results = []
+
+    for pdf_path in pdf_files:
+        try:
+            header = kk_logic.render_header_region(pdf_path, dpi, header_ratio, poppler_path)
+        except Exception as e:
+            results.append({"file": pdf_path, "error": str(e)})
+            continue
+
+        for angle in angles:
+            skewed = header.rotate(-angle, expand=True, fillcolor=255)
+
+            start = time.perf_counter()
+            fast_angle = kk_logic.estimate_skew_angle(skewed)
+            fast_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            old_angle = kk_logic.estimate_skew_angle_exhaustive(skewed)
+            old_seconds = time.perf_counter() - start
+
+            results.append({
+                "file": pdf_path,
+                "true_angle": angle,
+                "fast_angle": round(fast_angle, 3),
+                "fast_error": round(abs(fast_angle - angle), 3),
+                "fast_seconds": round(fast_seconds, 4),
+                "old_angle": old_angle,
+                "old_error": round(abs(old_angle - angle), 3),
+                "old_seconds": round(old_seconds, 4),
+            })
+
+    ok = [r for r in results if "error" not in r]
+    summary = {"files": len(pdf_files), "samples": len(ok), "errors": len(results) - len(ok)}
+    if ok:
+        summary["fast_max_error"] = max(r["fast_error"] for r in ok)
+        summary["old_max_error"] = max(r["old_error"] for r in ok)
+        summary["fast_total_seconds"] = round(sum(r["fast_seconds"] for r in ok), 3)
+        summary["old_total_seconds"] = round(sum(r["old_seconds"] for r in ok), 3)
+        summary["within_0_5_deg"] = sum(1 for r in ok if r["fast_error"] <= 0.5)
+
+    return {"benchmark": "deskew", "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "summary": summary, "results": results}
+
+
+def print_deskew_report(report):
+    """Tampilkan ringkasan benchmark deskew di console"""
+    summary = report["summary"]
+    print("=== RINGKASAN DESKEW ===")
+    print(f"Sampel: {summary['samples']} dari {summary['files']} file (error: {summary['errors']})")
+    if summary["samples"]:
+        print(f"Error maks coarse-to-fine: {summary['fast_max_error']}° "
+              f"({summary['within_0_5_deg']}/{summary['samples']} dalam 0.5°)")
+        print(f"Error maks sweep lama: {summary['old_max_error']}°")
+        print(f"Waktu total: coarse-to-fine {summary['fast_total_seconds']}s | "
+              f"sweep lama {summary['old_total_seconds']}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline OCR Cek NO KK")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    render_parser = subparsers.add_parser("render", help="Bandingkan render halaman penuh vs header saja")
+    render_parser.add_argument("inputs", nargs="+", help="File PDF, folder, atau pola glob")
+    render_parser.add_argument("--dpi", type=int, default=kk_logic.OCR_DPI)
+    render_parser.add_argument("--header-ratio", type=float, default=kk_logic.HEADER_RATIO)
+    render_parser.add_argument("--poppler-path", default=None)
+    render_parser.add_argument("--repeat", type=int, default=1, help="Ulangi dan ambil waktu tercepat")
+    render_parser.add_argument("--output", help="Simpan hasil ke file JSON")
+
+    deskew_parser = subparsers.add_parser("deskew", help="Akurasi dan waktu estimasi sudut deskew")
+    deskew_parser.add_argument("inputs", nargs="+", help="File PDF, folder, atau pola glob")
+    deskew_parser.add_argument("--angles", type=float, nargs="+",
+                               default=[-15, -7.5, -3, -1, 0, 0.5, 2, 4.5, 10, 18])
+    deskew_parser.add_argument("--dpi", type=int, default=kk_logic.OCR_DPI)
+    deskew_parser.add_argument("--header-ratio", type=float, default=kk_logic.HEADER_RATIO)
+    deskew_parser.add_argument("--poppler-path", default=None)
+    deskew_parser.add_argument("--output", help="Simpan hasil ke file JSON")
+
+    corpus_parser = subparsers.add_parser("corpus", help="Buat corpus PDF KK sintetis dengan NO KK diketahui")
+    corpus_parser.add_argument("output_dir", help="Folder tujuan corpus")
+    corpus_parser.add_argument("--count", type=int, default=48)
+    corpus_parser.add_argument("--seed", type=int, default=2024)
+
+    extract_parser = subparsers.add_parser("extract", help="Throughput dan akurasi extract_nokk_from_pdf atas corpus")
+    extract_parser.add_argument("corpus_dir", help="Folder corpus (berisi manifest.json)")
+    extract_parser.add_argument("--output", help="Simpan hasil ke file JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "corpus":
+        manifest = generate_corpus(args.output_dir, args.count, args.seed)
+        print(f"✅ {manifest['count']} PDF KK sintetis dibuat di {args.output_dir}")
+        return
+
+    if args.command == "extract":
+        if not os.path.exists(os.path.join(args.corpus_dir, CORPUS_MANIFEST)):
+            parser.error(f"{CORPUS_MANIFEST} tidak ditemukan, buat corpus dulu dengan perintah 'corpus'")
+        report = benchmark_extract(args.corpus_dir)
+        print_extract_report(report)
+    else:
+        pdf_files = collect_pdf_files(args.inputs)
+        if not pdf_files:
+            parser.error("Tidak ada file PDF ditemukan")
+
+    if args.command == "render":
+        report = benchmark_render(pdf_files, args.dpi, args.header_ratio, args.poppler_path, args.repeat)
+        print_render_report(report)
+    elif args.command == "deskew":
+        report = benchmark_deskew(pdf_files, args.angles, args.dpi, args.header_ratio, args.poppler_path)
+        print_deskew_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Hasil disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1281 @@
+"""
+Business Logic Module untuk Cek NO KK
+=====================================
+
+Ekstraksi NO KK dari PDF Kartu Keluarga (OCR) yang terpisah dari GUI,
+sehingga bisa dijalankan di proses worker.
+"""
+
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+# Import untuk PDF dan OCR
+try:
+    import pytesseract
+    from pdf2image import convert_from_path
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+    pytesseract = None
+    convert_from_path = None
+
+try:
+    from PyPDF2 import PdfReader
+except ImportError:
+    PdfReader = None
+
+import pdf_logic
+import tools_logic
+from app_helpers import file_signature, write_json_atomic
+
+# DPI render dan bagian atas halaman yang dibaca (area NO KK)
+OCR_DPI = 400
+HEADER_RATIO = 0.2
+
+# OCR dengan config optimized untuk angka
+OCR_CONFIGS = [
+    '--psm 6 -c tessedit_char_whitelist=0123456789',  # Hanya angka
+    '--psm 11 -c tessedit_char_whitelist=0123456789',
+    '--psm 6',  # Tanpa whitelist sebagai fallback
+]
+
+# OCR satu baris (strip NO KK hasil lokalisasi)
+LINE_OCR_CONFIG = '--psm 7 -c tessedit_char_whitelist=0123456789'
+
+# Area yang di-OCR per tahap: "line" = hanya strip baris NO KK, "header" = 20% atas
+REGION_LINE = "line"
+REGION_HEADER = "header"
+
+# Cascade OCR: (nama tahap, DPI, config, area) dicoba berurutan dan berhenti
+# begitu NO KK 16 digit yang meyakinkan ditemukan. Tahap termurah (strip baris
+# NO KK, DPI rendah, angka saja) duluan; header penuh, 400 DPI dan config
+# fallback hanya jika tahap sebelumnya gagal.
+OCR_CASCADE = [
+    ("300dpi_line_psm7", 300, LINE_OCR_CONFIG, REGION_LINE),
+    ("300dpi_psm6_digit", 300, OCR_CONFIGS[0], REGION_HEADER),
+    ("400dpi_psm6_digit", 400, OCR_CONFIGS[0], REGION_HEADER),
+    ("400dpi_psm11_digit", 400, OCR_CONFIGS[1], REGION_HEADER),
+    ("400dpi_psm6_plain", 400, OCR_CONFIGS[2], REGION_HEADER),
+]
+
+# Tahap terakhir: semua teks tahap sebelumnya digabung (perilaku lama)
+COMBINED_STAGE = "combined"
+
+# Tahap pertama: text layer PDF (PDF digital, misal cetakan Dukcapil) tanpa OCR
+TEXT_LAYER_STAGE = "text_layer"
+
+# Pola match yang cukup meyakinkan untuk berhenti lebih awal: deretan tepat 16
+# digit. Hasil pola separator (bisa memotong deretan 17+ digit) dan potong
+# 17→16 baru diterima setelah semua tahap dicoba.
+EARLY_EXIT_METHODS = {"cleaned", "raw", "flexible"}
+
+# Jumlah header yang di-OCR dalam satu panggilan tesseract (TIFF multi-halaman)
+OCR_BATCH_SIZE = 8
+
+# Tingkat keyakinan hasil berdasarkan pola yang cocok
+NOKK_CONFIDENCE = {
+    "raw": "high",
+    "cleaned": "medium",
+    "flexible": "medium",
+    "separators": "medium",
+    "trimmed_17": "low",
+}
+
+# Naikkan jika pipeline OCR berubah, agar hasil cache lama tidak dipakai lagi
+OCR_PIPELINE_VERSION = 3
+
+# Parameter preprocessing NumPy (setelah deskew)
+STRETCH_PERCENTILES = (1.0, 99.0)  # Contrast stretch: persentil gelap/terang
+UNSHARP_RADIUS = 2                 # Radius box blur untuk unsharp mask (pixel)
+UNSHARP_AMOUNT = 1.0               # Kekuatan sharpening
+DESPECKLE_MIN_NEIGHBORS = 2        # Pixel tinta dengan tetangga tinta lebih sedikit dibuang
+
+# Lokalisasi baris NO KK (ukuran dalam inci, dikonversi dengan DPI render)
+LINE_MIN_HEIGHT_IN = 0.05          # Tinggi baris teks minimum (~5pt)
+LINE_MAX_HEIGHT_IN = 0.35          # Tinggi baris teks maksimum (~25pt)
+LINE_ROW_INK_RATIO = 0.002         # Baris pixel dianggap berisi teks jika tinta > rasio × lebar
+LINE_WORD_GAP = 0.35               # Jarak antar glyph > rasio × tinggi baris = pemisah kata
+LINE_DIGITS = 16
+LINE_MIN_GLYPHS = 10               # Digit bisa menempel/terpecah, toleransi jumlah glyph
+LINE_MAX_GLYPHS = 22
+LINE_MIN_ASPECT = 5.0              # Lebar/tinggi deretan 16 digit
+LINE_MAX_ASPECT = 22.0
+LINE_PAD_X = 0.6                   # Margin strip (× tinggi baris)
+LINE_PAD_Y = 0.35
+
+# Huruf yang sering terbaca OCR sebagai angka
+OCR_REPLACEMENTS = {
+    'b': '6',  # huruf b sering dibaca untuk angka 6
+    'B': '8',
+    'O': '0',
+    'o': '0',
+    'l': '1',
+    'I': '1',
+    'S': '5',
+    'Z': '2',
+}
+
+
+def init_ocr_worker(tools: Optional[Dict] = None, render_cache: Optional[Tuple[str, int]] = None):
+    """Initializer proses worker OCR
+
+    Tesseract memakai OpenMP; dengan banyak proses paralel, thread internalnya
+    dibatasi satu agar CPU tidak oversubscribed. Hasil deteksi Tesseract/Poppler
+    dan setting cache render dari proses utama dipakai ulang di worker.
+    """
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    if tools:
+        tools_logic.set_tools(tools)
+    if render_cache:
+        pdf_logic.configure_render_cache(*render_cache)
+
+
+# Parameter deskew coarse-to-fine
+DESKEW_MAX_ANGLE = 20.0
+DESKEW_COARSE_STEP = 2.0
+DESKEW_FINE_STEP = 0.25
+DESKEW_MAX_WIDTH = 800  # Estimasi sudut dilakukan di gambar yang diperkecil
+DESKEW_MIN_ANGLE = 0.25  # Di bawah ini gambar dianggap sudah lurus
+
+
+def _projection_score(ink_y, ink_x, angle, height):
+    """Variance horizontal projection setelah gambar di-shear sebesar angle (derajat)
+
+    Untuk sudut kecil, rotasi ≈ shear vertikal: y' = y - x·tan(angle), sama arah
+    dengan PIL Image.rotate (positif = berlawanan jarum jam). Cukup piksel tinta
+    yang dihitung ulang, tanpa membuat gambar hasil rotasi.
+    """
+    shifted = np.rint(ink_y - ink_x * np.tan(np.radians(angle))).astype(np.int64)
+    shifted -= shifted.min()
+    projection = np.bincount(shifted, minlength=height)
+    return float(np.var(projection))
+
+
+def estimate_skew_angle(image, max_angle=DESKEW_MAX_ANGLE, coarse_step=DESKEW_COARSE_STEP,
+                        fine_step=DESKEW_FINE_STEP, max_width=DESKEW_MAX_WIDTH):
+    """
+    Estimasi sudut kemiringan (derajat, konvensi PIL rotate) secara coarse-to-fine
+
+    Gambar diperkecil dan dibinarisasi, lalu sudut dicari dengan sweep kasar
+    (-max..+max, langkah coarse_step) dan diperhalus di sekitar kandidat terbaik
+    (langkah fine_step) memakai projection profile NumPy.
+
+    Args:
+        image: PIL Image
+        max_angle (float): Batas sudut pencarian
+        coarse_step (float): Langkah sweep kasar
+        fine_step (float): Langkah sweep halus
+        max_width (int): Lebar maksimum gambar untuk estimasi
+
+    Returns:
+        float: Sudut terbaik
+    """
+    gray = image.convert('L')
+    if gray.width > max_width:
+        scale = max_width / float(gray.width)
+        gray = gray.resize((max_width, max(1, int(gray.height * scale))), Image.BILINEAR)
+
+    binary = np.asarray(gray) < 128
+    ink_y, ink_x = np.nonzero(binary)
+    if ink_y.size == 0:
+        return 0.0
+    ink_y = ink_y.astype(np.float64)
+    ink_x = ink_x.astype(np.float64) - binary.shape[1] / 2.0  # Poros di tengah gambar
+    height = binary.shape[0]
+
+    def best_of(angles):
+        scores = [_projection_score(ink_y, ink_x, angle, height) for angle in angles]
+        return float(angles[int(np.argmax(scores))])
+
+    coarse = best_of(np.arange(-max_angle, max_angle + coarse_step / 2, coarse_step))
+    fine_low = max(-max_angle, coarse - coarse_step)
+    fine_high = min(max_angle, coarse + coarse_step)
+    return best_of(np.arange(fine_low, fine_high + fine_step / 2, fine_step))
+
+
+def estimate_skew_angle_exhaustive(image):
+    """Estimasi sudut cara lama: rotasi PIL penuh -20..+20 derajat (langkah 1)
+
+    Disimpan sebagai pembanding akurasi di benchmark.
+    """
+    # Binarize dengan threshold
+    threshold = 128
+
+    best_angle = 0
+    max_variance = 0
+
+    for angle in range(-20, 21, 1):
+        # Rotate image
+        rotated = image.rotate(angle, expand=False, fillcolor=255)
+        rotated_array = np.array(rotated.convert('L'))
+        rotated_binary = rotated_array < threshold
+
+        # Horizontal projection (sum across rows)
+        h_projection = np.sum(rotated_binary, axis=1)
+
+        # Variance of projection - higher = better alignment
+        variance = np.var(h_projection)
+
+        if variance > max_variance:
+            max_variance = variance
+            best_angle = angle
+
+    return best_angle
+
+
+def deskew_image(image):
+    """Straighten skewed/tilted image menggunakan projection profile
+
+    Sudut diestimasi di gambar kecil (coarse-to-fine), lalu rotasi hanya
+    dilakukan sekali di resolusi penuh.
+    """
+    try:
+        best_angle = estimate_skew_angle(image)
+
+        # Apply best rotation
+        if abs(best_angle) >= DESKEW_MIN_ANGLE:
+            print(f"🔄 Deskewing image: {best_angle:.2f} degrees")
+            deskewed = image.rotate(best_angle, expand=True, fillcolor=255)
+            return deskewed
+        else:
+            print("✅ Image already straight")
+            return image
+
+    except Exception as e:
+        print(f"⚠️ Deskew failed: {str(e)}, using original image")
+        return image
+
+
+def match_nokk(all_text: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Cari NO KK (16 digit) dari teks hasil OCR/ekstraksi
+
+    Args:
+        all_text (str): Teks mentah
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (NO KK, nama pola yang cocok)
+    """
+    if not all_text:
+        return None, None
+
+    # Clean up common OCR errors before pattern matching
+    # Ganti huruf yang mirip angka
+    cleaned_text = all_text
+    for old, new in OCR_REPLACEMENTS.items():
+        cleaned_text = cleaned_text.replace(old, new)
+
+    # Search for 16-digit number pattern (NO KK)
+    # Pattern 1: 16 consecutive digits (dari cleaned text)
+    pattern = r'\b\d{16}\b'
+    matches = re.findall(pattern, cleaned_text)
+
+    if matches:
+        # Ambil yang pertama (biasanya NO KK di header)
+        print(f"✅ Found NO KK (after cleanup): {matches[0]}")
+        return matches[0], "cleaned"
+
+    # Pattern 2: From original text (tanpa cleanup)
+    matches = re.findall(pattern, all_text)
+    if matches:
+        print(f"✅ Found NO KK: {matches[0]}")
+        return matches[0], "raw"
+
+    # Pattern 3: With spaces/dots (e.g., "3302 0403 0205 2186")
+    pattern_with_space = r'(\d{4}[\s\.\-]?\d{4}[\s\.\-]?\d{4}[\s\.\-]?\d{4})'
+    matches = re.findall(pattern_with_space, cleaned_text)
+
+    if matches:
+        # Remove spaces, dots, dashes
+        nokk = re.sub(r'[\s\.\-]', '', matches[0])
+        if len(nokk) == 16 and nokk.isdigit():
+            print(f"✅ Found NO KK (with separators): {nokk}")
+            return nokk, "separators"
+
+    # Pattern 4: Cari angka 15-18 digit (kadang OCR salah)
+    pattern_flexible = r'\d{15,18}'
+    matches = re.findall(pattern_flexible, cleaned_text)
+
+    if matches:
+        # Coba berbagai kemungkinan untuk mendapat 16 digit
+        for match in matches:
+            if len(match) == 16:
+                print(f"✅ Found NO KK (flexible): {match}")
+                return match, "flexible"
+            elif len(match) == 17:
+                # Coba ambil 16 digit pertama atau terakhir
+                candidate1 = match[:16]
+                candidate2 = match[1:]
+                # Prioritas yang dimulai dengan 33 (kode Jawa Tengah)
+                if candidate1.startswith('33'):
+                    print(f"✅ Found NO KK (17→16, first): {candidate1}")
+                    return candidate1, "trimmed_17"
+                elif candidate2.startswith('33'):
+                    print(f"✅ Found NO KK (17→16, last): {candidate2}")
+                    return candidate2, "trimmed_17"
+                else:
+                    print(f"✅ Found NO KK (17→16): {candidate1}")
+                    return candidate1, "trimmed_17"
+            elif len(match) == 15:
+                # Mungkin kurang 1 digit, tapi tetap return
+                print(f"⚠️ Found 15 digits (might be incomplete): {match}")
+                # Don't return, keep searching
+
+    return None, None
+
+
+def find_nokk_in_text(all_text: str) -> Optional[str]:
+    """Cari NO KK (16 digit) dari teks, tanpa info pola"""
+    return match_nokk(all_text)[0]
+
+
+def get_first_page_size(pdf_path: str) -> Optional[Tuple[float, float]]:
+    """
+    Ambil ukuran halaman pertama PDF dalam point (sudah memperhitungkan /Rotate)
+
+    Memakai cropbox (area yang tampil di viewer, default = mediabox), sama dengan
+    area yang dirender pdftoppm -cropbox.
+
+    Returns:
+        Optional[Tuple[float, float]]: (lebar, tinggi) atau None jika gagal
+    """
+    if PdfReader is None:
+        return None
+    try:
+        page = PdfReader(pdf_path).pages[0]
+        width = float(page.cropbox.width)
+        height = float(page.cropbox.height)
+        if (page.get("/Rotate") or 0) % 180 == 90:
+            width, height = height, width
+        return width, height
+    except Exception as e:
+        print(f"⚠️ Gagal membaca ukuran halaman {os.path.basename(pdf_path)}: {e}")
+        return None
+
+
+@lru_cache(maxsize=8)
+def find_pdftoppm(poppler_path: Optional[str] = None) -> Optional[str]:
+    """Cari executable pdftoppm di folder poppler atau di PATH (di-cache per folder)"""
+    if poppler_path:
+        found = tools_logic.find_poppler_executable(poppler_path, "pdftoppm")
+        if found:
+            return found
+    return shutil.which("pdftoppm")
+
+
+def render_header_full_page(pdf_path: str, dpi: int = OCR_DPI, header_ratio: float = HEADER_RATIO,
+                            poppler_path: Optional[str] = None):
+    """
+    Render halaman pertama penuh (grayscale) lalu crop bagian header
+
+    Fallback jika render area header langsung tidak bisa dipakai.
+    """
+    kwargs = {"first_page": 1, "last_page": 1, "dpi": dpi, "grayscale": True, "use_cropbox": True}
+    if poppler_path:
+        kwargs["poppler_path"] = poppler_path
+    images = convert_from_path(pdf_path, **kwargs)
+    if not images:
+        return None
+    image = images[0]
+    width, height = image.size
+    return image.crop((0, 0, width, int(height * header_ratio))).convert('L')
+
+
+def render_header_region(pdf_path: str, dpi: int = OCR_DPI, header_ratio: float = HEADER_RATIO,
+                         poppler_path: Optional[str] = None):
+    """
+    Render hanya bagian header halaman pertama langsung dalam grayscale
+
+    pdftoppm dipanggil dengan -cropbox, area crop (-x/-y/-W/-H) dan -gray, sehingga poppler
+    hanya merasterisasi header (tanpa 80% halaman yang dibuang) dan hasilnya
+    1 channel. Jika ukuran halaman atau pdftoppm tidak tersedia, fallback ke
+    render halaman penuh lalu crop.
+
+    Args:
+        pdf_path (str): Path file PDF
+        dpi (int): Resolusi render
+        header_ratio (float): Bagian atas halaman yang dirender (0-1)
+        poppler_path (str): Folder bin poppler (opsional)
+
+    Returns:
+        PIL.Image (mode 'L') atau None
+    """
+    page_size = get_first_page_size(pdf_path)
+    pdftoppm = find_pdftoppm(poppler_path)
+
+    if page_size and pdftoppm:
+        width_px = int(math.ceil(page_size[0] * dpi / 72.0))
+        height_px = max(1, int(page_size[1] * dpi / 72.0 * header_ratio))
+        command = [
+            pdftoppm, "-f", "1", "-l", "1", "-r", str(dpi), "-cropbox",
+            "-x", "0", "-y", "0", "-W", str(width_px), "-H", str(height_px),
+            "-gray", pdf_path
+        ]
+        try:
+            # Tanpa jendela console di Windows
+            creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+            completed = subprocess.run(
+                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                timeout=120, creationflags=creationflags
+            )
+            if completed.returncode == 0 and completed.stdout:
+                image = Image.open(io.BytesIO(completed.stdout))
+                image.load()
+                return image.convert('L')
+            print(f"⚠️ pdftoppm crop gagal ({completed.returncode}): "
+                  f"{completed.stderr.decode(errors='ignore').strip()[:200]}")
+        except Exception as e:
+            print(f"⚠️ pdftoppm crop gagal: {e}")
+
+    return render_header_full_page(pdf_path, dpi, header_ratio, poppler_path)
+
+
+def render_header_cached(pdf_path: str, dpi: int = OCR_DPI, header_ratio: float = HEADER_RATIO,
+                         poppler_path: Optional[str] = None, content_hash: Optional[str] = None):
+    """
+    render_header_region lewat cache render halaman (pdf_logic), jika aktif
+
+    Yang di-cache adalah hasil render mentah (sebelum deskew/binarisasi),
+    sehingga run ulang dan tuning preprocessing tidak memanggil poppler lagi.
+    content_hash (hash isi PDF yang sudah dihitung pemanggil) dipakai sebagai key
+    agar file tidak dibaca ulang untuk hashing.
+    """
+    return pdf_logic.cached_render(
+        pdf_path, 1, dpi, ("header", header_ratio, "cropbox"), "gray",
+        lambda: render_header_region(pdf_path, dpi, header_ratio, poppler_path),
+        content_hash=content_hash
+    )
+
+
+def box_blur(pixels, radius):
+    """Box blur separable (rata-rata jendela 2r+1) dengan penjumlahan array tergeser"""
+    size = 2 * radius + 1
+    height, width = pixels.shape
+    padded = np.pad(pixels, radius, mode="edge")
+
+    horizontal = padded[:, :width].copy()
+    for dx in range(1, size):
+        horizontal += padded[:, dx:dx + width]
+
+    blurred = horizontal[:height].copy()
+    for dy in range(1, size):
+        blurred += horizontal[dy:dy + height]
+    blurred /= size * size
+    return blurred
+
+
+def histogram_percentiles(histogram, percentiles):
+    """Nilai pixel pada persentil tertentu dari histogram 256 bin"""
+    cdf = np.cumsum(histogram)
+    return [int(np.searchsorted(cdf, cdf[-1] * q / 100.0)) for q in percentiles]
+
+
+def despeckle(ink):
+    """Buang titik tinta terisolasi (noise scan) dari mask boolean, in-place"""
+    height, width = ink.shape
+    padded = np.pad(ink, 1).view(np.uint8)
+    neighbors = np.zeros((height, width), dtype=np.uint8)
+    for dy in range(3):
+        for dx in range(3):
+            if dy != 1 or dx != 1:
+                neighbors += padded[dy:dy + height, dx:dx + width]
+    ink &= neighbors >= DESPECKLE_MIN_NEIGHBORS
+    return ink
+
+
+def otsu_threshold(histogram) -> float:
+    """Threshold Otsu dari histogram 256 bin"""
+    histogram = np.asarray(histogram, dtype=np.float64)
+    levels = np.arange(256, dtype=np.float64)
+
+    weight_dark = np.cumsum(histogram)
+    weight_light = weight_dark[-1] - weight_dark
+    sum_dark = np.cumsum(histogram * levels)
+    mean_dark = sum_dark / np.maximum(weight_dark, 1)
+    mean_light = (sum_dark[-1] - sum_dark) / np.maximum(weight_light, 1)
+
+    # Varians antar kelas, maksimum = threshold terbaik
+    between = weight_dark * weight_light * (mean_dark - mean_light) ** 2
+    return float(np.argmax(between))
+
+
+def binarize_header(image_header):
+    """
+    Contrast stretch, unsharp mask dan threshold Otsu dalam satu array NumPy
+
+    Menggantikan rantai ImageEnhance.Contrast → Sharpness → autocontrast yang
+    membuat salinan gambar di setiap langkah dan tetap menyisakan noise abu-abu.
+    Histogram (persentil dan Otsu) dihitung dari sampel pixel agar tetap murah
+    di header 400 DPI.
+
+    Args:
+        image_header: PIL Image grayscale (mode 'L')
+
+    Returns:
+        PIL Image mode '1' (teks hitam di latar putih)
+    """
+    source = np.asarray(image_header.convert('L'))
+
+    # Contrast stretch berdasarkan persentil (tahan terhadap noise ekstrem), lewat lookup table
+    sample_histogram = np.bincount(source[::4, ::4].ravel(), minlength=256)
+    low, high = histogram_percentiles(sample_histogram, STRETCH_PERCENTILES)
+    high = max(high, low + 1)
+    lut = np.clip((np.arange(256, dtype=np.float32) - low) * (255.0 / (high - low)), 0, 255)
+    pixels = lut[source]
+
+    # Unsharp mask: pixels += amount * (pixels - blur)
+    blurred = box_blur(pixels, UNSHARP_RADIUS)
+    np.subtract(pixels, blurred, out=blurred)
+    blurred *= UNSHARP_AMOUNT
+    pixels += blurred
+    np.clip(pixels, 0, 255, out=pixels)
+
+    # Binarisasi Otsu + buang bintik noise, dikemas 1 bit per pixel (1 = putih)
+    sample_histogram = np.bincount(pixels[::2, ::2].astype(np.uint8).ravel(), minlength=256)
+    ink = despeckle(pixels <= otsu_threshold(sample_histogram))
+    height, width = ink.shape
+    return Image.frombytes('1', (width, height), np.packbits(~ink, axis=1).tobytes())
+
+
+def find_runs(flags):
+    """Rentang [start, end) dari deretan True berurutan di array boolean 1D"""
+    padded = np.concatenate(([False], flags, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def find_digit_tokens(ink, top, bottom):
+    """
+    Pecah satu baris teks menjadi token (kata/deretan angka) lewat proyeksi vertikal
+
+    Returns:
+        list: (left, right, top, bottom, jumlah glyph, variasi lebar glyph) per token
+    """
+    band = ink[top:bottom]
+    glyphs = find_runs(band.any(axis=0))
+    if not glyphs:
+        return []
+
+    max_gap = max(2, (bottom - top) * LINE_WORD_GAP)
+    tokens = []
+    current = [glyphs[0]]
+    for glyph in glyphs[1:]:
+        if glyph[0] - current[-1][1] > max_gap:
+            tokens.append(current)
+            current = [glyph]
+        else:
+            current.append(glyph)
+    tokens.append(current)
+
+    result = []
+    for token in tokens:
+        left, right = token[0][0], token[-1][1]
+        # Tinggi token sebenarnya (baris bisa berisi teks lain yang lebih tinggi)
+        rows = find_runs(band[:, left:right].any(axis=1))
+        token_top, token_bottom = top + rows[0][0], top + rows[-1][1]
+        widths = np.array([end - start for start, end in token], dtype=np.float32)
+        variation = float(widths.std() / widths.mean()) if widths.mean() else 1.0
+        result.append((left, right, token_top, token_bottom, len(token), variation))
+    return result
+
+
+def locate_nokk_line(image_header, dpi: int):
+    """
+    Cari strip baris NO KK di header yang sudah dibinarisasi
+
+    Baris teks dicari dengan proyeksi horizontal, lalu setiap baris dipecah
+    menjadi token. Token yang jumlah glyph, rasio lebar/tinggi dan keseragaman
+    lebar glyph-nya paling mirip deretan 16 digit dipilih.
+
+    Args:
+        image_header: PIL Image header hasil preprocess_header (mode '1' atau 'L')
+        dpi (int): DPI render, untuk batas tinggi baris
+
+    Returns:
+        PIL Image strip baris NO KK, atau None jika tidak ada kandidat
+    """
+    ink = np.asarray(image_header.convert('L')) < 128
+    height, width = ink.shape
+    min_height = max(4, int(LINE_MIN_HEIGHT_IN * dpi))
+    max_height = int(LINE_MAX_HEIGHT_IN * dpi)
+
+    rows = ink.sum(axis=1) > max(1, width * LINE_ROW_INK_RATIO)
+
+    best = None
+    for top, bottom in find_runs(rows):
+        if not min_height <= bottom - top <= max_height * 2:
+            continue
+        for left, right, token_top, token_bottom, glyph_count, variation in find_digit_tokens(ink, top, bottom):
+            token_height = token_bottom - token_top
+            if not min_height <= token_height <= max_height:
+                continue
+            aspect = (right - left) / token_height
+            if not (LINE_MIN_GLYPHS <= glyph_count <= LINE_MAX_GLYPHS
+                    and LINE_MIN_ASPECT <= aspect <= LINE_MAX_ASPECT):
+                continue
+            score = abs(glyph_count - LINE_DIGITS) + 4 * variation
+            if best is None or score < best[0]:
+                best = (score, left, right, token_top, token_bottom)
+
+    if best is None:
+        return None
+
+    _, left, right, top, bottom = best
+    line_height = bottom - top
+    pad_x, pad_y = int(line_height * LINE_PAD_X), int(line_height * LINE_PAD_Y)
+    return image_header.crop((max(0, left - pad_x), max(0, top - pad_y),
+                              min(width, right + pad_x), min(height, bottom + pad_y)))
+
+
+def preprocess_header(image_header):
+    """Deskew lalu binarisasi gambar header sebelum OCR"""
+    # DESKEW: Straighten image jika miring
+    image_header = deskew_image(image_header)
+
+    # Contrast stretch + sharpen + threshold (1-bit, lebih kecil untuk tesseract)
+    return binarize_header(image_header)
+
+
+def resolve_ocr_tools() -> Tuple[bool, Optional[str]]:
+    """
+    Set path Tesseract dan ambil folder Poppler dari hasil deteksi tools_logic
+
+    Deteksi hanya dilakukan sekali per proses (worker menerima hasil dari proses
+    utama lewat init_ocr_worker), bukan per file.
+
+    Returns:
+        Tuple[bool, Optional[str]]: (tesseract ditemukan, poppler_path)
+    """
+    tools = tools_logic.get_tools()
+    tesseract_found = tools_logic.apply_tesseract_cmd(tools)
+    return tesseract_found, tools.get("poppler_path") or None
+
+
+def extract_text_layer(pdf_path: str) -> str:
+    """
+    Ambil teks halaman pertama dari text layer PDF (PyPDF2)
+
+    Returns:
+        str: Teks halaman pertama, string kosong jika PDF hasil scan/gagal dibaca
+    """
+    if PdfReader is None:
+        return ""
+    try:
+        reader = PdfReader(pdf_path)
+        if not reader.pages:
+            return ""
+        return reader.pages[0].extract_text() or ""
+    except Exception as e:
+        print(f"⚠️ Gagal membaca text layer {os.path.basename(pdf_path)}: {e}")
+        return ""
+
+
+def extract_nokk_from_text_layer(pdf_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Fast path: cari NO KK di text layer PDF dengan pola yang sama seperti OCR
+
+    Teks dari text layer tidak mengandung salah baca OCR, jadi pola separator juga
+    diterima. Hasil potong 17→16 digit tidak diterima (lanjut ke OCR).
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (NO KK, nama pola) atau (None, None)
+    """
+    text = extract_text_layer(pdf_path)
+    if not text.strip():
+        return None, None
+    nokk, method = match_nokk(text)
+    if nokk and method in EARLY_EXIT_METHODS | {"separators"}:
+        return nokk, method
+    return None, None
+
+
+def new_nokk_details() -> Dict[str, any]:
+    """Record hasil ekstraksi kosong"""
+    return {"nokk": None, "stage": None, "method": None, "confidence": None,
+            "stages_tried": [], "error": None}
+
+
+def ocr_images_batch(images, config: str, dpi: int) -> List[str]:
+    """
+    OCR beberapa gambar header dalam satu kali panggil tesseract
+
+    Gambar digabung menjadi satu TIFF multi-halaman sehingga proses tesseract
+    dan model bahasa hanya dimuat sekali. Output dipisah per halaman memakai
+    page separator (form feed) bawaan tesseract; jika jumlahnya tidak cocok,
+    fallback OCR satu per satu.
+
+    Args:
+        images (list): PIL Image (mode 'L')
+        config (str): Config tesseract
+        dpi (int): Resolusi gambar (disimpan di TIFF untuk tesseract)
+
+    Returns:
+        List[str]: Teks per gambar, urutan sama dengan input
+    """
+    if len(images) == 1:
+        return [pytesseract.image_to_string(images[0], lang='eng', config=config)]
+
+    with tempfile.TemporaryDirectory(prefix="nokk_batch_") as temp_dir:
+        tiff_path = os.path.join(temp_dir, "batch.tif")
+        save_kwargs = {"save_all": True, "append_images": list(images[1:]), "dpi": (dpi, dpi)}
+        if all(image.mode == '1' for image in images):
+            save_kwargs["compression"] = "group4"
+        images[0].save(tiff_path, **save_kwargs)
+        text = pytesseract.image_to_string(tiff_path, lang='eng', config=config)
+
+    pages = text.split('\f')
+    if len(pages) > len(images) and not any(page.strip() for page in pages[len(images):]):
+        pages = pages[:len(images)]
+    if len(pages) != len(images):
+        print(f"⚠️ Output batch tesseract tidak bisa dipisah ({len(pages)} bagian untuk "
+              f"{len(images)} gambar), OCR satu per satu")
+        return [pytesseract.image_to_string(image, lang='eng', config=config) for image in images]
+    return pages
+
+
+def extract_nokk_batch(pdf_paths: List[str], cascade: List[Tuple[str, int, str]] = None,
+                       content_hashes: Optional[List[Optional[str]]] = None) -> List[Dict[str, any]]:
+    """
+    Ekstrak NO KK dari beberapa PDF sekaligus dengan cascade OCR early-exit
+
+    Text layer PDF dicek lebih dulu; OCR hanya dijalankan jika PDF tidak punya
+    text layer atau NO KK valid tidak ditemukan di dalamnya. Setiap tahap cascade
+    meng-OCR semua header yang belum ketemu dalam satu panggilan tesseract
+    (ocr_images_batch), file yang sudah ketemu berhenti lebih awal.
+
+    Fungsi level modul (bisa di-pickle) agar bisa dijalankan di process pool.
+
+    Args:
+        pdf_paths (List[str]): Path file PDF KK
+        cascade (list): Tahapan (nama, dpi, config, area), default OCR_CASCADE
+        content_hashes (list): Hash isi tiap PDF jika sudah diketahui (untuk key cache render)
+
+    Returns:
+        List[Dict[str, any]]: Per file {"nokk", "stage", "method", "confidence", "stages_tried", "error"}
+    """
+    results = [new_nokk_details() for _ in pdf_paths]
+    active = []
+
+    for i, pdf_path in enumerate(pdf_paths):
+        if not os.path.exists(pdf_path):
+            results[i]["error"] = "File tidak ditemukan"
+            continue
+
+        # Fast path: PDF digital dengan text layer
+        details = results[i]
+        details["stages_tried"].append(TEXT_LAYER_STAGE)
+        nokk, method = extract_nokk_from_text_layer(pdf_path)
+        if nokk:
+            details.update(nokk=nokk, stage=TEXT_LAYER_STAGE, method=method, confidence="high")
+        else:
+            active.append(i)
+
+    if not active:
+        return results
+    if not OCR_AVAILABLE:
+        for i in active:
+            results[i]["error"] = "Library OCR tidak tersedia"
+        return results
+
+    tesseract_found, poppler_path = resolve_ocr_tools()
+    if not tesseract_found:
+        print("⚠️ Tesseract OCR tidak ditemukan. Install dari: https://github.com/UB-Mannheim/tesseract/wiki")
+        for i in active:
+            results[i]["error"] = "Tesseract tidak ditemukan"
+        return results
+
+    texts = {i: [] for i in active}
+    images = {}
+    current_dpi = None
+    # Kegagalan per file (render/OCR). Jika NO KK tetap tidak ketemu, hasilnya
+    # ditandai error agar tidak di-cache sebagai "tidak ditemukan" dan dicoba lagi
+    got_image = set()
+    render_errors = {}
+    ocr_errors = {}
+
+    for stage_name, dpi, config, region in (cascade or OCR_CASCADE):
+        if not active:
+            break
+
+        if dpi != current_dpi:
+            current_dpi = dpi
+            images = {}
+            for i in active:
+                # Render hanya header halaman pertama (20% atas) dalam grayscale
+                # - area NO KK biasanya di sini
+                try:
+                    image_header = render_header_cached(
+                        pdf_paths[i], dpi, HEADER_RATIO, poppler_path,
+                        content_hash=content_hashes[i] if content_hashes else None
+                    )
+                    images[i] = preprocess_header(image_header) if image_header is not None else None
+                except Exception as e:
+                    print(f"Error converting PDF to image: {str(e)}")
+                    render_errors[i] = f"Render PDF gagal: {e}"
+                    images[i] = None
+                if images[i] is not None:
+                    got_image.add(i)
+
+        stage_images = images
+        if region == REGION_LINE:
+            # Hanya strip baris NO KK; file tanpa kandidat baris lanjut ke tahap header
+            stage_images = {}
+            for i in active:
+                if images.get(i) is not None:
+                    try:
+                        stage_images[i] = locate_nokk_line(images[i], dpi)
+                    except Exception as e:
+                        print(f"⚠️ Lokalisasi baris NO KK gagal: {e}")
+
+        ready = [i for i in active if stage_images.get(i) is not None]
+        if not ready:
+            continue
+        for i in ready:
+            results[i]["stages_tried"].append(stage_name)
+
+        try:
+            outputs = ocr_images_batch([stage_images[i] for i in ready], config, dpi)
+        except Exception as e:
+            print(f"⚠️ OCR tahap {stage_name} gagal: {e}")
+            for i in ready:
+                ocr_errors.setdefault(i, f"OCR tahap {stage_name} gagal: {e}")
+            continue
+
+        found = set()
+        for i, text in zip(ready, outputs):
+            texts[i].append(text)
+            nokk, method = match_nokk(text)
+            if nokk and method in EARLY_EXIT_METHODS:
+                results[i].update(nokk=nokk, stage=stage_name, method=method,
+                                  confidence=NOKK_CONFIDENCE.get(method))
+                found.add(i)
+        active = [i for i in active if i not in found]
+
+    # Belum ketemu: gabungkan teks semua tahap (perilaku lama)
+    for i in active:
+        all_text = "\n".join(texts[i])
+        if not all_text.strip():
+            continue
+
+        # Debug: print extracted text
+        print(f"\n📄 Header text from {os.path.basename(pdf_paths[i])}:")
+        print(all_text[:300])
+
+        nokk, method = match_nokk(all_text)
+        if nokk:
+            results[i].update(nokk=nokk, stage=COMBINED_STAGE, method=method,
+                              confidence=NOKK_CONFIDENCE.get(method))
+        else:
+            print("❌ NO KK tidak ditemukan dalam header")
+
+    for i in active:
+        if results[i]["nokk"]:
+            continue
+        if i not in got_image:
+            results[i]["error"] = render_errors.get(i, "Render header PDF gagal")
+        elif i in ocr_errors:
+            results[i]["error"] = ocr_errors[i]
+
+    return results
+
+
+def extract_nokk_details(pdf_path: str, cascade: List[Tuple[str, int, str]] = None) -> Dict[str, any]:
+    """
+    Ekstrak NO KK dari header satu PDF (lihat extract_nokk_batch)
+
+    Returns:
+        Dict[str, any]: {"nokk", "stage", "method", "confidence", "stages_tried", "error"}
+    """
+    try:
+        return extract_nokk_batch([pdf_path], cascade)[0]
+    except Exception as e:
+        print(f"❌ Error extracting NO KK from {pdf_path}: {str(e)}")
+        details = new_nokk_details()
+        details["error"] = str(e)
+        return details
+
+
+def extract_nokk_from_pdf(pdf_path: str) -> Optional[str]:
+    """
+    Ekstrak NO KK dari PDF menggunakan OCR dengan fokus ke header
+
+    Args:
+        pdf_path (str): Path file PDF KK
+
+    Returns:
+        Optional[str]: NO KK jika ditemukan, None jika tidak
+    """
+    return extract_nokk_details(pdf_path)["nokk"]
+
+
+class OcrStageStats:
+    """
+    Statistik hit rate per tahap cascade OCR
+
+    attempts = berapa kali tahap dijalankan, hits = berapa kali tahap tersebut
+    yang menemukan NO KK. Disimpan kumulatif ke JSON agar urutan cascade bisa
+    disetel dari data nyata.
+    """
+
+    def __init__(self, stats_path: Optional[str] = None):
+        self.stats_path = stats_path
+        self.stages = {}
+        self.files = 0
+        self.not_found = 0
+        if stats_path:
+            self.load()
+
+    def _stage(self, name):
+        return self.stages.setdefault(name, {"attempts": 0, "hits": 0})
+
+    def record(self, details: Dict[str, any]):
+        """Catat hasil satu file"""
+        self.files += 1
+        for stage_name in details.get("stages_tried", []):
+            self._stage(stage_name)["attempts"] += 1
+        if details.get("stage"):
+            stage = self._stage(details["stage"])
+            if details["stage"] == COMBINED_STAGE:
+                stage["attempts"] += 1
+            stage["hits"] += 1
+        elif details.get("stages_tried"):
+            self.not_found += 1
+
+    def merge(self, other: "OcrStageStats"):
+        """Tambahkan statistik lain (misal hasil satu run) ke statistik ini"""
+        self.files += other.files
+        self.not_found += other.not_found
+        for name, values in other.stages.items():
+            stage = self._stage(name)
+            stage["attempts"] += values["attempts"]
+            stage["hits"] += values["hits"]
+
+    def hit_rate(self, name) -> float:
+        stage = self.stages.get(name)
+        if not stage or not stage["attempts"]:
+            return 0.0
+        return stage["hits"] / stage["attempts"]
+
+    def summary_lines(self) -> List[str]:
+        """Ringkasan per tahap (urutan cascade), untuk ditampilkan di UI"""
+        order = [TEXT_LAYER_STAGE] + [stage[0] for stage in OCR_CASCADE] + [COMBINED_STAGE]
+        order += [name for name in self.stages if name not in order]
+        lines = []
+        for name in order:
+            stage = self.stages.get(name)
+            if not stage or not stage["attempts"]:
+                continue
+            lines.append(f"{name}: {stage['hits']}/{stage['attempts']} ({self.hit_rate(name) * 100:.1f}%)")
+        return lines
+
+    def load(self):
+        if not self.stats_path or not os.path.exists(self.stats_path):
+            return
+        try:
+            with open(self.stats_path, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+            self.stages = content.get("stages", {})
+            self.files = content.get("files", 0)
+            self.not_found = content.get("not_found", 0)
+        except Exception as e:
+            print(f"Error loading OCR stats: {e}")
+
+    def save(self) -> bool:
+        if not self.stats_path:
+            return False
+        try:
+            with open(self.stats_path, 'w', encoding='utf-8') as f:
+                json.dump({"files": self.files, "not_found": self.not_found, "stages": self.stages},
+                          f, indent=4, ensure_ascii=False)
+            return True
+        except Exception as e:
+            print(f"Error saving OCR stats: {e}")
+            return False
+
+
+class OcrResultCache:
+    """
+    Cache persisten hasil OCR NO KK
+
+    Hasil disimpan per hash isi file (SHA-256), sehingga file identik di folder
+    anggota berbeda cukup di-OCR sekali. Hash per path disimpan bersama (size,
+    mtime) sebagai fast check agar file yang tidak berubah tidak perlu dibaca ulang.
+    """
+
+    VERSION = 1
+    CACHED_FIELDS = ("nokk", "stage", "method", "confidence")
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self.files = {}    # path -> {"size", "mtime", "hash"}
+        self.results = {}  # hash -> hasil OCR
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def _key(file_path: str) -> str:
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def load(self):
+        """Baca cache dari disk; hasil dari pipeline OCR versi lain diabaikan"""
+        self.files = {}
+        self.results = {}
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+            if content.get("version") != self.VERSION:
+                return
+            self.files = content.get("files", {})
+            if content.get("pipeline_version") == OCR_PIPELINE_VERSION:
+                self.results = content.get("results", {})
+        except Exception as e:
+            print(f"Error loading OCR cache: {e}")
+
+    def save(self) -> bool:
+        """Tulis cache ke disk jika ada perubahan"""
+        if not self.dirty:
+            return True
+        try:
+            write_json_atomic(self.cache_path, {
+                "version": self.VERSION,
+                "pipeline_version": OCR_PIPELINE_VERSION,
+                "files": self.files,
+                "results": self.results
+            })
+            self.dirty = False
+            return True
+        except Exception as e:
+            print(f"Error saving OCR cache: {e}")
+            return False
+
+    def lookup_hash(self, file_path: str) -> Tuple[Optional[str], bool, Optional[Tuple[int, float]]]:
+        """
+        Ambil hash isi file tanpa mengubah cache (aman dipanggil dari thread lain)
+
+        Returns:
+            Tuple: (hash, True jika dari fast check, (size, mtime) atau None jika file tidak ada)
+        """
+        signature = file_signature(file_path)
+        if signature is None:
+            return None, False, None
+
+        entry = self.files.get(self._key(file_path))
+        if entry and entry.get("size") == signature[0] and entry.get("mtime") == signature[1]:
+            return entry["hash"], True, signature
+
+        # Satu jalur hashing (di-memo per proses) dengan cache render halaman
+        return pdf_logic.file_content_hash(file_path), False, signature
+
+    def remember_hash(self, file_path: str, signature: Tuple[int, float], file_hash: str):
+        """Simpan hash hasil lookup_hash untuk fast check run berikutnya"""
+        self.files[self._key(file_path)] = {"size": signature[0], "mtime": signature[1], "hash": file_hash}
+        self.dirty = True
+
+    def resolve_hash(self, file_path: str) -> Tuple[Optional[str], bool]:
+        """
+        Ambil hash isi file, dari fast check (path, size, mtime) jika masih cocok
+
+        Returns:
+            Tuple[Optional[str], bool]: (hash, True jika dari fast check)
+        """
+        file_hash, from_fast_check, signature = self.lookup_hash(file_path)
+        if file_hash and not from_fast_check:
+            self.remember_hash(file_path, signature, file_hash)
+        return file_hash, from_fast_check
+
+    def get(self, file_hash: Optional[str]) -> Optional[Dict[str, any]]:
+        """Ambil hasil OCR untuk hash isi file"""
+        if not file_hash:
+            return None
+        cached = self.results.get(file_hash)
+        if cached is None:
+            return None
+        details = {field: cached.get(field) for field in self.CACHED_FIELDS}
+        details.update(stages_tried=[], error=None, cached=True)
+        return details
+
+    def put(self, file_hash: Optional[str], details: Dict[str, any]):
+        """Simpan hasil OCR (hasil dengan error, misal tesseract tidak ada, tidak disimpan)"""
+        if not file_hash or details.get("error"):
+            return
+        self.results[file_hash] = {field: details.get(field) for field in self.CACHED_FIELDS}
+        self.dirty = True
+
+    def clear(self):
+        """Hapus semua hasil OCR di cache"""
+        self.results = {}
+        self.files = {}
+        self.dirty = True
+
+    def stats(self) -> Dict[str, int]:
+        """Statistik isi cache"""
+        found = sum(1 for r in self.results.values() if r.get("nokk"))
+        size = os.path.getsize(self.cache_path) if os.path.exists(self.cache_path) else 0
+        return {
+            "results": len(self.results),
+            "found": found,
+            "files": len(self.files),
+            "size_bytes": size
+        }
+
+
+class OcrRunCheckpoint:
+    """
+    Checkpoint run Cek NO KK agar run yang terputus bisa dilanjutkan
+
+    Disimpan sebagai JSON Lines (append-only): baris pertama header run
+    (signature daftar file, total, waktu mulai), lalu satu baris per file yang
+    selesai. Setiap hasil langsung di-flush sehingga window ditutup atau crash
+    hanya kehilangan file yang sedang diproses. Baris terakhir yang terpotong
+    diabaikan saat dibaca.
+    """
+
+    VERSION = 1
+    SAVED_FIELDS = ("nokk", "stage", "method", "confidence", "cached", "error")
+
+    def __init__(self, checkpoint_path: str):
+        self.checkpoint_path = checkpoint_path
+        self._file = None
+
+    @staticmethod
+    def task_signature(pdf_paths: List[str]) -> str:
+        """Signature urutan daftar file; berubah jika database di-scan ulang dengan isi berbeda"""
+        digest = hashlib.sha256()
+        for pdf_path in pdf_paths:
+            digest.update(str(pdf_path).encode("utf-8", errors="replace"))
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    def read(self) -> Tuple[Optional[Dict[str, any]], Dict[int, Dict[str, any]]]:
+        """
+        Baca checkpoint dari disk
+
+        Returns:
+            Tuple: (header atau None jika tidak ada/tidak valid, {index: record})
+        """
+        header = None
+        records = {}
+        if not os.path.exists(self.checkpoint_path):
+            return None, records
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Baris terakhir terpotong saat crash
+                        continue
+                    if header is None:
+                        if entry.get("version") != self.VERSION:
+                            return None, {}
+                        header = entry
+                    elif isinstance(entry.get("idx"), int):
+                        records[entry["idx"]] = entry
+        except Exception as e:
+            print(f"Error loading OCR checkpoint: {e}")
+            return None, {}
+        return header, records
+
+    def summary(self) -> Optional[Dict[str, any]]:
+        """Ringkasan run yang belum selesai (total, done, started, updated), None jika tidak ada"""
+        header, records = self.read()
+        done = sum(1 for record in records.values() if not record.get("error"))
+        if header is None or done >= header.get("total", 0):
+            return None
+        return {
+            "total": header.get("total", 0),
+            "done": done,
+            "started": header.get("started"),
+            "updated": datetime.fromtimestamp(os.path.getmtime(self.checkpoint_path)).strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    def load(self, pdf_paths: List[str]) -> Optional[Dict[int, Dict[str, any]]]:
+        """
+        Ambil hasil yang sudah selesai untuk daftar file ini dan lanjutkan menulis checkpoint
+
+        File yang tercatat dengan error (render/OCR gagal, batch gagal) tidak
+        dianggap selesai sehingga diproses ulang.
+
+        Returns:
+            Optional[Dict[int, Dict]]: {index: details} dengan flag resumed=True,
+                                       None jika checkpoint tidak cocok dengan daftar file
+        """
+        header, records = self.read()
+        if header is None or header.get("signature") != self.task_signature(pdf_paths):
+            return None
+
+        resumed = {}
+        for idx, record in records.items():
+            if record.get("error"):
+                continue
+            if 0 <= idx < len(pdf_paths) and record.get("pdf_path") == str(pdf_paths[idx]):
+                details = {field: record.get(field) for field in self.SAVED_FIELDS}
+                details.update(stages_tried=[], resumed=True)
+                resumed[idx] = details
+
+        # Baris terpotong ditutup dulu agar hasil berikutnya tetap di baris sendiri
+        with open(self.checkpoint_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            needs_newline = False
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        self._file = open(self.checkpoint_path, 'a', encoding='utf-8')
+        if needs_newline:
+            self._file.write("\n")
+        return resumed
+
+    def start(self, pdf_paths: List[str]):
+        """Mulai checkpoint baru (checkpoint lama ditimpa)"""
+        self.close()
+        self._file = open(self.checkpoint_path, 'w', encoding='utf-8')
+        self._write({
+            "version": self.VERSION,
+            "signature": self.task_signature(pdf_paths),
+            "total": len(pdf_paths),
+            "started": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+
+    def append(self, idx: int, pdf_path: str, details: Dict[str, any]):
+        """Catat satu file yang selesai"""
+        if self._file is None:
+            return
+        record = {"idx": idx, "pdf_path": str(pdf_path)}
+        record.update({field: details.get(field) for field in self.SAVED_FIELDS})
+        self._write(record)
+
+    def _write(self, entry: Dict[str, any]):
+        try:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+        except Exception as e:
+            print(f"Error writing OCR checkpoint: {e}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def finish(self):
+        """Run selesai: checkpoint tidak diperlukan lagi"""
+        self.close()
+        try:
+            if os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+        except OSError as e:
+            print(f"Error removing OCR checkpoint: {e}")
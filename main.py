@@ -10,6 +10,7 @@ Semua form dipisahkan ke file terpisah untuk kemudahan maintenance.
 import tkinter as tk
 from tkinter import ttk, messagebox
 import os
+import multiprocessing
 
 # Import helper functions
 from app_helpers import get_export_path, get_responsive_dimensions
@@ -263,6 +264,9 @@ class MainMenu:
 
 # ========== ENTRY POINT ==========
 if __name__ == "__main__":
+    # Wajib untuk process pool di build PyInstaller (exe Windows)
+    multiprocessing.freeze_support()
+    
     # Hapus file_export.xlsx jika ada (di AppData)
     export_path = get_export_path()
     if os.path.exists(export_path):
@@ -0,0 +1,898 @@
+"""
+Business Logic Module untuk PDF Tools
+=====================================
+
+Fungsi PDF yang dipakai bersama oleh PDF Tools dan Cek NO KK, terpisah dari GUI.
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# Import untuk render PDF (poppler)
+try:
+    from pdf2image import convert_from_path, pdfinfo_from_path
+except ImportError:
+    convert_from_path = None
+    pdfinfo_from_path = None
+
+# Import untuk manipulasi PDF (compress)
+try:
+    from PyPDF2 import PdfReader, PdfWriter
+    from PyPDF2.generic import NameObject, NumberObject
+except ImportError:
+    PdfReader = None
+    PdfWriter = None
+    NameObject = None
+    NumberObject = None
+
+
+# Budget default cache render halaman (MB)
+DEFAULT_RENDER_CACHE_MB = 512
+
+# Budget default cache render halaman penuh PDF → gambar (MB), terpisah dari cache
+# header Cek NO KK agar konversi dokumen besar tidak mengusir header yang di-cache
+DEFAULT_PAGE_RENDER_CACHE_MB = 1024
+
+# Setelah eviction, ukuran cache diturunkan sampai rasio ini dari budget
+RENDER_CACHE_EVICT_TARGET = 0.9
+
+# Jumlah halaman yang dirender (dan ditahan di memori) sekaligus saat PDF → gambar
+PAGE_WINDOW = 4
+
+# Hash isi file per proses: (path, size, mtime) -> sha256
+_hash_memo: Dict[Tuple[str, int, float], str] = {}
+
+
+def file_content_hash(file_path: str, chunk_size: int = 1024 * 1024) -> Optional[str]:
+    """
+    Hash SHA-256 isi file, di-memo per (path, size, mtime) selama proses berjalan
+
+    Returns:
+        Optional[str]: Hex digest, None jika file tidak bisa dibaca
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    memo_key = (os.path.normcase(os.path.abspath(file_path)), stat.st_size, stat.st_mtime)
+    if memo_key in _hash_memo:
+        return _hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+
+class PageRenderCache:
+    """
+    Cache disk halaman PDF yang sudah dirender (poppler)
+
+    Key: (hash isi PDF, nomor halaman, DPI, crop, colorspace), sehingga file yang
+    sama di path berbeda dan run ulang setelah tuning preprocessing tidak perlu
+    merender ulang. Gambar disimpan sebagai PNG (lossless). Eviction LRU memakai
+    mtime file sebagai waktu akses terakhir (di-touch saat hit), sehingga aman
+    dipakai bersamaan oleh beberapa proses worker tanpa file index.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_RENDER_CACHE_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self.total_bytes = self._scan_size()
+
+    @staticmethod
+    def make_key(content_hash: str, page: int, dpi: int, crop=None, colorspace: str = "rgb") -> str:
+        """
+        Key cache
+
+        Args:
+            content_hash (str): Hash isi PDF
+            page (int): Nomor halaman (mulai 1)
+            dpi (int): Resolusi render
+            crop: Area crop (tuple, disimpan sebagai teks), None = halaman penuh
+            colorspace (str): "rgb", "gray", dst
+        """
+        raw = f"{content_hash}|{page}|{dpi}|{crop}|{colorspace}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        # Sub-folder 2 karakter agar satu folder tidak berisi ribuan file
+        return os.path.join(self.cache_dir, key[:2], key + ".png")
+
+    def _scan_size(self) -> int:
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    continue
+        return total
+
+    def get(self, key: str):
+        """Ambil gambar dari cache (PIL Image yang sudah di-load), None jika tidak ada"""
+        path = self._path(key)
+        try:
+            image = Image.open(path)
+            image.load()  # load() juga menutup file PNG satu frame
+            os.utime(path, None)  # Tandai baru dipakai (LRU)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return image
+
+    def put(self, key: str, image):
+        """Simpan gambar ke cache (atomic), lalu evict jika melebihi budget"""
+        if self.max_bytes <= 0:
+            return
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            image.save(temp_path, "PNG", compress_level=1)
+            os.replace(temp_path, path)
+            self.total_bytes += os.path.getsize(path)
+        except OSError as e:
+            print(f"⚠️ Gagal menyimpan cache render: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Hapus file yang paling lama tidak dipakai sampai di bawah target budget"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * RENDER_CACHE_EVICT_TARGET
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        self.total_bytes = total
+
+    def clear(self):
+        """Hapus semua isi cache"""
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                try:
+                    os.remove(os.path.join(root, name))
+                except OSError:
+                    continue
+        self.total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Statistik cache (jumlah file, ukuran, hit/miss di proses ini)"""
+        files = sum(len(names) for _, _, names in os.walk(self.cache_dir))
+        return {
+            "files": files,
+            "size_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Cache render aktif per proses (None = tanpa cache):
+# header halaman pertama (Cek NO KK) dan halaman penuh (PDF → gambar)
+_render_cache: Optional[PageRenderCache] = None
+_page_render_cache: Optional[PageRenderCache] = None
+
+
+def _reconfigure(cache: Optional[PageRenderCache], cache_dir: Optional[str], max_mb: int):
+    if not cache_dir or max_mb <= 0:
+        return None
+    if cache is None or cache.cache_dir != cache_dir:
+        return PageRenderCache(cache_dir, max_mb * 1024 * 1024)
+    cache.max_bytes = max_mb * 1024 * 1024
+    return cache
+
+
+def configure_render_cache(cache_dir: Optional[str], max_mb: int = DEFAULT_RENDER_CACHE_MB):
+    """Aktifkan cache render header untuk proses ini (cache_dir None atau max_mb 0 = nonaktif)"""
+    global _render_cache
+    _render_cache = _reconfigure(_render_cache, cache_dir, max_mb)
+    return _render_cache
+
+
+def configure_page_render_cache(cache_dir: Optional[str], max_mb: int = DEFAULT_PAGE_RENDER_CACHE_MB):
+    """Aktifkan cache render halaman penuh (iter_rendered_pages), budget terpisah dari cache header"""
+    global _page_render_cache
+    _page_render_cache = _reconfigure(_page_render_cache, cache_dir, max_mb)
+    return _page_render_cache
+
+
+def get_render_cache() -> Optional[PageRenderCache]:
+    return _render_cache
+
+
+def render_cache_settings() -> Optional[Tuple[str, int]]:
+    """(cache_dir, max_mb) cache aktif, untuk diteruskan ke proses worker"""
+    if _render_cache is None:
+        return None
+    return _render_cache.cache_dir, _render_cache.max_bytes // (1024 * 1024)
+
+
+def cached_render(pdf_path: str, page: int, dpi: int, crop, colorspace: str, render,
+                  content_hash: Optional[str] = None):
+    """
+    Ambil render halaman dari cache, atau render lalu simpan ke cache
+
+    Args:
+        pdf_path (str): File PDF
+        page (int): Nomor halaman (mulai 1)
+        dpi (int): Resolusi render
+        crop: Area crop yang dipakai render (bagian dari key)
+        colorspace (str): Colorspace hasil render (bagian dari key)
+        render (callable): Fungsi tanpa argumen yang merender jika cache miss
+        content_hash (str): Hash isi PDF jika sudah diketahui (file tidak dibaca ulang)
+
+    Returns:
+        PIL Image (atau None jika render gagal)
+    """
+    cache = _render_cache
+    if cache is None:
+        return render()
+    content_hash = content_hash or file_content_hash(pdf_path)
+    if content_hash is None:
+        return render()
+
+    key = cache.make_key(content_hash, page, dpi, crop, colorspace)
+    image = cache.get(key)
+    if image is not None:
+        return image
+
+    image = render()
+    if image is not None:
+        cache.put(key, image)
+    return image
+
+
+def get_page_count(pdf_path: str, poppler_path: Optional[str] = None) -> int:
+    """Jumlah halaman PDF menurut pdfinfo (poppler)"""
+    kwargs = {"poppler_path": poppler_path} if poppler_path else {}
+    return int(pdfinfo_from_path(pdf_path, **kwargs)["Pages"])
+
+
+def page_runs(pages: List[int]) -> List[Tuple[int, int]]:
+    """Kelompokkan nomor halaman terurut menjadi rentang berurutan [(awal, akhir), ...]"""
+    runs = []
+    for page in pages:
+        if runs and page == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], page)
+        else:
+            runs.append((page, page))
+    return runs
+
+
+def parse_page_range(text: str, page_count: int) -> List[int]:
+    """
+    Parse rentang halaman, misal "1-10", "5", "1-3, 7, 9-12" (kosong = semua halaman)
+
+    Returns:
+        List[int]: Nomor halaman terurut tanpa duplikat
+
+    Raises:
+        ValueError: Format salah atau halaman di luar 1..page_count
+    """
+    text = (text or "").strip()
+    if not text:
+        return list(range(1, page_count + 1))
+
+    pages = set()
+    for part in text.replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start = int(start_text) if start_text.strip() else 1
+            end = int(end_text) if end_text.strip() else page_count
+        else:
+            start = end = int(part)
+        if start < 1 or end > page_count or start > end:
+            raise ValueError(f"Rentang '{part}' di luar halaman 1-{page_count}")
+        pages.update(range(start, end + 1))
+
+    if not pages:
+        raise ValueError("Tidak ada halaman dipilih")
+    return sorted(pages)
+
+
+def iter_rendered_pages(pdf_path: str, pages: List[int], dpi: int = 200,
+                        poppler_path: Optional[str] = None, window: int = PAGE_WINDOW,
+                        thread_count: int = 1):
+    """
+    Render halaman PDF (RGB) per jendela halaman, satu per satu ke pemanggil
+
+    Hanya `window` halaman yang dirender dan ditahan di memori sekaligus, sehingga
+    memori puncak tidak bergantung jumlah halaman dokumen. Halaman di dalam satu
+    jendela dirender paralel oleh beberapa proses pdftoppm (thread_count).
+    Halaman yang sudah ada di cache render halaman penuh diambil dari cache.
+
+    Args:
+        pdf_path (str): File PDF
+        pages (List[int]): Nomor halaman terurut (mulai 1)
+        dpi (int): Resolusi render
+        poppler_path (str): Folder bin poppler (opsional)
+        window (int): Jumlah halaman per jendela render
+        thread_count (int): Jumlah proses pdftoppm per jendela
+
+    Yields:
+        Tuple[int, PIL.Image]: (nomor halaman, gambar)
+    """
+    kwargs = {"poppler_path": poppler_path} if poppler_path else {}
+    cache = _page_render_cache
+    content_hash = file_content_hash(pdf_path) if cache is not None else None
+
+    for start in range(0, len(pages), max(1, window)):
+        window_pages = pages[start:start + window]
+        images = {}
+        keys = {}
+        if content_hash is not None:
+            for page in window_pages:
+                keys[page] = cache.make_key(content_hash, page, dpi, None, "rgb")
+                image = cache.get(keys[page])
+                if image is not None:
+                    images[page] = image
+
+        missing = [page for page in window_pages if page not in images]
+        for first, last in page_runs(missing):
+            rendered = convert_from_path(
+                pdf_path, dpi=dpi, first_page=first, last_page=last,
+                thread_count=max(1, min(thread_count, last - first + 1)), **kwargs
+            )
+            for page, image in zip(range(first, last + 1), rendered):
+                images[page] = image
+                if content_hash is not None:
+                    cache.put(keys[page], image)
+
+        for page in window_pages:
+            image = images.pop(page, None)
+            if image is not None:
+                yield page, image
+
+
+# Resolusi gambar untuk ukuran halaman Images → PDF (sama dengan PIL resolution=100 sebelumnya)
+IMAGE_PDF_RESOLUTION = 100.0
+
+# Orientasi EXIF yang bisa ditangani dengan /Rotate halaman (tanpa decode ulang)
+EXIF_ORIENTATION_ROTATE = {1: 0, 3: 180, 6: 90, 8: 270}
+
+
+class StreamingPdfWriter:
+    """
+    Penulis PDF sederhana yang menulis objek langsung ke file
+
+    Objek ditulis satu per satu sehingga isi halaman sebelumnya tidak perlu
+    ditahan di memori; tabel xref ditulis saat close().
+    """
+
+    def __init__(self, out_path: str):
+        self.file = open(out_path, 'wb')
+        self.offsets = {}
+        self.next_id = 1
+        self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def reserve(self) -> int:
+        """Pesan nomor objek yang isinya ditulis belakangan"""
+        obj_id = self.next_id
+        self.next_id += 1
+        return obj_id
+
+    def write_object(self, obj_id: int, body: bytes):
+        self.offsets[obj_id] = self.file.tell()
+        self.file.write(f"{obj_id} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def add_object(self, body: bytes) -> int:
+        obj_id = self.reserve()
+        self.write_object(obj_id, body)
+        return obj_id
+
+    def add_stream(self, dictionary: str, data=None, source=None, length: int = 0) -> int:
+        """
+        Tulis stream object dari bytes (data) atau salin langsung dari file (source)
+
+        Args:
+            dictionary (str): Isi dictionary stream tanpa /Length
+            data (bytes): Isi stream
+            source (str): Path file yang disalin apa adanya sebagai isi stream
+            length (int): Ukuran file source
+        """
+        obj_id = self.reserve()
+        self.offsets[obj_id] = self.file.tell()
+        size = len(data) if data is not None else length
+        self.file.write(f"{obj_id} 0 obj\n<< {dictionary} /Length {size} >>\nstream\n".encode("ascii"))
+        if data is not None:
+            self.file.write(data)
+        else:
+            with open(source, 'rb') as f:
+                shutil.copyfileobj(f, self.file, 1024 * 1024)
+        self.file.write(b"\nendstream\nendobj\n")
+        return obj_id
+
+    def close(self, root_id: int):
+        """Tulis xref dan trailer lalu tutup file"""
+        xref_offset = self.file.tell()
+        count = self.next_id
+        self.file.write(f"xref\n0 {count}\n0000000000 65535 f \n".encode("ascii"))
+        for obj_id in range(1, count):
+            self.file.write(f"{self.offsets.get(obj_id, 0):010d} 00000 n \n".encode("ascii"))
+        self.file.write(f"trailer\n<< /Size {count} /Root {root_id} 0 R >>\n"
+                        f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+        self.file.close()
+
+    def abort(self):
+        self.file.close()
+
+
+def jpeg_passthrough_info(image) -> Optional[Dict]:
+    """
+    Info untuk embed JPEG apa adanya (DCTDecode), None jika harus di-encode ulang
+
+    Hanya JPEG grayscale/RGB dengan orientasi EXIF yang cukup diputar (bukan
+    dicerminkan); JPEG CMYK di-encode ulang karena inversi warna Adobe.
+    """
+    if image.format != "JPEG" or image.mode not in ("L", "RGB"):
+        return None
+    try:
+        orientation = image.getexif().get(0x0112, 1)
+    except Exception:
+        orientation = 1
+    if orientation not in EXIF_ORIENTATION_ROTATE:
+        return None
+    return {
+        "colorspace": "/DeviceGray" if image.mode == "L" else "/DeviceRGB",
+        "rotate": EXIF_ORIENTATION_ROTATE[orientation],
+    }
+
+
+def flatten_image(image):
+    """Decode gambar ke RGB/L untuk PDF: transparansi di atas latar putih, orientasi EXIF diterapkan"""
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[3])
+        return background
+    if image.mode in ("1", "L"):
+        return image.convert("L")
+    return image.convert("RGB")
+
+
+def png_filtered_data(image) -> bytes:
+    """
+    Data pixel terkompresi dengan filter PNG per baris (isi chunk IDAT)
+
+    Hasilnya langsung dipakai sebagai stream /FlateDecode dengan /Predictor 15.
+    Filter PNG (Sub/Up/Paeth) membuat scan jauh lebih kecil daripada zlib biasa
+    atas pixel mentah.
+
+    Args:
+        image: PIL Image mode 'L' atau 'RGB'
+
+    Returns:
+        bytes: Gabungan isi chunk IDAT
+    """
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", compress_level=6)
+    png = buffer.getvalue()
+
+    chunks = []
+    offset = 8  # Lewati signature PNG
+    while offset < len(png):
+        length = int.from_bytes(png[offset:offset + 4], "big")
+        chunk_type = png[offset + 4:offset + 8]
+        if chunk_type == b"IDAT":
+            chunks.append(png[offset + 8:offset + 8 + length])
+        elif chunk_type == b"IEND":
+            break
+        offset += 12 + length
+    return b"".join(chunks)
+
+
+def decode_png_filtered_data(data: bytes, mode: str, width: int, height: int):
+    """Kebalikan png_filtered_data: bungkus data sebagai file PNG lalu decode dengan PIL"""
+    def chunk(chunk_type: bytes, body: bytes) -> bytes:
+        return (len(body).to_bytes(4, "big") + chunk_type + body
+                + zlib.crc32(chunk_type + body).to_bytes(4, "big"))
+
+    color_type = 0 if mode == "L" else 2
+    header = width.to_bytes(4, "big") + height.to_bytes(4, "big") + bytes([8, color_type, 0, 0, 0])
+    png = b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", data) + chunk(b"IEND", b"")
+    image = Image.open(io.BytesIO(png))
+    image.load()
+    return image
+
+
+def build_pdf_from_images(image_paths: List[str], out_path: str,
+                          resolution: float = IMAGE_PDF_RESOLUTION, progress=None) -> Dict[str, int]:
+    """
+    Gabungkan gambar menjadi PDF, satu halaman per gambar, secara streaming
+
+    File JPEG di-embed apa adanya (DCT passthrough: tanpa decode, tanpa kehilangan
+    kualitas), gambar lain di-decode satu per satu dan disimpan lossless (Flate
+    dengan predictor PNG).
+    Memori puncak = satu halaman.
+
+    Args:
+        image_paths (List[str]): File gambar sesuai urutan halaman
+        out_path (str): File PDF output
+        resolution (float): DPI untuk menghitung ukuran halaman
+        progress (callable): Dipanggil progress(index, total, path) sebelum tiap gambar
+
+    Returns:
+        Dict[str, int]: {"pages", "passthrough", "reencoded"}
+    """
+    writer = StreamingPdfWriter(out_path)
+    stats = {"pages": 0, "passthrough": 0, "reencoded": 0}
+    try:
+        pages_id = writer.reserve()
+        page_ids = []
+        scale = 72.0 / resolution
+
+        for index, image_path in enumerate(image_paths, start=1):
+            if progress:
+                progress(index, len(image_paths), image_path)
+
+            with Image.open(image_path) as image:
+                width, height = image.size
+                info = jpeg_passthrough_info(image)
+                if info:
+                    image_id = writer.add_stream(
+                        f"/Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                        f"/ColorSpace {info['colorspace']} /BitsPerComponent 8 /Filter /DCTDecode",
+                        source=image_path, length=os.path.getsize(image_path)
+                    )
+                    rotate = info["rotate"]
+                    stats["passthrough"] += 1
+                else:
+                    flat = flatten_image(image)
+                    width, height = flat.size
+                    colorspace, colors = ("/DeviceGray", 1) if flat.mode == "L" else ("/DeviceRGB", 3)
+                    image_id = writer.add_stream(
+                        f"/Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                        f"/ColorSpace {colorspace} /BitsPerComponent 8 /Filter /FlateDecode "
+                        f"/DecodeParms << /Predictor 15 /Colors {colors} /BitsPerComponent 8 /Columns {width} >>",
+                        data=png_filtered_data(flat)
+                    )
+                    flat.close()
+                    rotate = 0
+                    stats["reencoded"] += 1
+
+            page_width, page_height = round(width * scale, 2), round(height * scale, 2)
+            content = f"q {page_width} 0 0 {page_height} 0 0 cm /Im0 Do Q".encode("ascii")
+            content_id = writer.add_stream("", data=content)
+            page_ids.append(writer.add_object(
+                f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {page_width} {page_height}] "
+                f"/Rotate {rotate} /Resources << /XObject << /Im0 {image_id} 0 R >> >> "
+                f"/Contents {content_id} 0 R >>".encode("ascii")
+            ))
+            stats["pages"] += 1
+
+        kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+        writer.write_object(pages_id, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("ascii"))
+        root_id = writer.add_object(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode("ascii"))
+        writer.close(root_id)
+    except Exception:
+        writer.abort()
+        raise
+    return stats
+
+
+# Default kompresi gambar PDF
+DEFAULT_COMPRESS_DPI = 150
+DEFAULT_COMPRESS_QUALITY = 60
+BILEVEL_MIN_DPI = 200       # Scan teks hitam-putih tidak diturunkan di bawah ini agar tetap terbaca
+DOWNSAMPLE_MARGIN = 1.1     # Hanya downsample jika DPI > target × margin
+BILEVEL_MIDTONE_RATIO = 0.04  # Maksimum rasio pixel abu-abu (64-191) untuk dianggap scan teks
+GRAY_CHANNEL_SPREAD = 24    # Selisih R/G/B maksimum agar pixel dianggap abu-abu
+BILEVEL_SAMPLE_SIZE = 1000  # Sisi terpanjang sampel pixel untuk deteksi scan teks
+
+# Filter stream yang bisa didecode PyPDF2 menjadi pixel mentah
+RAW_IMAGE_FILTERS = {"/FlateDecode", "/LZWDecode", "/ASCII85Decode", "/RunLengthDecode"}
+
+
+def _stream_filters(obj) -> List[str]:
+    filters = obj.get("/Filter")
+    if filters is None:
+        return []
+    if isinstance(filters, str):
+        return [str(filters)]
+    return [str(f) for f in filters]
+
+
+def _image_colorspace(obj) -> Optional[str]:
+    """Colorspace sederhana (/DeviceGray atau /DeviceRGB), None jika tidak didukung"""
+    colorspace = obj.get("/ColorSpace")
+    if colorspace is None:
+        return None
+    colorspace = colorspace.get_object()
+    if isinstance(colorspace, list) and len(colorspace) == 2 and str(colorspace[0]) == "/ICCBased":
+        components = colorspace[1].get_object().get("/N")
+        return {1: "/DeviceGray", 3: "/DeviceRGB"}.get(components)
+    if str(colorspace) in ("/DeviceGray", "/DeviceRGB"):
+        return str(colorspace)
+    return None
+
+
+def decode_pdf_image(obj):
+    """
+    Decode image XObject PDF menjadi PIL Image
+
+    Returns:
+        PIL Image (mode 'L' atau 'RGB'), None jika format tidak didukung
+        (mask/alpha, /Decode, indexed, CMYK, JPX, JBIG2, CCITT, bit depth selain 8)
+    """
+    if "/SMask" in obj or "/Mask" in obj or "/Decode" in obj or obj.get("/ImageMask"):
+        return None
+    filters = _stream_filters(obj)
+    width, height = int(obj["/Width"]), int(obj["/Height"])
+
+    if filters == ["/DCTDecode"]:
+        image = Image.open(io.BytesIO(obj._data))
+        image.load()
+        return image if image.mode in ("L", "RGB") else None
+
+    colorspace = _image_colorspace(obj)
+    if colorspace is None or int(obj.get("/BitsPerComponent", 8)) != 8:
+        return None
+    if not set(filters) <= RAW_IMAGE_FILTERS:
+        return None
+    mode = "L" if colorspace == "/DeviceGray" else "RGB"
+
+    parms = obj.get("/DecodeParms")
+    parms = parms.get_object() if parms is not None else None
+    if filters == ["/FlateDecode"] and hasattr(parms, "get") and int(parms.get("/Predictor", 1)) >= 10:
+        # Predictor PNG: PyPDF2 mengabaikan /Colors, jadi data di-decode sebagai PNG oleh PIL
+        if int(parms.get("/Columns", 1)) != width or int(parms.get("/Colors", 1)) != len(mode):
+            return None
+        return decode_png_filtered_data(obj._data, mode, width, height)
+
+    data = obj.get_data()
+    expected = width * height * len(mode)
+    if len(data) < expected:
+        return None
+    return Image.frombytes(mode, (width, height), data[:expected])
+
+
+def is_bilevel_scan(image) -> bool:
+    """
+    True jika gambar praktis hitam-putih (scan teks)
+
+    Pixel diambil dengan stride tanpa interpolasi: resampling (thumbnail) membuat
+    tepi huruf menjadi abu-abu sehingga scan teks terbaca sebagai gambar bernada.
+    """
+    step = max(1, max(image.size) // BILEVEL_SAMPLE_SIZE)
+    pixels = np.asarray(image, dtype=np.uint8)[::step, ::step].astype(np.int16)
+    if pixels.ndim == 3:
+        if np.mean(pixels.max(axis=2) - pixels.min(axis=2) > GRAY_CHANNEL_SPREAD) > 0.02:
+            return False
+        pixels = pixels.mean(axis=2)
+    midtones = np.mean((pixels >= 64) & (pixels < 192))
+    return midtones <= BILEVEL_MIDTONE_RATIO
+
+
+def encode_pdf_image(image, jpeg_quality: int, bilevel: bool) -> Tuple[bytes, Dict[str, any]]:
+    """
+    Encode gambar untuk image XObject PDF
+
+    Returns:
+        Tuple[bytes, dict]: (isi stream, entry dictionary /Filter, /ColorSpace, /BitsPerComponent)
+    """
+    if bilevel:
+        mono = image.convert("L").point(lambda value: 255 if value >= 128 else 0).convert("1")
+        # Mode '1' PIL: 1 bit per pixel, 1 = putih (sama dengan DeviceGray)
+        return zlib.compress(mono.tobytes(), 9), {
+            "/Filter": "/FlateDecode", "/ColorSpace": "/DeviceGray", "/BitsPerComponent": 1
+        }
+
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=jpeg_quality, optimize=True)
+    return buffer.getvalue(), {
+        "/Filter": "/DCTDecode",
+        "/ColorSpace": "/DeviceGray" if image.mode == "L" else "/DeviceRGB",
+        "/BitsPerComponent": 8,
+    }
+
+
+def iter_image_xobjects(resources, seen=None):
+    """
+    Cari image XObject di resources halaman (termasuk di dalam Form XObject)
+
+    Yields:
+        Tuple[DictionaryObject, str]: (dictionary /XObject, nama entry image)
+    """
+    seen = set() if seen is None else seen
+    if resources is None:
+        return
+    resources = resources.get_object()
+    xobjects = resources.get("/XObject")
+    if xobjects is None:
+        return
+    xobjects = xobjects.get_object()
+    for name in list(xobjects.keys()):
+        ref = xobjects[name]
+        obj = ref.get_object()
+        subtype = obj.get("/Subtype")
+        if subtype == "/Image":
+            yield xobjects, name
+        elif subtype == "/Form":
+            key = getattr(ref, "idnum", id(obj))
+            if key not in seen:
+                seen.add(key)
+                yield from iter_image_xobjects(obj.get("/Resources"), seen)
+
+
+def compress_pdf_file(in_path: str, out_path: str, target_dpi: int = DEFAULT_COMPRESS_DPI,
+                      jpeg_quality: int = DEFAULT_COMPRESS_QUALITY, progress=None) -> Dict[str, int]:
+    """
+    Compress PDF dengan memproses gambar di dalamnya
+
+    - Image XObject identik (isi dan parameter sama) digabung menjadi satu objek
+    - Gambar dengan DPI efektif di atas target di-downsample
+    - Gambar di-encode ulang sebagai JPEG (kualitas jpeg_quality), atau 1-bit
+      Flate untuk scan teks hitam-putih
+    - Gambar yang hasil encode ulangnya tidak lebih kecil dibiarkan apa adanya
+    - Content stream halaman dikompres
+
+    DPI efektif dihitung dari lebar gambar terhadap lebar halaman tempat gambar
+    dipakai (scan arsip umumnya satu gambar satu halaman); untuk gambar yang lebih
+    kecil dari halaman perkiraan ini lebih rendah, sehingga downsample lebih hati-hati.
+    Jika hasil akhir tidak lebih kecil dari file asli, file asli yang disalin.
+
+    Args:
+        in_path (str): PDF sumber
+        out_path (str): PDF hasil
+        target_dpi (int): DPI maksimum gambar
+        jpeg_quality (int): Kualitas JPEG (1-95)
+        progress (callable): Dipanggil progress(pesan) di setiap tahap
+
+    Returns:
+        Dict[str, int]: Ukuran awal/akhir dan jumlah gambar per perlakuan
+    """
+    stats = {
+        "original_size": os.path.getsize(in_path), "compressed_size": 0,
+        "images": 0, "duplicates": 0, "recompressed": 0, "downsampled": 0,
+        "bilevel": 0, "kept_larger": 0, "unsupported": 0, "kept_original_file": 0,
+    }
+
+    reader = PdfReader(in_path)
+
+    # Gabungkan image XObject identik di sisi reader sebelum halaman disalin,
+    # sehingga salinan duplikat tidak ikut ditulis ke file hasil
+    canonical = {}   # hash isi + parameter -> IndirectObject pertama
+    for page in reader.pages:
+        for xobjects, name in iter_image_xobjects(page.get("/Resources")):
+            ref = xobjects.raw_get(name)
+            if not hasattr(ref, "idnum"):
+                continue
+            obj = ref.get_object()
+            digest = hashlib.sha256(obj._data)
+            for key in ("/Width", "/Height", "/Filter", "/ColorSpace", "/BitsPerComponent",
+                        "/DecodeParms", "/SMask", "/Mask", "/Decode"):
+                digest.update(f"{key}={obj.get(key)!r};".encode("utf-8", errors="replace"))
+            first = canonical.setdefault(digest.hexdigest(), ref)
+            if first.idnum != ref.idnum:
+                xobjects[NameObject(name)] = first
+                stats["duplicates"] += 1
+
+    writer = PdfWriter()
+    for page in reader.pages:
+        writer.add_page(page)
+
+    # Image XObject unik dan DPI efektif maksimumnya
+    images = {}      # idnum -> {"obj", "dpi"}
+    for page_number, page in enumerate(writer.pages, start=1):
+        if progress:
+            progress(f"Menganalisis halaman {page_number}/{len(writer.pages)}")
+        page_width_in = float(page.mediabox.width) / 72.0 or 1.0
+        for xobjects, name in iter_image_xobjects(page.get("/Resources")):
+            ref = xobjects.raw_get(name)
+            obj = ref.get_object()
+            entry = images.setdefault(getattr(ref, "idnum", id(obj)), {"obj": obj, "dpi": 0.0})
+            entry["dpi"] = max(entry["dpi"], int(obj["/Width"]) / page_width_in)
+
+    stats["images"] = len(images)
+
+    for index, entry in enumerate(images.values(), start=1):
+        if progress:
+            progress(f"Memproses gambar {index}/{len(images)}")
+        obj = entry["obj"]
+        try:
+            image = decode_pdf_image(obj)
+        except Exception as e:
+            print(f"⚠️ Gagal decode gambar PDF: {e}")
+            image = None
+        if image is None:
+            stats["unsupported"] += 1
+            continue
+
+        bilevel = is_bilevel_scan(image)
+        limit_dpi = max(target_dpi, BILEVEL_MIN_DPI) if bilevel else target_dpi
+        downsampled = entry["dpi"] > limit_dpi * DOWNSAMPLE_MARGIN
+        if downsampled:
+            scale = limit_dpi / entry["dpi"]
+            new_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(new_size, Image.LANCZOS)
+
+        data, fields = encode_pdf_image(image, jpeg_quality, bilevel)
+        if len(data) >= len(obj._data):
+            stats["kept_larger"] += 1
+            continue
+
+        obj._data = data
+        if hasattr(obj, "decoded_self"):
+            obj.decoded_self = None
+        for key in ("/DecodeParms", "/Length"):
+            if key in obj:
+                del obj[key]
+        obj[NameObject("/Width")] = NumberObject(image.width)
+        obj[NameObject("/Height")] = NumberObject(image.height)
+        obj[NameObject("/Filter")] = NameObject(fields["/Filter"])
+        obj[NameObject("/ColorSpace")] = NameObject(fields["/ColorSpace"])
+        obj[NameObject("/BitsPerComponent")] = NumberObject(fields["/BitsPerComponent"])
+        stats["recompressed"] += 1
+        stats["downsampled"] += 1 if downsampled else 0
+        stats["bilevel"] += 1 if bilevel else 0
+
+    for page in writer.pages:
+        try:
+            page.compress_content_streams()
+        except Exception:
+            pass
+
+    # Metadata penting saja
+    if reader.metadata:
+        try:
+            essential_meta = {key: reader.metadata[key] for key in ("/Title", "/Author", "/Subject")
+                              if key in reader.metadata}
+            if essential_meta:
+                writer.add_metadata(essential_meta)
+        except Exception:
+            pass
+
+    if progress:
+        progress("Menyimpan PDF")
+    with open(out_path, 'wb') as output_file:
+        writer.write(output_file)
+
+    # Hasil tidak lebih kecil: pakai file asli
+    if os.path.getsize(out_path) >= stats["original_size"] and os.path.abspath(in_path) != os.path.abspath(out_path):
+        shutil.copyfile(in_path, out_path)
+        stats["kept_original_file"] = 1
+
+    stats["compressed_size"] = os.path.getsize(out_path)
+    return stats
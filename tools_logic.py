@@ -0,0 +1,308 @@
+"""
+Tools Logic - Deteksi Tesseract dan Poppler
+===========================================
+
+Mencari dan memvalidasi executable Tesseract dan folder bin Poppler satu kali
+per sesi (termasuk cek versi), lalu menyimpan hasilnya di ConfigManager agar
+sesi berikutnya cukup memverifikasi path yang tersimpan tanpa menjalankan
+ulang executable. Dipakai bersama oleh Cek NO KK dan PDF Tools.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+
+# Versi minimum yang didukung
+MIN_TESSERACT_VERSION = (4, 0)   # LSTM + tessedit_char_whitelist
+MIN_POPPLER_VERSION = (0, 60)    # pdftoppm -x/-y/-W/-H dan -gray
+
+TESSERACT_PATHS = [
+    r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+    r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
+    r"C:\Tesseract-OCR\tesseract.exe",
+]
+
+POPPLER_PATHS = [
+    r"C:\Program Files\poppler\Library\bin",
+    r"C:\poppler\Library\bin",
+]
+
+# Folder poppler portable (relatif ke folder kerja dan folder aplikasi)
+POPPLER_PORTABLE_DIRS = [
+    os.path.join("poppler-25.07.0", "Library", "bin"),
+    os.path.join("poppler-25.07.0", "bin"),
+    os.path.join("poppler", "Library", "bin"),
+    os.path.join("poppler", "bin"),
+]
+
+CONFIG_KEY = "ocr_tools"
+PROBE_TIMEOUT = 10
+
+# Hasil deteksi per proses (None = belum dideteksi)
+_resolved_tools = None
+
+
+def get_app_dirs() -> List[str]:
+    """Folder kerja dan folder aplikasi (folder exe jika hasil build)"""
+    dirs = [os.getcwd()]
+    if getattr(sys, "frozen", False):
+        dirs.append(os.path.dirname(sys.executable))
+    dirs.append(os.path.dirname(os.path.abspath(__file__)))
+
+    unique = []
+    for path in dirs:
+        if path not in unique:
+            unique.append(path)
+    return unique
+
+
+def parse_version(text: str) -> Optional[Tuple[int, ...]]:
+    """Ambil angka versi pertama (mis. '5.3.0' -> (5, 3, 0)) dari output --version"""
+    match = re.search(r"(\d+)\.(\d+)(?:\.(\d+))?", text or "")
+    if not match:
+        return None
+    return tuple(int(part) for part in match.groups() if part is not None)
+
+
+def format_version(version) -> str:
+    return ".".join(str(part) for part in version) if version else "?"
+
+
+def run_version_command(args: List[str]) -> str:
+    """Jalankan perintah versi dan kembalikan gabungan stdout + stderr (kosong jika gagal)"""
+    kwargs = {"capture_output": True, "timeout": PROBE_TIMEOUT}
+    if os.name == "nt":
+        kwargs["creationflags"] = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+    try:
+        completed = subprocess.run(args, **kwargs)
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    output = completed.stdout + completed.stderr
+    return output.decode("utf-8", errors="replace")
+
+
+def probe_tesseract(tesseract_cmd: str) -> Optional[Tuple[int, ...]]:
+    """
+    Validasi executable Tesseract lewat `tesseract --version`
+
+    Returns:
+        Optional[Tuple[int, ...]]: Versi tesseract, None jika tidak valid/terlalu lama
+    """
+    output = run_version_command([tesseract_cmd, "--version"])
+    match = re.search(r"tesseract\s+v?(\S+)", output, re.IGNORECASE)
+    version = parse_version(match.group(1)) if match else None
+    if version is None or version[:2] < MIN_TESSERACT_VERSION:
+        return None
+    return version
+
+
+def find_poppler_executable(poppler_path: Optional[str], name: str) -> Optional[str]:
+    """Cari executable poppler (mis. pdftoppm) di folder poppler, atau di PATH jika folder kosong"""
+    if not poppler_path:
+        return shutil.which(name)
+    for candidate_name in (f"{name}.exe", name):
+        candidate = os.path.join(poppler_path, candidate_name)
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def probe_poppler(poppler_path: Optional[str]) -> Optional[Tuple[int, ...]]:
+    """
+    Validasi folder bin Poppler lewat `pdftoppm -v` (pdfinfo juga harus ada untuk pdf2image)
+
+    Args:
+        poppler_path (str): Folder bin poppler, None/"" untuk poppler di PATH
+
+    Returns:
+        Optional[Tuple[int, ...]]: Versi poppler, None jika tidak valid/terlalu lama
+    """
+    pdftoppm = find_poppler_executable(poppler_path, "pdftoppm")
+    if not pdftoppm or not find_poppler_executable(poppler_path, "pdfinfo"):
+        return None
+    output = run_version_command([pdftoppm, "-v"])
+    match = re.search(r"version\s+(\S+)", output, re.IGNORECASE)
+    version = parse_version(match.group(1)) if match else None
+    if version is None or version[:2] < MIN_POPPLER_VERSION:
+        return None
+    return version
+
+
+def tesseract_candidates(saved: Optional[str] = None) -> List[str]:
+    """Urutan kandidat executable Tesseract: path tersimpan, lokasi install Windows, PATH"""
+    candidates = [saved] if saved else []
+    candidates.extend(TESSERACT_PATHS)
+    on_path = shutil.which("tesseract")
+    if on_path:
+        candidates.append(on_path)
+
+    unique = []
+    for path in candidates:
+        if path not in unique and os.path.isfile(path):
+            unique.append(path)
+    return unique
+
+
+def poppler_candidates(saved: Optional[str] = None) -> List[str]:
+    """Urutan kandidat folder Poppler: path tersimpan, portable, lokasi install, PATH ("")"""
+    candidates = [saved] if saved else []
+    for base_dir in get_app_dirs():
+        candidates.extend(os.path.join(base_dir, sub_dir) for sub_dir in POPPLER_PORTABLE_DIRS)
+    candidates.extend(POPPLER_PATHS)
+
+    unique = []
+    for path in candidates:
+        if path not in unique and os.path.isdir(path):
+            unique.append(path)
+    if shutil.which("pdftoppm"):
+        unique.append("")
+    return unique
+
+
+def file_mtime(path: Optional[str]) -> Optional[float]:
+    try:
+        return os.path.getmtime(path) if path else None
+    except OSError:
+        return None
+
+
+def empty_tools() -> Dict:
+    return {
+        "tesseract_cmd": None,
+        "tesseract_version": None,
+        "tesseract_mtime": None,
+        "poppler_path": None,
+        "poppler_version": None,
+        "pdftoppm_mtime": None,
+    }
+
+
+def is_cached_tesseract_valid(cached: Dict) -> bool:
+    """Path tersimpan masih ada dan executable tidak berubah sejak divalidasi"""
+    cmd = cached.get("tesseract_cmd")
+    return bool(cmd and cached.get("tesseract_version")
+                and file_mtime(cmd) == cached.get("tesseract_mtime"))
+
+
+def is_cached_poppler_valid(cached: Dict) -> bool:
+    if cached.get("poppler_path") is None or not cached.get("poppler_version"):
+        return False
+    pdftoppm = find_poppler_executable(cached["poppler_path"], "pdftoppm")
+    return bool(pdftoppm and file_mtime(pdftoppm) == cached.get("pdftoppm_mtime"))
+
+
+def discover_tools(cached: Optional[Dict] = None) -> Dict:
+    """
+    Deteksi Tesseract dan Poppler
+
+    Hasil tersimpan dipakai tanpa menjalankan executable jika path-nya masih ada
+    dan mtime-nya sama; jika tidak, kandidat dicoba berurutan dengan cek versi.
+
+    Args:
+        cached (dict): Hasil deteksi sebelumnya (dari config), opsional
+
+    Returns:
+        Dict: tesseract_cmd, tesseract_version, poppler_path ("" = PATH),
+              poppler_version, beserta mtime untuk validasi berikutnya.
+              Path bernilai None jika tool tidak ditemukan.
+    """
+    cached = cached or {}
+    tools = empty_tools()
+
+    if is_cached_tesseract_valid(cached):
+        for key in ("tesseract_cmd", "tesseract_version", "tesseract_mtime"):
+            tools[key] = cached[key]
+    else:
+        for candidate in tesseract_candidates(cached.get("tesseract_cmd")):
+            version = probe_tesseract(candidate)
+            if version:
+                tools.update(tesseract_cmd=candidate, tesseract_version=format_version(version),
+                             tesseract_mtime=file_mtime(candidate))
+                break
+
+    if is_cached_poppler_valid(cached):
+        for key in ("poppler_path", "poppler_version", "pdftoppm_mtime"):
+            tools[key] = cached[key]
+    else:
+        for candidate in poppler_candidates(cached.get("poppler_path")):
+            version = probe_poppler(candidate)
+            if version:
+                tools.update(poppler_path=candidate, poppler_version=format_version(version),
+                             pdftoppm_mtime=file_mtime(find_poppler_executable(candidate, "pdftoppm")))
+                break
+
+    return tools
+
+
+def set_tools(tools: Dict):
+    """Pakai hasil deteksi yang sudah ada (mis. dari proses utama ke worker OCR)"""
+    global _resolved_tools
+    _resolved_tools = dict(tools)
+
+
+def get_tools(config_manager=None, force: bool = False) -> Dict:
+    """
+    Hasil deteksi tool untuk proses ini, dideteksi sekali lalu di-cache
+
+    Args:
+        config_manager: ConfigManager untuk membaca/menyimpan hasil deteksi (opsional)
+        force (bool): Abaikan cache dan deteksi ulang semua kandidat
+
+    Returns:
+        Dict: Lihat discover_tools
+    """
+    global _resolved_tools
+    if _resolved_tools is not None and not force:
+        return _resolved_tools
+
+    cached = {}
+    if config_manager is not None and not force:
+        cached = dict(config_manager.config.get(CONFIG_KEY) or {})
+        # Path poppler yang dipilih manual di PDF Tools versi lama
+        if "poppler_path" not in cached and config_manager.config.get("poppler_path"):
+            cached["poppler_path"] = config_manager.config["poppler_path"]
+
+    tools = discover_tools(cached)
+    _resolved_tools = tools
+
+    if config_manager is not None and config_manager.config.get(CONFIG_KEY) != tools:
+        config_manager.config[CONFIG_KEY] = tools
+        config_manager.save_config()
+
+    return tools
+
+
+def set_poppler_path(config_manager, poppler_path: str) -> bool:
+    """
+    Validasi dan simpan folder Poppler yang dipilih user
+
+    Returns:
+        bool: True jika folder valid dan disimpan
+    """
+    version = probe_poppler(poppler_path)
+    if not version:
+        return False
+
+    tools = dict(get_tools(config_manager))
+    tools.update(poppler_path=poppler_path, poppler_version=format_version(version),
+                 pdftoppm_mtime=file_mtime(find_poppler_executable(poppler_path, "pdftoppm")))
+    set_tools(tools)
+    config_manager.config[CONFIG_KEY] = tools
+    config_manager.save_config()
+    return True
+
+
+def apply_tesseract_cmd(tools: Dict) -> bool:
+    """Set pytesseract.tesseract_cmd sesuai hasil deteksi; True jika Tesseract tersedia"""
+    if not tools.get("tesseract_cmd"):
+        return False
+    try:
+        import pytesseract
+    except ImportError:
+        return False
+    pytesseract.pytesseract.tesseract_cmd = tools["tesseract_cmd"]
+    return True